@@ -0,0 +1,227 @@
+"""Batch API endpoint: many entity mutations in one transaction."""
+
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.orm import Session
+
+from app.api import factions, pages, people, places
+from app.db import get_session
+from app.dependencies import get_view_mode, require_initialized_project
+from app.models import World
+from app.schemas import (
+    FactionCreate,
+    FactionResponse,
+    FactionUpdate,
+    NotePageCreate,
+    NotePageResponse,
+    NotePageUpdate,
+    PersonCreate,
+    PersonResponse,
+    PersonUpdate,
+    PlaceCreate,
+    PlaceResponse,
+    PlaceUpdate,
+)
+from app.services.cache import clear_all_caches
+from app.services.visibility import ViewMode
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+BatchOp = Literal["create", "update", "delete"]
+BatchEntityType = Literal["faction", "person", "place", "page"]
+
+# Fields holding entity IDs, where temporary IDs are resolved
+_REFERENCE_FIELDS = (
+    "owner_faction_id",
+    "parent_place_id",
+    "workplace_place_id",
+    "home_place_id",
+    "entity_id",
+)
+
+# Runs one operation's route handler: (session, world, view_mode, id, data)
+_Handler = Callable[[Session, World, ViewMode, str, dict[str, Any]], Awaitable[Any]]
+
+_HANDLERS: dict[tuple[BatchEntityType, BatchOp], _Handler] = {
+    ("faction", "create"): lambda s, w, v, _, d: factions.create_faction(
+        FactionCreate.model_validate(d), s, w
+    ),
+    ("faction", "update"): lambda s, w, v, i, d: factions.update_faction(
+        i, FactionUpdate.model_validate(d), s, w
+    ),
+    ("faction", "delete"): lambda s, w, v, i, _: factions.delete_faction(i, s, w),
+    ("person", "create"): lambda s, w, v, _, d: people.create_person(
+        PersonCreate.model_validate(d), s, w
+    ),
+    ("person", "update"): lambda s, w, v, i, d: people.update_person(
+        i, PersonUpdate.model_validate(d), s, w
+    ),
+    ("person", "delete"): lambda s, w, v, i, _: people.delete_person(i, s, w),
+    ("place", "create"): lambda s, w, v, _, d: places.create_place(
+        PlaceCreate.model_validate(d), s, w, v
+    ),
+    ("place", "update"): lambda s, w, v, i, d: places.update_place(
+        i, PlaceUpdate.model_validate(d), s, w, v
+    ),
+    ("place", "delete"): lambda s, w, v, i, _: places.delete_place(i, s, w, v),
+    ("page", "create"): lambda s, w, v, _, d: pages.create_page(
+        NotePageCreate.model_validate(d), s, w
+    ),
+    ("page", "update"): lambda s, w, v, i, d: pages.update_page(
+        i, NotePageUpdate.model_validate(d), s, w
+    ),
+    ("page", "delete"): lambda s, w, v, i, _: pages.delete_page(i, s, w),
+}
+
+_RESPONSE_MODELS: dict[BatchEntityType, type[BaseModel]] = {
+    "faction": FactionResponse,
+    "person": PersonResponse,
+    "place": PlaceResponse,
+    "page": NotePageResponse,
+}
+
+
+class BatchOperation(BaseModel):
+    """One create, update or delete of a batch."""
+
+    op: BatchOp
+    entity_type: BatchEntityType
+    id: str | None = None  # Update/delete: entity ID or an earlier create's temp_id
+    temp_id: str | None = None  # Create: name later operations can refer to the entity by
+    data: dict[str, Any] = Field(default_factory=dict)  # Create/update body, as for the route
+
+
+class BatchRequest(BaseModel):
+    """Operations to run in order."""
+
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchResult(BaseModel):
+    """Result of one operation."""
+
+    index: int
+    op: BatchOp
+    entity_type: BatchEntityType
+    id: str  # Real entity ID (temp IDs resolved)
+    item: dict[str, Any] | None = None  # Create/update: the route's response body
+
+
+class BatchResponse(BaseModel):
+    """Results in operation order, and the IDs created for temp IDs."""
+
+    results: list[BatchResult]
+    ids: dict[str, str]  # temp_id -> created entity ID
+
+
+class _BatchSession(Session):
+    """
+    Session whose commit() only flushes.
+
+    Route handlers run on it commit after each mutation as usual; the writes
+    stay in one transaction until commit_batch().
+    """
+
+    def commit(self) -> None:
+        """Flush instead of committing, keeping the batch's transaction open."""
+        self.flush()
+
+    def commit_batch(self) -> None:
+        """Commit the batch's transaction."""
+        super().commit()
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> BatchResponse:
+    """
+    Run create, update and delete operations in order, in one transaction.
+
+    Each operation goes through the same handler as its REST route (same
+    validation, visibility rules, index maintenance and version bumps), but
+    nothing is committed until all of them succeed, so the batch costs a
+    single commit. A create may name the new entity with a `temp_id`; later
+    operations can use it as their `id` or in reference fields
+    (owner_faction_id, parent_place_id, workplace_place_id, home_place_id,
+    entity_id). If any operation fails, the whole batch is rolled back and
+    the error is returned with the operation's index.
+    """
+    batch_session = _BatchSession(bind=session.get_bind(), autoflush=False)
+    ids: dict[str, str] = {}
+    results: list[BatchResult] = []
+    try:
+        for index, operation in enumerate(batch.operations):
+            results.append(await _run(batch_session, world, view_mode, index, operation, ids))
+        batch_session.commit_batch()
+    except BaseException:
+        batch_session.rollback()
+        # Caches may hold data built at versions the rollback discarded
+        clear_all_caches()
+        raise
+    finally:
+        batch_session.close()
+
+    return BatchResponse(results=results, ids=ids)
+
+
+async def _run(
+    session: _BatchSession,
+    world: World,
+    view_mode: ViewMode,
+    index: int,
+    operation: BatchOperation,
+    ids: dict[str, str],
+) -> BatchResult:
+    """Run one operation, recording the ID of a created entity under its temp_id."""
+
+    def fail(status_code: int, detail: object) -> HTTPException:
+        return HTTPException(status_code=status_code, detail=f"Operation {index}: {detail}")
+
+    if operation.op == "create":
+        if operation.temp_id is not None and operation.temp_id in ids:
+            raise fail(422, f"Duplicate temp_id {operation.temp_id}")
+    elif operation.temp_id is not None:
+        raise fail(422, "temp_id is only allowed on create")
+    elif operation.id is None:
+        raise fail(422, f"id is required for {operation.op}")
+
+    entity_id = ids.get(operation.id, operation.id) if operation.id is not None else ""
+    data = {
+        field: ids.get(value, value)
+        if field in _REFERENCE_FIELDS and isinstance(value, str)
+        else value
+        for field, value in operation.data.items()
+    }
+
+    handler = _HANDLERS[(operation.entity_type, operation.op)]
+    try:
+        result = await handler(session, world, view_mode, entity_id, data)
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise fail(422, errors) from e
+    except HTTPException as e:
+        raise fail(e.status_code, e.detail) from e
+
+    item = None
+    if result is not None:
+        item = _RESPONSE_MODELS[operation.entity_type].model_validate(result).model_dump()
+        entity_id = item["id"]
+        if operation.temp_id is not None:
+            ids[operation.temp_id] = entity_id
+    return BatchResult(
+        index=index,
+        op=operation.op,
+        entity_type=operation.entity_type,
+        id=entity_id,
+        item=item,
+    )
@@ -0,0 +1,194 @@
+"""Bootstrap API endpoint: the UI's whole working set in one response."""
+
+from collections.abc import Iterator
+from typing import Annotated
+
+import orjson
+from fastapi import APIRouter, Depends, Header, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.factions import list_factions
+from app.api.graph import GraphResponse, get_graph
+from app.api.pages import list_pages
+from app.api.people import list_people
+from app.api.places import list_places
+from app.api.project import WorldResponse
+from app.api.snapshots import SnapshotResponse
+from app.db import get_session
+from app.dependencies import get_view_mode, require_initialized_project
+from app.models import ActiveSnapshot, MapAsset, Snapshot, World
+from app.schemas import FactionResponse, NotePageResponse, PersonResponse, PlaceResponse
+from app.services import versions
+from app.services.cache import VersionedCache
+from app.services.listing import ListParams
+from app.services.visibility import ViewMode
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+# Counters of everything the bootstrap response contains
+_DATA_VERSIONS = (
+    versions.GRAPH,
+    versions.FACTIONS,
+    versions.PEOPLE,
+    versions.PLACES,
+    versions.SNAPSHOTS,
+)
+
+# Encoded response parts per view mode, valid for one data version
+_bootstrap_cache: VersionedCache[tuple[bytes, ...]] = VersionedCache()
+
+
+class BootstrapMap(BaseModel):
+    """Base map of the active snapshot (the image is fetched separately)."""
+
+    id: str
+    snapshot_id: str
+    width: int
+    height: int
+
+
+class BootstrapResponse(BaseModel):
+    """Everything the UI loads on startup, as seen in the view mode."""
+
+    data_version: str  # Changes with any write to the data below (also sent as ETag)
+    world: WorldResponse
+    snapshots: list[SnapshotResponse]
+    active_snapshot_id: str | None
+    map: BootstrapMap | None  # None if the active snapshot has no base map
+    factions: list[FactionResponse]
+    people: list[PersonResponse]
+    places: list[PlaceResponse]
+    pages: list[NotePageResponse]
+    graph: GraphResponse
+
+
+def get_data_version(session: Session) -> str:
+    """Get the global data version: the bootstrap counters joined with dots."""
+    return ".".join(str(versions.get_version(session, name)) for name in _DATA_VERSIONS)
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Get the world, snapshots, active map, entity lists, pages and graph at once.
+
+    The lists are the same cached projections GET /factions, /people,
+    /places and /pages serve, so the response is assembled from their encoded
+    bodies plus a few set-based queries and streamed part by part. The whole
+    response is cached per view mode until the data version changes, and the
+    ETag lets the client revalidate with If-None-Match (304, no body).
+    """
+    data_version = get_data_version(session)
+    etag = f'"{world.id}:{data_version}:{view_mode}"'
+    headers = {"ETag": etag, "Vary": "X-View-Mode"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    parts = _bootstrap_cache.get(session, view_mode, data_version)
+    if parts is None:
+        parts = await _build_parts(session, world, view_mode, data_version)
+        _bootstrap_cache.put(session, view_mode, data_version, parts)
+
+    def stream() -> Iterator[bytes]:
+        yield from parts
+
+    return StreamingResponse(stream(), media_type="application/json", headers=headers)
+
+
+async def _build_parts(
+    session: Session, world: World, view_mode: ViewMode, data_version: str
+) -> tuple[bytes, ...]:
+    """Encode the bootstrap response as a sequence of JSON fragments."""
+    snapshots = [
+        row._asdict()
+        for row in session.execute(
+            select(Snapshot.id, Snapshot.at_date, Snapshot.label, Snapshot.created_at).order_by(
+                Snapshot.at_date
+            )
+        )
+    ]
+    active_snapshot_id = session.scalar(select(ActiveSnapshot.snapshot_id))
+    base_map = None
+    if active_snapshot_id is not None:
+        row = session.execute(
+            select(MapAsset.id, MapAsset.snapshot_id, MapAsset.width, MapAsset.height)
+            .where(MapAsset.snapshot_id == active_snapshot_id)
+            .limit(1)
+        ).first()
+        base_map = row._asdict() if row is not None else None
+
+    params = ListParams()
+    factions = await list_factions(
+        session=session, world=world, params=params, as_of_snapshot_id=None, view_mode=view_mode
+    )
+    people = await list_people(
+        session=session,
+        world=world,
+        params=params,
+        status=None,
+        workplace_place_id=None,
+        home_place_id=None,
+        tag=None,
+        alias=None,
+        as_of_snapshot_id=None,
+        view_mode=view_mode,
+    )
+    places = await list_places(
+        session=session,
+        world=world,
+        params=params,
+        type=None,
+        owner_faction_id=None,
+        parent_place_id=None,
+        bbox=None,
+        as_of_snapshot_id=None,
+        view_mode=view_mode,
+    )
+    pages = await list_pages(
+        session=session,
+        world=world,
+        params=params,
+        entity_type=None,
+        entity_id=None,
+        view_mode=view_mode,
+        include_backlink_counts=False,
+    )
+    graph = await get_graph(
+        session=session, world=world, include_layout=False, view_mode=view_mode, wire_format="json"
+    )
+    graph_body = (
+        orjson.dumps(graph.model_dump()) if isinstance(graph, GraphResponse) else bytes(graph.body)
+    )
+
+    header = orjson.dumps(
+        {
+            "data_version": data_version,
+            "world": WorldResponse.model_validate(world).model_dump(),
+            "snapshots": snapshots,
+            "active_snapshot_id": active_snapshot_id,
+            "map": base_map,
+        }
+    )
+    # The header object is left open and the encoded list bodies spliced in
+    return (
+        header[:-1],
+        b',"factions":',
+        bytes(factions.body),
+        b',"people":',
+        bytes(people.body),
+        b',"places":',
+        bytes(places.body),
+        b',"pages":',
+        bytes(pages.body),
+        b',"graph":',
+        graph_body,
+        b"}",
+    )
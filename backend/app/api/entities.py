@@ -0,0 +1,201 @@
+"""Cross-entity API endpoints."""
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Annotated, Any
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.api.listing import NEXT_CURSOR_HEADER
+from app.db import get_session
+from app.dependencies import get_view_mode, require_initialized_project
+from app.models import Faction, Person, Place, Snapshot, World
+from app.services.entity_history import EntityHistoryService, HistoryEntityType, HistoryKind
+from app.services.entity_versions import EntityVersionService, apply_versions
+from app.services.visibility import ViewMode, VisibilityService
+
+router = APIRouter(prefix="/entities", tags=["entities"])
+
+_ENTITY_MODELS: dict[str, type[Faction] | type[Person] | type[Place]] = {
+    "faction": Faction,
+    "person": Person,
+    "place": Place,
+}
+
+# Up to this many rows, "as of" values are looked up per entity; larger lists
+# stab the interval index once for the whole entity type
+_AS_OF_ID_LOOKUP_MAX = 500
+
+
+class EntityHistoryItem(BaseModel):
+    """One entry of an entity's history."""
+
+    kind: HistoryKind
+    id: str  # Event, page or snapshot ID
+    at: datetime  # Event time, page edit time or snapshot date
+    title: str
+    scope: str | None = None
+    snapshot_id: str | None = None
+    role: str | None = None  # Events: the entity's role in the event
+    tile_count: int | None = None  # Territory: tiles painted in the snapshot
+    value: str | None = None  # Versions: the attribute's new value
+
+
+class EntityVersionResponse(BaseModel):
+    """Value of an entity attribute from a snapshot's date until the next change."""
+
+    field: str
+    value: str | None
+    snapshot_id: str
+    valid_from: datetime
+    valid_to: datetime | None  # None: still in force
+
+    class Config:
+        """Pydantic config."""
+
+        from_attributes = True
+
+
+def as_of_overlay(
+    session: Session, entity_type: str, snapshot_id: str, view_mode: ViewMode
+) -> Callable[[list[dict[str, Any]]], None]:
+    """
+    Build a list annotator replacing versioned attributes with their values
+    as of a snapshot.
+
+    Raises:
+        HTTPException(404): If the snapshot does not exist
+    """
+    snapshot = session.get(Snapshot, snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    service = EntityVersionService(session)
+
+    def overlay(items: list[dict[str, Any]]) -> None:
+        entity_ids = None
+        if len(items) <= _AS_OF_ID_LOOKUP_MAX:
+            entity_ids = [item["id"] for item in items]
+        values = service.values_as_of(entity_type, snapshot.at_date, entity_ids)
+        for item in items:
+            apply_versions(item, values.get(item["id"], {}), view_mode)
+
+    return overlay
+
+
+def _check_entity(session: Session, entity_type: str, entity_id: str, view_mode: ViewMode) -> None:
+    entity = session.get(_ENTITY_MODELS[entity_type], entity_id)
+    if entity is None or (
+        isinstance(entity, Place) and not VisibilityService.filter_scope(entity.scope, view_mode)
+    ):
+        raise HTTPException(status_code=404, detail=f"{entity_type.capitalize()} not found")
+
+
+@router.get("/{entity_type}/{entity_id}/history", response_model=list[EntityHistoryItem])
+async def get_entity_history(
+    entity_type: HistoryEntityType,
+    entity_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    limit: Annotated[int, Query(ge=1, le=1000)] = 50,
+    cursor: Annotated[str | None, Query()] = None,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> Response:
+    """
+    Get an entity's history, newest first.
+
+    Merges the events referencing the entity, the note pages bound to it (at
+    their last edit) and, for factions, the snapshots they painted territory
+    in. The next page's cursor is returned in the X-Next-Cursor header.
+    """
+    _check_entity(session, entity_type, entity_id, view_mode)
+    visibility = VisibilityService()
+    try:
+        page = EntityHistoryService(session).get_history(
+            entity_type,
+            entity_id,
+            visibility.get_allowed_scopes(view_mode),
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return Response(
+        content=orjson.dumps(page.items), media_type="application/json", headers=headers
+    )
+
+
+@router.get("/{entity_type}/{entity_id}/versions", response_model=list[EntityVersionResponse])
+async def list_entity_versions(
+    entity_type: HistoryEntityType,
+    entity_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> list[EntityVersionResponse]:
+    """List the snapshot-dated changes of an entity's attributes, by field then date."""
+    _check_entity(session, entity_type, entity_id, view_mode)
+    return [
+        EntityVersionResponse.model_validate(version)
+        for version in EntityVersionService(session).list_versions(entity_type, entity_id)
+        if not (version.field == "notes_gm" and view_mode == "player")
+    ]
+
+
+@router.put(
+    "/{entity_type}/{entity_id}/versions/{snapshot_id}",
+    response_model=list[EntityVersionResponse],
+)
+async def set_entity_versions(
+    entity_type: HistoryEntityType,
+    entity_id: str,
+    snapshot_id: str,
+    values: dict[str, str | None],
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> list[EntityVersionResponse]:
+    """
+    Record attribute values that take effect at a snapshot's date.
+
+    Body: field -> value, e.g. `{"status": "dead"}`. Each value holds until
+    the attribute's next recorded change. notes_gm is ignored in player mode.
+    """
+    _check_entity(session, entity_type, entity_id, view_mode)
+    snapshot = session.get(Snapshot, snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    service = EntityVersionService(session)
+    try:
+        for field, value in values.items():
+            if field == "notes_gm" and view_mode == "player":
+                continue
+            service.set_value(entity_type, entity_id, field, snapshot, value)
+    except ValueError as e:
+        session.rollback()
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    session.commit()
+    return await list_entity_versions(entity_type, entity_id, session, world, view_mode)
+
+
+@router.delete("/{entity_type}/{entity_id}/versions/{snapshot_id}", status_code=204)
+async def delete_entity_versions(
+    entity_type: HistoryEntityType,
+    entity_id: str,
+    snapshot_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    field: Annotated[str | None, Query()] = None,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> None:
+    """Remove the attribute changes recorded in a snapshot (one `field`, or all)."""
+    _check_entity(session, entity_type, entity_id, view_mode)
+    removed = EntityVersionService(session).remove_value(entity_type, entity_id, snapshot_id, field)
+    if not removed:
+        raise HTTPException(status_code=404, detail="Version not found")
+    session.commit()
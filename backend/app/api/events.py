@@ -0,0 +1,287 @@
+"""Event timeline API endpoints."""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from typing import Annotated, Any, Literal
+
+import orjson
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.orm import Session
+
+from app.api.listing import get_list_params, list_response
+from app.db import get_session
+from app.dependencies import get_view_mode, require_initialized_project
+from app.models import Event, EventRef, World
+from app.schemas import EventResponse
+from app.services.change_stream import EntityChange, Subscription, broadcaster
+from app.services.listing import ListParams, ListSpec
+from app.services.visibility import ViewMode, VisibilityService
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+HistogramBucket = Literal["day", "week"]
+
+# Seconds between keepalive comments on an idle change stream
+_KEEPALIVE_SECONDS = 15.0
+# Milliseconds a disconnected stream client waits before reconnecting
+_RETRY_MS = 3000
+
+_LIST_SPEC = ListSpec(
+    id_column=Event.id,
+    fields={
+        "id": Event.id,
+        "at_datetime": Event.at_datetime,
+        "title": Event.title,
+        "body_markdown": Event.body_markdown,
+        "scope": Event.scope,
+        "snapshot_id": Event.snapshot_id,
+    },
+    sort_keys={"at_datetime": Event.at_datetime},
+    default_sort="at_datetime",
+    defaults={"refs": None},
+)
+
+
+class EventHistogramBucket(BaseModel):
+    """Number of events in one day or week."""
+
+    start: date  # First day of the bucket (weeks start on Monday)
+    count: int
+
+
+class EventHistogramSeries(BaseModel):
+    """Event counts over time, for one entity or for all events."""
+
+    entity_type: str | None = None  # None for the overall series
+    entity_id: str | None = None
+    buckets: list[EventHistogramBucket]  # Non-empty buckets, oldest first
+
+
+class EventHistogramResponse(BaseModel):
+    """Event histograms."""
+
+    bucket: HistogramBucket
+    series: list[EventHistogramSeries]
+
+
+def _conditions(
+    view_mode: ViewMode,
+    since: datetime | None,
+    until: datetime | None,
+    snapshot_id: str | None,
+    scope: str | None,
+) -> list[ColumnElement[bool]]:
+    visibility = VisibilityService()
+    conditions: list[ColumnElement[bool]] = [
+        Event.scope.in_(visibility.get_allowed_scopes(view_mode))
+    ]
+    if since is not None:
+        conditions.append(Event.at_datetime >= since)
+    if until is not None:
+        conditions.append(Event.at_datetime < until)
+    if snapshot_id is not None:
+        conditions.append(Event.snapshot_id == snapshot_id)
+    if scope is not None:
+        conditions.append(Event.scope == scope)
+    return conditions
+
+
+def _ref_conditions(entity_type: str | None, entity_id: str | None) -> list[ColumnElement[bool]]:
+    conditions: list[ColumnElement[bool]] = []
+    if entity_type is not None:
+        conditions.append(EventRef.entity_type == entity_type)
+    if entity_id is not None:
+        conditions.append(EventRef.entity_id == entity_id)
+    return conditions
+
+
+@router.get("", response_model=list[EventResponse])
+async def list_events(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    params: Annotated[ListParams, Depends(get_list_params)],
+    since: Annotated[datetime | None, Query(description="Earliest at_datetime (inclusive)")] = None,
+    until: Annotated[datetime | None, Query(description="Latest at_datetime (exclusive)")] = None,
+    entity_type: Annotated[str | None, Query()] = None,
+    entity_id: Annotated[str | None, Query()] = None,
+    snapshot_id: Annotated[str | None, Query()] = None,
+    scope: Annotated[str | None, Query(pattern=r"^(public|gm|player)$")] = None,
+    include_refs: Annotated[bool, Query()] = False,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> Response:
+    """
+    List events in timeline order, optionally filtered, projected and paginated.
+
+    `entity_type`/`entity_id` keep events referencing the entity (or any
+    entity of the type). Events are ordered by (at_datetime, id); with
+    `limit`, the next page's cursor is returned in the X-Next-Cursor header,
+    and each page is an index range scan however deep the timeline is
+    scrolled. `include_refs=true` adds each event's referenced entities.
+    """
+    conditions = _conditions(view_mode, since, until, snapshot_id, scope)
+    ref_conditions = _ref_conditions(entity_type, entity_id)
+    if ref_conditions:
+        conditions.append(Event.id.in_(select(EventRef.event_id).where(*ref_conditions)))
+    if params.sort is None:
+        params.sort = _LIST_SPEC.default_sort  # The timeline is always ordered
+
+    def add_refs(items: list[dict[str, Any]]) -> None:
+        refs: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        rows = session.execute(
+            select(EventRef.event_id, EventRef.entity_type, EventRef.entity_id, EventRef.role)
+            .where(EventRef.event_id.in_([item["id"] for item in items]))
+            .order_by(EventRef.event_id, EventRef.entity_type, EventRef.entity_id)
+        ).all()
+        for event_id, ref_type, ref_id, role in rows:
+            refs[event_id].append({"entity_type": ref_type, "entity_id": ref_id, "role": role})
+        for item in items:
+            item["refs"] = refs[item["id"]]
+
+    return list_response(
+        session,
+        _LIST_SPEC,
+        params,
+        view_mode,
+        conditions,
+        annotate=add_refs if include_refs else None,
+    )
+
+
+@router.get("/histogram", response_model=EventHistogramResponse)
+async def get_event_histogram(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    bucket: Annotated[HistogramBucket, Query()] = "day",
+    since: Annotated[datetime | None, Query()] = None,
+    until: Annotated[datetime | None, Query()] = None,
+    entity_type: Annotated[str | None, Query()] = None,
+    entity_id: Annotated[str | None, Query()] = None,
+    snapshot_id: Annotated[str | None, Query()] = None,
+    scope: Annotated[str | None, Query(pattern=r"^(public|gm|player)$")] = None,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> dict[str, object]:
+    """
+    Count events per day or week.
+
+    Without entity filters there is one overall series. With `entity_type`
+    (and optionally `entity_id`) there is one series per referenced entity,
+    all computed by a single grouped query.
+    """
+    if bucket == "week":
+        start = func.date(Event.at_datetime, "-6 days", "weekday 1")  # Monday on or before
+    else:
+        start = func.date(Event.at_datetime)
+    conditions = _conditions(view_mode, since, until, snapshot_id, scope)
+    ref_conditions = _ref_conditions(entity_type, entity_id)
+
+    series: dict[tuple[str | None, str | None], list[dict[str, object]]] = defaultdict(list)
+    if ref_conditions:
+        rows = session.execute(
+            select(
+                EventRef.entity_type, EventRef.entity_id, start, func.count(func.distinct(Event.id))
+            )
+            .join(Event, Event.id == EventRef.event_id)
+            .where(*conditions, *ref_conditions)
+            .group_by(EventRef.entity_type, EventRef.entity_id, start)
+            .order_by(EventRef.entity_type, EventRef.entity_id, start)
+        ).all()
+        for ref_type, ref_id, day, count in rows:
+            series[(ref_type, ref_id)].append({"start": day, "count": count})
+    else:
+        rows = session.execute(
+            select(start, func.count()).where(*conditions).group_by(start).order_by(start)
+        ).all()
+        series[(None, None)] = [{"start": day, "count": count} for day, count in rows]
+
+    return {
+        "bucket": bucket,
+        "series": [
+            {"entity_type": ref_type, "entity_id": ref_id, "buckets": buckets}
+            for (ref_type, ref_id), buckets in series.items()
+        ],
+    }
+
+
+@router.get("/stream")
+async def stream_changes(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+    last_event_id: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
+) -> StreamingResponse:
+    """
+    Stream entity change notifications as Server-Sent Events.
+
+    Each committed create, update or delete of a faction, person, place,
+    page, event or snapshot is sent as an `event: change` message whose data
+    is `{seq, entity_type, id, op, version}` (version: the entity type's
+    counter after the write, when it has one), so clients refetch only what
+    changed. Changes of entities hidden in the view mode are left out; an
+    entity hidden or revealed by a scope change is seen as deleted or
+    inserted. A client reconnecting with Last-Event-ID gets the changes it
+    missed, or an `event: resync` message if they are no longer kept (then
+    it reloads everything, e.g. via /bootstrap).
+    """
+    # Subscribe before reading the backlog, so no change falls in between
+    subscription = broadcaster.subscribe()
+    backlog: list[EntityChange] | None = []
+    if last_event_id is not None:
+        try:
+            backlog = broadcaster.since(int(last_event_id))
+        except ValueError:
+            backlog = None
+    # The stream may stay open for hours; give the connection back now
+    session.close()
+
+    return StreamingResponse(
+        _change_events(subscription, view_mode, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _change_events(
+    subscription: Subscription, view_mode: ViewMode, backlog: list[EntityChange] | None
+) -> AsyncIterator[str]:
+    """Encode the backlog and then live changes as SSE messages."""
+    try:
+        yield f"retry: {_RETRY_MS}\n\n"
+        if backlog is None:
+            yield "event: resync\ndata: {}\n\n"
+            backlog = []
+        last_seq = 0
+        for change in backlog:
+            last_seq = change.seq
+            message = _change_message(change, view_mode)
+            if message is not None:
+                yield message
+
+        while True:
+            try:
+                queued = await asyncio.wait_for(subscription.queue.get(), _KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if queued is None:
+                # The client fell too far behind; it reconnects and resyncs
+                yield "event: resync\ndata: {}\n\n"
+                return
+            if queued.seq <= last_seq:
+                continue  # Already sent from the backlog
+            message = _change_message(queued, view_mode)
+            if message is not None:
+                yield message
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+def _change_message(change: EntityChange, view_mode: ViewMode) -> str | None:
+    data = change.for_view_mode(view_mode)
+    if data is None:
+        return None
+    return f"id: {change.seq}\nevent: change\ndata: {orjson.dumps(data).decode()}\n\n"
@@ -8,6 +8,8 @@ from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from app.db import DATABASE_PATH, engine, get_session, init_db
+from app.services.cache import clear_all_caches
+from app.services.tile_write_queue import flush_all_tile_queues
 
 router = APIRouter(tags=["export"])
 
@@ -21,7 +23,8 @@ async def export_project(
 
     Returns the database file for download.
     """
-    # Close all connections to allow file copy
+    # Write queued territory tiles, then close all connections to allow file copy
+    flush_all_tile_queues()
     session.close()
     engine.dispose()
 
@@ -48,6 +51,9 @@ async def import_project(
     if not file.filename or not file.filename.endswith(".db"):
         raise HTTPException(status_code=400, detail="File must be a .db SQLite database")
 
+    # Queued territory tiles belong to the current project, and its backup
+    flush_all_tile_queues()
+
     try:
         # Backup current database if it exists
         if DATABASE_PATH.exists():
@@ -59,8 +65,9 @@ async def import_project(
             content = await file.read()
             f.write(content)
 
-        # Reinitialize database connection
+        # Reinitialize database connection and drop data cached from the old project
         init_db()
+        clear_all_caches()
 
         return {"status": "ok", "message": "Project imported successfully"}
 
@@ -1,48 +1,133 @@
 """Factions API endpoints."""
 
 import uuid
+from dataclasses import asdict
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.api.entities import as_of_overlay
+from app.api.listing import get_list_params, list_response
 from app.db import get_session
 from app.dependencies import get_view_mode, require_initialized_project
 from app.models import Faction, World
 from app.schemas import FactionCreate, FactionResponse, FactionUpdate
+from app.services import versions
+from app.services.entity_versions import EntityVersionService
+from app.services.faction_roster import FactionRoster, FactionRosterService
+from app.services.listing import ListParams, ListSpec
+from app.services.tile_write_queue import get_tile_write_queue
 from app.services.visibility import ViewMode, VisibilityService
 
 router = APIRouter(prefix="/factions", tags=["factions"])
 
 
+_LIST_SPEC = ListSpec(
+    id_column=Faction.id,
+    fields={
+        "id": Faction.id,
+        "name": Faction.name,
+        "color": Faction.color,
+        "opacity": Faction.opacity,
+        "notes_public": Faction.notes_public,
+        "notes_gm": Faction.notes_gm,
+        "created_at": Faction.created_at,
+        "updated_at": Faction.updated_at,
+    },
+    sort_keys={"name": Faction.name, "updated_at": Faction.updated_at},
+    default_sort="name",
+)
+
+
+class RosterPlayerCharacterResponse(BaseModel):
+    """Player character info of a faction member."""
+
+    playbook: str | None
+    crew: str | None
+    is_active: bool
+
+
+class RosterMemberResponse(BaseModel):
+    """Faction member with their role."""
+
+    membership_id: str
+    person_id: str
+    name: str
+    role: str | None
+    status: str
+    workplace_place_id: str | None
+    workplace_name: str | None  # None if there is no workplace or it is hidden
+    player_character: RosterPlayerCharacterResponse | None  # None for NPCs
+
+
+class FactionRosterResponse(BaseModel):
+    """Faction's members, by name, with counts."""
+
+    faction_id: str
+    name: str
+    member_count: int
+    pc_count: int  # Members who are player characters
+    members: list[RosterMemberResponse]
+
+
+def _roster_body(roster: FactionRoster) -> dict[str, Any]:
+    return {**asdict(roster), "member_count": roster.member_count, "pc_count": roster.pc_count}
+
+
 @router.get("", response_model=list[FactionResponse])
 async def list_factions(
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    params: Annotated[ListParams, Depends(get_list_params)],
+    as_of_snapshot_id: Annotated[
+        str | None, Query(description="Read versioned attributes as of this snapshot")
+    ] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
-) -> list[dict[str, object]]:
-    """List all factions."""
-    factions = session.execute(select(Faction)).scalars().all()
-    visibility = VisibilityService()
+) -> Response:
+    """
+    List factions, optionally sorted, projected and paginated.
+
+    With `as_of_snapshot_id`, notes show their values as of the snapshot.
+    Sort keys: name (default), updated_at. With `limit`, the next page's
+    cursor is returned in the X-Next-Cursor header.
+    """
+    annotate = None
+    if as_of_snapshot_id is not None:
+        annotate = as_of_overlay(session, "faction", as_of_snapshot_id, view_mode)
+    return list_response(
+        session, _LIST_SPEC, params, view_mode, annotate=annotate, projection="factions"
+    )
 
-    return [
-        visibility.filter_notes_gm(
-            {
-                "id": f.id,
-                "name": f.name,
-                "color": f.color,
-                "opacity": f.opacity,
-                "notes_public": f.notes_public,
-                "notes_gm": f.notes_gm,
-                "created_at": f.created_at,
-                "updated_at": f.updated_at,
-            },
-            view_mode,
-        )
-        for f in factions
-    ]
+
+@router.get("/rosters", response_model=list[FactionRosterResponse])
+async def list_faction_rosters(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    faction_ids: Annotated[
+        str | None, Query(description="Comma-separated faction IDs; all factions if omitted")
+    ] = None,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> Response:
+    """
+    Get the rosters of several factions at once, ordered by faction name.
+
+    The whole set takes the same few queries as a single roster; unknown
+    IDs are skipped.
+    """
+    ids = None
+    if faction_ids is not None:
+        ids = [faction_id.strip() for faction_id in faction_ids.split(",") if faction_id.strip()]
+    rosters = FactionRosterService(session).get_rosters(
+        ids, VisibilityService.get_allowed_scopes(view_mode)
+    )
+    return Response(
+        content=orjson.dumps([_roster_body(roster) for roster in rosters]),
+        media_type="application/json",
+    )
 
 
 @router.post("", response_model=FactionResponse, status_code=201)
@@ -62,6 +147,8 @@ async def create_faction(
         notes_gm=faction_data.notes_gm,
     )
     session.add(faction)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.FACTIONS)
     session.commit()
     session.refresh(faction)
     return faction
@@ -72,15 +159,18 @@ async def get_faction(
     faction_id: str,
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    as_of_snapshot_id: Annotated[
+        str | None, Query(description="Read versioned attributes as of this snapshot")
+    ] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
 ) -> dict[str, object]:
-    """Get a faction by ID."""
+    """Get a faction by ID, optionally as of a snapshot."""
     faction = session.get(Faction, faction_id)
     if not faction:
         raise HTTPException(status_code=404, detail="Faction not found")
 
     visibility = VisibilityService()
-    return visibility.filter_notes_gm(
+    item = visibility.filter_notes_gm(
         {
             "id": faction.id,
             "name": faction.name,
@@ -93,6 +183,25 @@ async def get_faction(
         },
         view_mode,
     )
+    if as_of_snapshot_id is not None:
+        as_of_overlay(session, "faction", as_of_snapshot_id, view_mode)([item])
+    return item
+
+
+@router.get("/{faction_id}/roster", response_model=FactionRosterResponse)
+async def get_faction_roster(
+    faction_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> Response:
+    """Get a faction's members with their roles, workplaces and PC info."""
+    rosters = FactionRosterService(session).get_rosters(
+        [faction_id], VisibilityService.get_allowed_scopes(view_mode)
+    )
+    if not rosters:
+        raise HTTPException(status_code=404, detail="Faction not found")
+    return Response(content=orjson.dumps(_roster_body(rosters[0])), media_type="application/json")
 
 
 @router.put("/{faction_id}", response_model=FactionResponse)
@@ -114,6 +223,8 @@ async def update_faction(
 
     faction.updated_at = datetime.utcnow()
     session.add(faction)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.FACTIONS)
     session.commit()
     session.refresh(faction)
     return faction
@@ -130,5 +241,11 @@ async def delete_faction(
     if not faction:
         raise HTTPException(status_code=404, detail="Faction not found")
 
+    EntityVersionService(session).remove_entity("faction", faction.id)
+    get_tile_write_queue(session).discard(faction_id=faction.id)
     session.delete(faction)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.FACTIONS)
+    versions.bump_version(session, versions.PLACES)  # Owned places lose their owner
+    versions.bump_version(session, versions.TERRITORY)  # Its tiles are deleted with it
     session.commit()
@@ -2,15 +2,20 @@
 
 from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.db import get_session
-from app.dependencies import get_view_mode, require_initialized_project
+from app.dependencies import get_view_mode, get_wire_format, require_initialized_project
 from app.models import World
-from app.services.graph_service import GraphService
+from app.services import versions
+from app.services.entity_graph import EntityType, get_entity_graph
+from app.services.graph_changes import ChangeOp, GraphChangeLog
+from app.services.graph_layout_service import GraphLayoutService
+from app.services.graph_service import GraphService, NeighborhoodDirection
 from app.services.visibility import ViewMode
+from app.services.wire_format import WireFormat, compact_graph, serialize_compact
 
 router = APIRouter(prefix="/graph", tags=["graph"])
 
@@ -19,9 +24,11 @@ class GraphNode(BaseModel):
     """Graph node representation."""
 
     id: str
-    type: Literal["page"]  # Can be extended to include faction, person, place
+    type: EntityType
     title: str
     visibility: str
+    x: float | None = None  # Precomputed layout position (include_layout=true)
+    y: float | None = None
 
 
 class GraphEdge(BaseModel):
@@ -36,36 +43,164 @@ class GraphEdge(BaseModel):
 class GraphResponse(BaseModel):
     """Graph response with nodes and edges."""
 
+    version: int  # Graph version, the starting point for /graph/changes
     nodes: list[GraphNode]
     edges: list[GraphEdge]
 
 
+class EntityGraphEdge(GraphEdge):
+    """Typed edge of the unified entity graph."""
+
+    role: str | None = None  # Faction membership or event role
+
+
+class EntityGraphResponse(BaseModel):
+    """Unified graph of pages, factions, people, places and events."""
+
+    nodes: list[GraphNode]
+    edges: list[EntityGraphEdge]
+
+
+class NeighborhoodNode(GraphNode):
+    """Graph node with its distance (in hops) from the neighborhood center."""
+
+    depth: int
+
+
+class NeighborhoodResponse(BaseModel):
+    """Subgraph around a single page."""
+
+    center_id: str
+    nodes: list[NeighborhoodNode]
+    edges: list[GraphEdge]
+    truncated: bool  # True if the node limit cut off farther pages
+
+
+class NodeMetrics(BaseModel):
+    """Centrality metrics of a single page."""
+
+    id: str
+    title: str
+    entity_type: str | None = None
+    entity_id: str | None = None
+    in_degree: int
+    out_degree: int
+    pagerank: float
+    component: int  # 0 is the largest component
+
+
+class GraphAnalyticsResponse(BaseModel):
+    """Centrality, components and orphans of the visible graph."""
+
+    version: int  # Graph version the metrics were computed at
+    node_count: int
+    edge_count: int
+    nodes: list[NodeMetrics]  # Ordered by PageRank, highest first
+    component_sizes: list[int]  # Indexed by component, largest first
+    hubs: list[str]  # IDs of the top pages by PageRank
+    orphans: list[str]  # IDs of pages with no visible links
+
+
+class GraphChangeItem(BaseModel):
+    """Single node or link change of the graph change feed."""
+
+    version: int  # Graph version the change belongs to
+    kind: Literal["node", "link"]
+    op: ChangeOp
+    id: str  # Page ID for nodes, link ID for links
+    node: GraphNode | None = None  # Set for node changes
+    edge: GraphEdge | None = None  # Set for link changes
+
+
+class GraphChangesResponse(BaseModel):
+    """Graph changes since a version."""
+
+    version: int  # Current graph version; pass as `since` on the next call
+    resync: bool  # True if the delta is unavailable and the full graph must be reloaded
+    changes: list[GraphChangeItem]
+
+
+class BacklinksBatchRequest(BaseModel):
+    """Pages to get backlinks for."""
+
+    page_ids: list[str] = Field(..., min_length=1, max_length=1000)
+    include_pages: bool = False  # Also return the linking pages, not just counts
+
+
+class BacklinkPage(BaseModel):
+    """Page linking to another page."""
+
+    id: str
+    title: str
+    visibility: str
+
+
+class BacklinksBatchResponse(BaseModel):
+    """Backlink counts (and optionally lists) per page."""
+
+    counts: dict[str, int]  # Only visible, existing pages are included
+    pages: dict[str, list[BacklinkPage]] | None = None  # Set if include_pages
+
+
+class PathResponse(BaseModel):
+    """Shortest paths between two pages."""
+
+    paths: list[list[str]]  # Page IDs from start to end, shortest first
+    nodes: list[GraphNode]  # Pages appearing on any path
+
+
 @router.get("", response_model=GraphResponse)
 async def get_graph(
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    include_layout: Annotated[bool, Query()] = False,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
-) -> GraphResponse:
+    wire_format: Annotated[WireFormat, Depends(get_wire_format)] = "json",
+) -> GraphResponse | Response:
     """
     Get the full graph of pages and links.
 
     Args:
         session: Database session
         world: World instance (ensures project is initialized)
+        include_layout: Include precomputed x/y node positions
         view_mode: View mode (gm or player)
+        wire_format: Response encoding (`format=compact|msgpack` or Accept)
 
     Returns:
-        Graph with filtered nodes and edges
+        Graph with filtered nodes and edges, as columnar arrays for the
+        compact formats
     """
+    version = versions.get_version(session, versions.GRAPH)
     graph_service = GraphService(session)
     pages, links = graph_service.get_graph(view_mode)
 
+    positions: dict[str, tuple[float, float]] = {}
+    if include_layout:
+        positions = GraphLayoutService(session).get_positions(pages, links, view_mode)
+        session.commit()
+
+    if wire_format != "json":
+        payload = compact_graph(
+            ((page.id, "page", page.title, page.scope) for page in pages),
+            (
+                (link.from_page_id, link.to_page_id, link.link_type, link.scope, None)
+                for link in links
+            ),
+            positions if include_layout else None,
+            version,
+        )
+        body, media_type = serialize_compact(payload, wire_format)
+        return Response(content=body, media_type=media_type)
+
     nodes = [
         GraphNode(
             id=page.id,
             type="page",
             title=page.title,
             visibility=page.scope,  # Map scope to visibility for API compat
+            x=positions[page.id][0] if page.id in positions else None,
+            y=positions[page.id][1] if page.id in positions else None,
         )
         for page in pages
     ]
@@ -80,7 +215,260 @@ async def get_graph(
         for link in links
     ]
 
-    return GraphResponse(nodes=nodes, edges=edges)
+    return GraphResponse(version=version, nodes=nodes, edges=edges)
+
+
+@router.get("/changes", response_model=GraphChangesResponse)
+async def get_graph_changes(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    since: Annotated[int, Query(ge=0)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> GraphChangesResponse:
+    """
+    Get node and link changes after a graph version.
+
+    Clients load GET /graph once, then poll this endpoint with the last seen
+    version and apply the changes in order. Changes that move a page or link
+    in or out of the view mode are reported as inserts or deletes.
+
+    Args:
+        session: Database session
+        world: World instance (ensures project is initialized)
+        since: Graph version the client is at
+        view_mode: View mode (gm or player)
+
+    Returns:
+        Changes since the version, or a resync marker if the change log no
+        longer covers it
+    """
+    version = versions.get_version(session, versions.GRAPH)
+    changes = GraphChangeLog(session).changes_since(since, view_mode)
+    if changes is None:
+        return GraphChangesResponse(version=version, resync=True, changes=[])
+
+    items = []
+    for change in changes:
+        row = change.change
+        if row.kind == "node":
+            node = GraphNode(
+                id=row.entity_id, type="page", title=row.title or "", visibility=row.scope
+            )
+            items.append(
+                GraphChangeItem(
+                    version=change.version, kind="node", op=change.op, id=row.entity_id, node=node
+                )
+            )
+        else:
+            edge = GraphEdge(
+                from_id=row.from_page_id or "",
+                to_id=row.to_page_id or "",
+                link_type=row.link_type or "",
+                visibility=row.scope,
+            )
+            items.append(
+                GraphChangeItem(
+                    version=change.version, kind="link", op=change.op, id=row.entity_id, edge=edge
+                )
+            )
+
+    return GraphChangesResponse(version=version, resync=False, changes=items)
+
+
+@router.get("/entities", response_model=EntityGraphResponse)
+async def get_entities_graph(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+    wire_format: Annotated[WireFormat, Depends(get_wire_format)] = "json",
+) -> EntityGraphResponse | Response:
+    """
+    Get the unified graph of all entities and their relations.
+
+    Edges cover page links, page bindings (about), faction memberships
+    (member_of), workplaces and homes (works_at, lives_at), the place
+    hierarchy (part_of), place ownership (owned_by) and event references
+    (involves).
+
+    Args:
+        session: Database session
+        world: World instance (ensures project is initialized)
+        view_mode: View mode (gm or player)
+        wire_format: Response encoding (`format=compact|msgpack` or Accept)
+
+    Returns:
+        Typed nodes and edges visible in the view mode
+    """
+    graph = get_entity_graph(session, view_mode)
+
+    if wire_format != "json":
+        payload = compact_graph(
+            ((n.id, n.type, n.title, n.visibility) for n in graph.nodes),
+            ((e.from_id, e.to_id, e.link_type, e.visibility, e.role) for e in graph.edges),
+        )
+        body, media_type = serialize_compact(payload, wire_format)
+        return Response(content=body, media_type=media_type)
+
+    return EntityGraphResponse(
+        nodes=[
+            GraphNode(id=n.id, type=n.type, title=n.title, visibility=n.visibility)
+            for n in graph.nodes
+        ],
+        edges=[
+            EntityGraphEdge(
+                from_id=e.from_id,
+                to_id=e.to_id,
+                link_type=e.link_type,
+                visibility=e.visibility,
+                role=e.role,
+            )
+            for e in graph.edges
+        ],
+    )
+
+
+@router.get("/neighborhood/{page_id}", response_model=NeighborhoodResponse)
+async def get_neighborhood(
+    page_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    depth: Annotated[int, Query(ge=1, le=6)] = 2,
+    direction: Annotated[NeighborhoodDirection, Query()] = "both",
+    limit: Annotated[int, Query(ge=1, le=2000)] = 200,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> NeighborhoodResponse:
+    """
+    Get the pages within ``depth`` links of a page.
+
+    Args:
+        page_id: Center page ID
+        session: Database session
+        world: World instance (ensures project is initialized)
+        depth: Maximum number of hops from the center page
+        direction: Follow outgoing links (out), backlinks (in) or both
+        limit: Maximum number of nodes; the closest pages are kept
+        view_mode: View mode (gm or player)
+
+    Returns:
+        Nodes with their distance from the center and the links between them
+    """
+    graph_service = GraphService(session)
+    hood = graph_service.get_neighborhood(page_id, depth, direction, limit, view_mode)
+    if hood is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    nodes = [
+        NeighborhoodNode(
+            id=page.id,
+            type="page",
+            title=page.title,
+            visibility=page.scope,
+            depth=hood.distances[page.id],
+        )
+        for page in hood.pages
+    ]
+
+    edges = [
+        GraphEdge(
+            from_id=link.from_page_id,
+            to_id=link.to_page_id,
+            link_type=link.link_type,
+            visibility=link.scope,
+        )
+        for link in hood.links
+    ]
+
+    return NeighborhoodResponse(
+        center_id=page_id, nodes=nodes, edges=edges, truncated=hood.truncated
+    )
+
+
+@router.get("/analytics", response_model=GraphAnalyticsResponse)
+async def get_graph_analytics(
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    top: Annotated[int, Query(ge=1, le=100)] = 10,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> GraphAnalyticsResponse:
+    """
+    Get degree, PageRank, component and orphan analytics for the graph.
+
+    Args:
+        session: Database session
+        world: World instance (ensures project is initialized)
+        top: Number of hub pages to return
+        view_mode: View mode (gm or player)
+
+    Returns:
+        Per-page metrics with hubs and orphan pages
+    """
+    graph_service = GraphService(session)
+    analytics = graph_service.get_analytics(view_mode)
+    metrics = analytics.metrics
+
+    nodes = [
+        NodeMetrics(
+            id=node.id,
+            title=node.title,
+            entity_type=node.entity_type,
+            entity_id=node.entity_id,
+            in_degree=metrics.in_degree[i],
+            out_degree=metrics.out_degree[i],
+            pagerank=metrics.pagerank[i],
+            component=metrics.component[i],
+        )
+        for i, node in enumerate(analytics.nodes)
+    ]
+    nodes.sort(key=lambda n: (-n.pagerank, n.title))
+
+    return GraphAnalyticsResponse(
+        version=analytics.version,
+        node_count=len(nodes),
+        edge_count=analytics.edge_count,
+        nodes=nodes,
+        component_sizes=metrics.component_sizes,
+        hubs=[n.id for n in nodes[:top]],
+        orphans=[n.id for n in nodes if n.in_degree == 0 and n.out_degree == 0],
+    )
+
+
+@router.get("/path", response_model=PathResponse)
+async def get_path(
+    from_id: Annotated[str, Query(alias="from")],
+    to_id: Annotated[str, Query(alias="to")],
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    k: Annotated[int, Query(ge=1, le=10)] = 1,
+    directed: Annotated[bool, Query()] = False,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> PathResponse:
+    """
+    Find the shortest paths connecting two pages.
+
+    Args:
+        from_id: Start page ID
+        to_id: End page ID
+        session: Database session
+        world: World instance (ensures project is initialized)
+        k: Number of shortest paths to return
+        directed: Only follow links in their direction (default: either way)
+        view_mode: View mode (gm or player); paths only use visible pages
+
+    Returns:
+        Paths (empty if the pages are not connected) and their pages
+    """
+    graph_service = GraphService(session)
+    paths = graph_service.find_paths(from_id, to_id, k, directed, view_mode)
+    if paths is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+    page_ids = list(dict.fromkeys(pid for path in paths for pid in path))
+    nodes = [
+        GraphNode(id=page.id, type="page", title=page.title, visibility=page.scope)
+        for page in graph_service.page_repo.list_by_ids(page_ids)
+    ]
+
+    return PathResponse(paths=paths, nodes=nodes)
 
 
 @router.get("/backlinks/{page_id}", response_model=list[dict[str, str]])
@@ -113,3 +501,41 @@ async def get_page_backlinks(
     backlink_pages = graph_service.get_backlinks(page_id, view_mode)
 
     return [{"id": p.id, "title": p.title, "visibility": p.scope} for p in backlink_pages]
+
+
+@router.post("/backlinks", response_model=BacklinksBatchResponse)
+async def get_backlinks_batch(
+    request: BacklinksBatchRequest,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> BacklinksBatchResponse:
+    """
+    Get backlink counts, and optionally backlink lists, for many pages at once.
+
+    Args:
+        request: Page IDs and whether to include the linking pages
+        session: Database session
+        world: World instance (ensures project is initialized)
+        view_mode: View mode (gm or player)
+
+    Returns:
+        Counts (and lists) keyed by page ID; unknown or hidden pages are omitted
+    """
+    graph_service = GraphService(session)
+
+    if not request.include_pages:
+        counts = graph_service.get_backlink_counts(request.page_ids, view_mode)
+        return BacklinksBatchResponse(counts=counts)
+
+    lists = graph_service.get_backlink_lists(request.page_ids, view_mode)
+    return BacklinksBatchResponse(
+        counts={page_id: len(pages) for page_id, pages in lists.items()},
+        pages={
+            page_id: [
+                BacklinkPage(id=from_id, title=title, visibility=scope)
+                for from_id, title, scope in pages
+            ]
+            for page_id, pages in lists.items()
+        },
+    )
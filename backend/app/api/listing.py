@@ -0,0 +1,99 @@
+"""Shared query parameters and responses for paginated list endpoints."""
+
+from collections.abc import Callable, Sequence
+from typing import Annotated, Any
+
+import orjson
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import Session
+
+from app.services.listing import ListParams, ListSpec, SortOrder, list_rows
+from app.services.projections import ProjectionType, get_projection
+from app.services.visibility import ViewMode, VisibilityService
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_list_params(
+    fields: Annotated[str | None, Query(description="Comma-separated fields to return")] = None,
+    sort: Annotated[str | None, Query()] = None,
+    order: Annotated[SortOrder, Query()] = "asc",
+    limit: Annotated[int | None, Query(ge=1, le=1000)] = None,
+    cursor: Annotated[str | None, Query()] = None,
+) -> ListParams:
+    """
+    Get pagination, projection and sort parameters from the query string.
+
+    Args:
+        fields: Comma-separated field names (id is always included)
+        sort: Sort key
+        order: Sort order
+        limit: Page size; without it all rows are returned
+        cursor: Cursor from the previous page's X-Next-Cursor header
+
+    Returns:
+        ListParams instance
+    """
+    field_list = None
+    if fields is not None:
+        field_list = [name.strip() for name in fields.split(",") if name.strip()]
+    return ListParams(fields=field_list, sort=sort, order=order, limit=limit, cursor=cursor)
+
+
+def list_response(
+    session: Session,
+    spec: ListSpec,
+    params: ListParams,
+    view_mode: ViewMode,
+    conditions: Sequence[ColumnElement[bool]] = (),
+    annotate: Callable[[list[dict[str, Any]]], None] | None = None,
+    projection: ProjectionType | None = None,
+) -> Response:
+    """
+    Run a list query and encode the rows straight to JSON bytes.
+
+    Rows come from typed ORM columns, so they are encoded with orjson as
+    they are instead of being revalidated against the route's response
+    model (which stays declared for the OpenAPI schema). The next page's
+    cursor is sent in the X-Next-Cursor header.
+
+    Args:
+        session: Database session
+        spec: List spec of the entity
+        params: List parameters of the request
+        view_mode: View mode (player mode hides notes_gm)
+        conditions: Visibility and query filters
+        annotate: Adds computed fields to the page's rows in place
+        projection: Entity type whose cached full-list projection may be
+            served; set only when no query filters apply
+
+    Returns:
+        JSON response with the rows
+
+    Raises:
+        HTTPException(422): If fields, sort or cursor are invalid
+    """
+    if projection is not None and annotate is None and params == ListParams():
+        body = get_projection(
+            session,
+            projection,
+            view_mode,
+            lambda: bytes(list_response(session, spec, params, view_mode, conditions).body),
+        )
+        return Response(content=body, media_type="application/json")
+
+    try:
+        page = list_rows(session, spec, params, conditions)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+    items = page.items
+    if view_mode == "player" and items and "notes_gm" in items[0]:
+        visibility = VisibilityService()
+        items = [visibility.filter_notes_gm(item, view_mode) for item in items]
+    if annotate is not None:
+        annotate(items)
+
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return Response(content=orjson.dumps(items), media_type="application/json", headers=headers)
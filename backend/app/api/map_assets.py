@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.db import get_session
 from app.dependencies import require_initialized_project
 from app.models import MapAsset, Snapshot, World
+from app.services import versions
 
 router = APIRouter(prefix="/snapshots", tags=["map_assets"])
 
@@ -69,6 +70,7 @@ async def upload_map(
         )
         session.add(map_asset)
 
+    versions.bump_version(session, versions.SNAPSHOTS)
     session.commit()
 
     return {
@@ -125,4 +127,5 @@ async def delete_map(
         raise HTTPException(status_code=404, detail="Map not found for this snapshot")
 
     session.delete(map_asset)
+    versions.bump_version(session, versions.SNAPSHOTS)
     session.commit()
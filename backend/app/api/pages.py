@@ -2,36 +2,86 @@
 
 import uuid
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import ColumnElement, select
 from sqlalchemy.orm import Session
 
+from app.api.listing import get_list_params, list_response
 from app.db import get_session
 from app.dependencies import get_view_mode, require_initialized_project
 from app.models import NotePage, World
 from app.schemas import NotePageCreate, NotePageResponse, NotePageUpdate
+from app.services.graph_changes import GraphChangeLog
+from app.services.graph_service import GraphService
+from app.services.listing import ListParams, ListSpec
 from app.services.pages_service import PagesService
 from app.services.visibility import ViewMode, VisibilityService
 
 router = APIRouter(prefix="/pages", tags=["pages"])
 
 
+_LIST_SPEC = ListSpec(
+    id_column=NotePage.id,
+    fields={
+        "id": NotePage.id,
+        "title": NotePage.title,
+        "body_markdown": NotePage.body_markdown,
+        "visibility": NotePage.scope,  # Map scope to visibility for API compat
+        "entity_type": NotePage.entity_type,
+        "entity_id": NotePage.entity_id,
+        "created_at": NotePage.created_at,
+        "updated_at": NotePage.updated_at,
+    },
+    sort_keys={"title": NotePage.title, "updated_at": NotePage.updated_at},
+    default_sort="title",
+    defaults={"backlink_count": None},
+)
+
+
 @router.get("", response_model=list[NotePageResponse])
 async def list_pages(
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    params: Annotated[ListParams, Depends(get_list_params)],
+    entity_type: Annotated[str | None, Query()] = None,
+    entity_id: Annotated[str | None, Query()] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
-) -> list[NotePageResponse]:
-    """List all note pages."""
+    include_backlink_counts: Annotated[bool, Query()] = False,
+) -> Response:
+    """
+    List note pages, optionally filtered, sorted, projected and paginated.
+
+    Sort keys: title (default), updated_at. With `limit`, the next page's
+    cursor is returned in the X-Next-Cursor header. A sidebar can request
+    `fields=title` to skip loading page bodies.
+    """
     visibility = VisibilityService()
-    allowed_scopes = visibility.get_allowed_scopes(view_mode)
-
-    pages = (
-        session.execute(select(NotePage).where(NotePage.scope.in_(allowed_scopes))).scalars().all()
+    conditions: list[ColumnElement[bool]] = [
+        NotePage.scope.in_(visibility.get_allowed_scopes(view_mode))
+    ]
+    if entity_type is not None:
+        conditions.append(NotePage.entity_type == entity_type)
+    if entity_id is not None:
+        conditions.append(NotePage.entity_id == entity_id)
+
+    def add_backlink_counts(items: list[dict[str, Any]]) -> None:
+        # Count only the returned pages when paginating, else all in one pass
+        page_ids = [item["id"] for item in items] if params.limit is not None else None
+        counts = GraphService(session).get_backlink_counts(page_ids, view_mode)
+        for item in items:
+            item["backlink_count"] = counts.get(item["id"], 0)
+
+    return list_response(
+        session,
+        _LIST_SPEC,
+        params,
+        view_mode,
+        conditions,
+        annotate=add_backlink_counts if include_backlink_counts else None,
+        projection="pages" if entity_type is None and entity_id is None else None,
     )
-    return [NotePageResponse.from_orm(p) for p in pages]
 
 
 @router.post("", response_model=NotePageResponse, status_code=201)
@@ -58,6 +108,10 @@ async def create_page(
         entity_id=page_data.entity_id,
     )
     session.add(page)
+    session.flush()
+    change_log = GraphChangeLog(session)
+    change_log.record_page("insert", page)
+    change_log.bump()
     session.commit()
     session.refresh(page)
 
@@ -113,6 +167,7 @@ async def update_page(
 
     # Update only provided fields
     update_data = page_data.model_dump(exclude_unset=True)
+    prev_title, prev_scope = page.title, page.scope
     for field, value in update_data.items():
         # Map 'visibility' from schema to 'scope' in model
         if field == "visibility":
@@ -122,11 +177,19 @@ async def update_page(
 
     page.updated_at = datetime.utcnow()
     session.add(page)
+    # Body edits bump the graph version when wikilinks are rebuilt below
+    if update_data.keys() - {"body_markdown"}:
+        change_log = GraphChangeLog(session)
+        if page.scope != prev_scope:
+            change_log.record_page_scope_change(page, prev_scope)
+        elif page.title != prev_title:
+            change_log.record_page("update", page, prev_scope=prev_scope)
+        change_log.bump()
     session.commit()
     session.refresh(page)
 
-    # Rebuild wikilinks if body_markdown was updated
-    if "body_markdown" in update_data:
+    # Rebuild wikilinks if body_markdown was updated; they also inherit the page scope
+    if "body_markdown" in update_data or page.scope != prev_scope:
         pages_service = PagesService(session)
         pages_service.rebuild_wikilinks(page.id)
         session.commit()
@@ -145,5 +208,10 @@ async def delete_page(
     if not page:
         raise HTTPException(status_code=404, detail="Page not found")
 
+    change_log = GraphChangeLog(session)
+    for link in {link.id: link for link in [*page.links_from, *page.links_to]}.values():
+        change_log.record_link("delete", link)
+    change_log.record_page("delete", page)
+    change_log.bump()
     session.delete(page)
     session.commit()
@@ -5,49 +5,99 @@ import uuid
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import ColumnElement
 from sqlalchemy.orm import Session
 
+from app.api.entities import as_of_overlay
+from app.api.listing import get_list_params, list_response
 from app.db import get_session
 from app.dependencies import get_view_mode, require_initialized_project
 from app.models import Person, World
 from app.schemas import PersonCreate, PersonResponse, PersonUpdate
+from app.services import versions
+from app.services.entity_versions import EntityVersionService
+from app.services.listing import ListParams, ListSpec, decode_json_list
+from app.services.person_index import PersonIndex
 from app.services.visibility import ViewMode, VisibilityService
 
 router = APIRouter(prefix="/people", tags=["people"])
 
 
+_LIST_SPEC = ListSpec(
+    id_column=Person.id,
+    fields={
+        "id": Person.id,
+        "name": Person.name,
+        "aliases": Person.aliases,
+        "status": Person.status,
+        "workplace_place_id": Person.workplace_place_id,
+        "home_place_id": Person.home_place_id,
+        "tags": Person.tags,
+        "notes_public": Person.notes_public,
+        "notes_gm": Person.notes_gm,
+        "created_at": Person.created_at,
+        "updated_at": Person.updated_at,
+    },
+    sort_keys={"name": Person.name, "updated_at": Person.updated_at},
+    default_sort="name",
+    decoders={"aliases": decode_json_list, "tags": decode_json_list},
+)
+
+
 @router.get("", response_model=list[PersonResponse])
 async def list_people(
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    params: Annotated[ListParams, Depends(get_list_params)],
+    status: Annotated[str | None, Query()] = None,
+    workplace_place_id: Annotated[str | None, Query()] = None,
+    home_place_id: Annotated[str | None, Query()] = None,
+    tag: Annotated[str | None, Query()] = None,
+    alias: Annotated[str | None, Query()] = None,
+    as_of_snapshot_id: Annotated[
+        str | None, Query(description="Read versioned attributes as of this snapshot")
+    ] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
-) -> list[dict[str, object]]:
-    """List all people."""
-    people = session.execute(select(Person)).scalars().all()
-    visibility = VisibilityService()
-
-    # Convert JSON strings to lists and apply visibility filter
-    return [
-        visibility.filter_notes_gm(
-            {
-                "id": p.id,
-                "name": p.name,
-                "aliases": json.loads(p.aliases) if p.aliases else [],
-                "status": p.status,
-                "workplace_place_id": p.workplace_place_id,
-                "home_place_id": p.home_place_id,
-                "tags": json.loads(p.tags) if p.tags else [],
-                "notes_public": p.notes_public,
-                "notes_gm": p.notes_gm,
-                "created_at": p.created_at,
-                "updated_at": p.updated_at,
-            },
-            view_mode,
-        )
-        for p in people
-    ]
+) -> Response:
+    """
+    List people, optionally filtered, sorted, projected and paginated.
+
+    `tag` and `alias` match one of a person's tags or aliases exactly,
+    through the indexed person_tags/person_aliases tables. With
+    `as_of_snapshot_id`, versioned attributes (status, notes) show their
+    values as of the snapshot; filters apply to the current values. Sort
+    keys: name (default), updated_at. With `limit`, the next page's cursor is
+    returned in the X-Next-Cursor header.
+    """
+    conditions: list[ColumnElement[bool]] = []
+    if status is not None:
+        conditions.append(Person.status == status)
+    if workplace_place_id is not None:
+        conditions.append(Person.workplace_place_id == workplace_place_id)
+    if home_place_id is not None:
+        conditions.append(Person.home_place_id == home_place_id)
+    if tag is not None or alias is not None:
+        index = PersonIndex(session)
+        if index.ensure_built():
+            session.commit()
+        if tag is not None:
+            conditions.append(Person.id.in_(index.with_tag(tag)))
+        if alias is not None:
+            conditions.append(Person.id.in_(index.with_alias(alias)))
+
+    unfiltered = not conditions
+    return list_response(
+        session,
+        _LIST_SPEC,
+        params,
+        view_mode,
+        conditions,
+        annotate=as_of_overlay(session, "person", as_of_snapshot_id, view_mode)
+        if as_of_snapshot_id is not None
+        else None,
+        projection="people" if unfiltered else None,
+    )
 
 
 @router.post("", response_model=PersonResponse, status_code=201)
@@ -70,6 +120,10 @@ async def create_person(
         notes_gm=person_data.notes_gm,
     )
     session.add(person)
+    session.flush()
+    PersonIndex(session).set_terms(person.id, person_data.aliases, person_data.tags)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.PEOPLE)
     session.commit()
     session.refresh(person)
 
@@ -93,15 +147,18 @@ async def get_person(
     person_id: str,
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    as_of_snapshot_id: Annotated[
+        str | None, Query(description="Read versioned attributes as of this snapshot")
+    ] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
 ) -> dict[str, object]:
-    """Get a person by ID."""
+    """Get a person by ID, optionally as of a snapshot."""
     person = session.get(Person, person_id)
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
 
     visibility = VisibilityService()
-    return visibility.filter_notes_gm(
+    item = visibility.filter_notes_gm(
         {
             "id": person.id,
             "name": person.name,
@@ -117,6 +174,9 @@ async def get_person(
         },
         view_mode,
     )
+    if as_of_snapshot_id is not None:
+        as_of_overlay(session, "person", as_of_snapshot_id, view_mode)([item])
+    return item
 
 
 @router.put("/{person_id}", response_model=PersonResponse)
@@ -140,9 +200,17 @@ async def update_person(
             setattr(person, field, json.dumps(value))
         else:
             setattr(person, field, value)
+    if "aliases" in update_data or "tags" in update_data:
+        PersonIndex(session).set_terms(
+            person.id,
+            aliases=update_data["aliases"] or [] if "aliases" in update_data else None,
+            tags=update_data["tags"] or [] if "tags" in update_data else None,
+        )
 
     person.updated_at = datetime.utcnow()
     session.add(person)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.PEOPLE)
     session.commit()
     session.refresh(person)
 
@@ -172,5 +240,9 @@ async def delete_person(
     if not person:
         raise HTTPException(status_code=404, detail="Person not found")
 
+    PersonIndex(session).remove_person(person.id)
+    EntityVersionService(session).remove_entity("person", person.id)
     session.delete(person)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.PEOPLE)
     session.commit()
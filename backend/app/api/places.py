@@ -5,49 +5,139 @@ import uuid
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import ColumnElement
 from sqlalchemy.orm import Session
 
+from app.api.entities import as_of_overlay
+from app.api.listing import get_list_params, list_response
 from app.db import get_session
 from app.dependencies import get_view_mode, require_initialized_project
 from app.models import Place, World
-from app.schemas import PlaceCreate, PlaceResponse, PlaceUpdate
+from app.schemas import (
+    PlaceCreate,
+    PlaceHierarchyResponse,
+    PlaceNearestResponse,
+    PlaceResponse,
+    PlaceUpdate,
+)
+from app.services import versions
+from app.services.entity_versions import EntityVersionService
+from app.services.listing import ListParams, ListSpec, decode_json_object
+from app.services.place_hierarchy import PlaceHierarchyService
+from app.services.place_spatial import PlaceSpatialIndex
 from app.services.visibility import ViewMode, VisibilityService
 
 router = APIRouter(prefix="/places", tags=["places"])
 
 
+_LIST_SPEC = ListSpec(
+    id_column=Place.id,
+    fields={
+        "id": Place.id,
+        "name": Place.name,
+        "type": Place.type,
+        "position": Place.position,
+        "owner_faction_id": Place.owner_faction_id,
+        "parent_place_id": Place.parent_place_id,
+        "scope": Place.scope,
+        "notes_public": Place.notes_public,
+        "notes_gm": Place.notes_gm,
+        "created_at": Place.created_at,
+        "updated_at": Place.updated_at,
+    },
+    sort_keys={"name": Place.name, "updated_at": Place.updated_at},
+    default_sort="name",
+    decoders={"position": decode_json_object},
+)
+
+
+def _place_to_dict(place: Place) -> dict[str, object]:
+    return {
+        "id": place.id,
+        "name": place.name,
+        "type": place.type,
+        "position": json.loads(place.position) if place.position else None,
+        "owner_faction_id": place.owner_faction_id,
+        "parent_place_id": place.parent_place_id,
+        "scope": place.scope,
+        "notes_public": place.notes_public,
+        "notes_gm": place.notes_gm,
+        "created_at": place.created_at,
+        "updated_at": place.updated_at,
+    }
+
+
+def _parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    try:
+        min_x, min_y, max_x, max_y = (float(value) for value in bbox.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail="bbox must be min_x,min_y,max_x,max_y") from e
+    if min_x > max_x or min_y > max_y:
+        raise HTTPException(status_code=422, detail="bbox minimum exceeds its maximum")
+    return min_x, min_y, max_x, max_y
+
+
+def _check_parent(session: Session, parent_place_id: str | None) -> None:
+    if parent_place_id is not None and session.get(Place, parent_place_id) is None:
+        raise HTTPException(status_code=422, detail="Parent place not found")
+
+
 @router.get("", response_model=list[PlaceResponse])
 async def list_places(
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    params: Annotated[ListParams, Depends(get_list_params)],
+    type: Annotated[str | None, Query()] = None,
+    owner_faction_id: Annotated[str | None, Query()] = None,
+    parent_place_id: Annotated[str | None, Query()] = None,
+    bbox: Annotated[str | None, Query(description="Map area as min_x,min_y,max_x,max_y")] = None,
+    as_of_snapshot_id: Annotated[
+        str | None, Query(description="Read versioned attributes as of this snapshot")
+    ] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
-) -> list[dict[str, object]]:
-    """List all places."""
-    places = session.execute(select(Place)).scalars().all()
-    visibility = VisibilityService()
+) -> Response:
+    """
+    List places visible in the view mode, optionally filtered, sorted,
+    projected and paginated.
 
-    # Filter by scope and convert JSON strings to dicts
-    return [
-        visibility.filter_notes_gm(
-            {
-                "id": p.id,
-                "name": p.name,
-                "type": p.type,
-                "position": json.loads(p.position) if p.position else None,
-                "owner_faction_id": p.owner_faction_id,
-                "scope": p.scope,
-                "notes_public": p.notes_public,
-                "notes_gm": p.notes_gm,
-                "created_at": p.created_at,
-                "updated_at": p.updated_at,
-            },
-            view_mode,
-        )
-        for p in places
-        if visibility.filter_scope(p.scope, view_mode)
+    `bbox` keeps only places positioned inside the map area (bounds
+    included), looked up in the spatial index. With `as_of_snapshot_id`,
+    versioned attributes (owner, notes) show their values as of the
+    snapshot; filters apply to the current values. Sort keys: name (default),
+    updated_at. With `limit`, the next page's cursor is returned in the
+    X-Next-Cursor header.
+    """
+    visibility = VisibilityService()
+    conditions: list[ColumnElement[bool]] = [
+        Place.scope.in_(visibility.get_allowed_scopes(view_mode))
     ]
+    if type is not None:
+        conditions.append(Place.type == type)
+    if owner_faction_id is not None:
+        conditions.append(Place.owner_faction_id == owner_faction_id)
+    if parent_place_id is not None:
+        conditions.append(Place.parent_place_id == parent_place_id)
+    if bbox is not None:
+        spatial = PlaceSpatialIndex(session)
+        if spatial.ensure_built():
+            session.commit()
+        conditions.append(Place.id.in_(spatial.within_bbox(*_parse_bbox(bbox))))
+
+    unfiltered = (
+        type is None and owner_faction_id is None and parent_place_id is None and bbox is None
+    )
+    return list_response(
+        session,
+        _LIST_SPEC,
+        params,
+        view_mode,
+        conditions,
+        annotate=as_of_overlay(session, "place", as_of_snapshot_id, view_mode)
+        if as_of_snapshot_id is not None
+        else None,
+        projection="places" if unfiltered else None,
+    )
 
 
 @router.post("", response_model=PlaceResponse, status_code=201)
@@ -65,6 +155,7 @@ async def create_place(
     else:
         scope = place_data.scope
         notes_gm = place_data.notes_gm
+    _check_parent(session, place_data.parent_place_id)
 
     place = Place(
         id=str(uuid.uuid4()),
@@ -73,26 +164,44 @@ async def create_place(
         type=place_data.type,
         position=json.dumps(place_data.position) if place_data.position else None,
         owner_faction_id=place_data.owner_faction_id,
+        parent_place_id=place_data.parent_place_id,
         scope=scope,
         notes_public=place_data.notes_public,
         notes_gm=notes_gm,
     )
+    hierarchy = PlaceHierarchyService(session)
+    hierarchy.ensure_built()  # Before the new place, which is added to it below
     session.add(place)
+    session.flush()
+    hierarchy.add_place(place.id, place.parent_place_id)
+    PlaceSpatialIndex(session).set_position(place.id, place_data.position)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.PLACES)
     session.commit()
     session.refresh(place)
 
-    return {
-        "id": place.id,
-        "name": place.name,
-        "type": place.type,
-        "position": json.loads(place.position) if place.position else None,
-        "owner_faction_id": place.owner_faction_id,
-        "scope": place.scope,
-        "notes_public": place.notes_public,
-        "notes_gm": place.notes_gm,
-        "created_at": place.created_at,
-        "updated_at": place.updated_at,
-    }
+    return _place_to_dict(place)
+
+
+@router.get("/nearest", response_model=list[PlaceNearestResponse])
+async def get_nearest_places(
+    x: float,
+    y: float,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    k: Annotated[int, Query(ge=1, le=100)] = 10,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> list[dict[str, object]]:
+    """Get the k places nearest to a map point, nearest first, with their distance."""
+    visibility = VisibilityService()
+    spatial = PlaceSpatialIndex(session)
+    if spatial.ensure_built():
+        session.commit()
+    rows = spatial.nearest(x, y, k, visibility.get_allowed_scopes(view_mode))
+    return [
+        visibility.filter_notes_gm({**_place_to_dict(place), "distance": distance}, view_mode)
+        for place, distance in rows
+    ]
 
 
 @router.get("/{place_id}", response_model=PlaceResponse)
@@ -100,9 +209,12 @@ async def get_place(
     place_id: str,
     session: Annotated[Session, Depends(get_session)],
     world: Annotated[World, Depends(require_initialized_project)],
+    as_of_snapshot_id: Annotated[
+        str | None, Query(description="Read versioned attributes as of this snapshot")
+    ] = None,
     view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
 ) -> dict[str, object]:
-    """Get a place by ID."""
+    """Get a place by ID, optionally as of a snapshot."""
     place = session.get(Place, place_id)
     if not place:
         raise HTTPException(status_code=404, detail="Place not found")
@@ -112,21 +224,68 @@ async def get_place(
     if not visibility.filter_scope(place.scope, view_mode):
         raise HTTPException(status_code=404, detail="Place not found")
 
-    return visibility.filter_notes_gm(
-        {
-            "id": place.id,
-            "name": place.name,
-            "type": place.type,
-            "position": json.loads(place.position) if place.position else None,
-            "owner_faction_id": place.owner_faction_id,
-            "scope": place.scope,
-            "notes_public": place.notes_public,
-            "notes_gm": place.notes_gm,
-            "created_at": place.created_at,
-            "updated_at": place.updated_at,
-        },
-        view_mode,
+    item = visibility.filter_notes_gm(_place_to_dict(place), view_mode)
+    if as_of_snapshot_id is not None:
+        as_of_overlay(session, "place", as_of_snapshot_id, view_mode)([item])
+    return item
+
+
+@router.get("/{place_id}/descendants", response_model=list[PlaceHierarchyResponse])
+async def get_place_descendants(
+    place_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    max_depth: Annotated[int | None, Query(ge=1)] = None,
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> list[dict[str, object]]:
+    """
+    Get every place nested in a place, nearest first.
+
+    `max_depth=1` returns direct children only. Places hidden in the view
+    mode are left out; their visible descendants are still returned.
+    """
+    visibility = VisibilityService()
+    place = session.get(Place, place_id)
+    if not place or not visibility.filter_scope(place.scope, view_mode):
+        raise HTTPException(status_code=404, detail="Place not found")
+
+    hierarchy = PlaceHierarchyService(session)
+    if hierarchy.ensure_built(place_id):
+        session.commit()
+    rows = hierarchy.get_descendants(
+        place_id, visibility.get_allowed_scopes(view_mode), max_depth=max_depth
     )
+    return [
+        visibility.filter_notes_gm({**_place_to_dict(row), "depth": depth}, view_mode)
+        for row, depth in rows
+    ]
+
+
+@router.get("/{place_id}/ancestors", response_model=list[PlaceHierarchyResponse])
+async def get_place_ancestors(
+    place_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> list[dict[str, object]]:
+    """
+    Get the places a place is nested in, from its parent up to the root.
+
+    Places hidden in the view mode are left out.
+    """
+    visibility = VisibilityService()
+    place = session.get(Place, place_id)
+    if not place or not visibility.filter_scope(place.scope, view_mode):
+        raise HTTPException(status_code=404, detail="Place not found")
+
+    hierarchy = PlaceHierarchyService(session)
+    if hierarchy.ensure_built(place_id):
+        session.commit()
+    rows = hierarchy.get_ancestors(place_id, visibility.get_allowed_scopes(view_mode))
+    return [
+        visibility.filter_notes_gm({**_place_to_dict(row), "depth": depth}, view_mode)
+        for row, depth in rows
+    ]
 
 
 @router.put("/{place_id}", response_model=PlaceResponse)
@@ -150,6 +309,20 @@ async def update_place(
         update_data.pop("scope", None)  # Ignore scope changes in player mode
         update_data.pop("notes_gm", None)  # Ignore gm notes in player mode
 
+    # Reparenting moves the whole subtree; a place cannot go under its own subtree
+    if "parent_place_id" in update_data and update_data["parent_place_id"] != place.parent_place_id:
+        new_parent_id = update_data["parent_place_id"]
+        _check_parent(session, new_parent_id)
+        hierarchy = PlaceHierarchyService(session)
+        hierarchy.ensure_built()
+        try:
+            hierarchy.move_place(place.id, new_parent_id)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e)) from e
+
+    if "position" in update_data:
+        PlaceSpatialIndex(session).set_position(place.id, update_data["position"])
+
     for field, value in update_data.items():
         if field == "position" and value is not None:
             setattr(place, field, json.dumps(value))
@@ -158,21 +331,12 @@ async def update_place(
 
     place.updated_at = datetime.utcnow()
     session.add(place)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.PLACES)
     session.commit()
     session.refresh(place)
 
-    return {
-        "id": place.id,
-        "name": place.name,
-        "type": place.type,
-        "position": json.loads(place.position) if place.position else None,
-        "owner_faction_id": place.owner_faction_id,
-        "scope": place.scope,
-        "notes_public": place.notes_public,
-        "notes_gm": place.notes_gm,
-        "created_at": place.created_at,
-        "updated_at": place.updated_at,
-    }
+    return _place_to_dict(place)
 
 
 @router.delete("/{place_id}", status_code=204)
@@ -192,5 +356,15 @@ async def delete_place(
     if not visibility.filter_scope(place.scope, view_mode):
         raise HTTPException(status_code=404, detail="Place not found")
 
+    # Children of the deleted place become top-level places (the ORM clears
+    # their parent_place_id)
+    hierarchy = PlaceHierarchyService(session)
+    hierarchy.ensure_built()
+    hierarchy.remove_place(place.id)
+    PlaceSpatialIndex(session).remove_place(place.id)
+    EntityVersionService(session).remove_entity("place", place.id)
+
     session.delete(place)
+    versions.bump_version(session, versions.ENTITIES)
+    versions.bump_version(session, versions.PLACES)
     session.commit()
@@ -10,7 +10,9 @@ from sqlalchemy.orm import Session
 from app.db import get_session
 from app.dependencies import require_initialized_project
 from app.models import World
+from app.services import versions
 from app.services.snapshots_service import SnapshotsService
+from app.services.tile_write_queue import get_tile_write_queue
 
 router = APIRouter(prefix="/snapshots", tags=["snapshots"])
 
@@ -67,6 +69,9 @@ async def create_snapshot(
 ) -> SnapshotResponse:
     """Create a new snapshot, optionally cloning data from another snapshot."""
     snapshots_service = SnapshotsService(session)
+    if snapshot_data.clone_from is not None:
+        # Clone the source's queued tiles too
+        get_tile_write_queue(session).flush()
     try:
         snapshot = snapshots_service.create_snapshot(
             world_id=world.id,
@@ -74,6 +79,7 @@ async def create_snapshot(
             label=snapshot_data.label,
             clone_from=snapshot_data.clone_from,
         )
+        versions.bump_version(session, versions.SNAPSHOTS)
         session.commit()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -106,6 +112,7 @@ async def set_active_snapshot(
     snapshots_service = SnapshotsService(session)
     try:
         snapshots_service.set_active_snapshot(snapshot_id)
+        versions.bump_version(session, versions.SNAPSHOTS)
         session.commit()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -123,6 +130,8 @@ async def delete_snapshot(
     snapshots_service = SnapshotsService(session)
     try:
         snapshots_service.delete_snapshot(snapshot_id)
+        get_tile_write_queue(session).discard(snapshot_id=snapshot_id)
+        versions.bump_version(session, versions.SNAPSHOTS)
         session.commit()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
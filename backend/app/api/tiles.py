@@ -1,19 +1,45 @@
 """Territory tiles API endpoints."""
 
 import base64
+import json
+import struct
+from collections import defaultdict
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db import get_session
-from app.dependencies import require_initialized_project
-from app.models import Faction, Snapshot, World
-from app.services.tiles_service import TileData, TilesService
+from app.dependencies import get_view_mode, require_initialized_project
+from app.models import Faction, Place, PlacePosition, Snapshot, World
+from app.services import versions
+from app.services.place_spatial import PlaceSpatialIndex
+from app.services.territory_service import TerritoryService
+from app.services.tile_write_queue import get_tile_write_queue
+from app.services.tiles_service import TilesService
+from app.services.visibility import ViewMode, VisibilityService
 
 router = APIRouter(prefix="/snapshots", tags=["tiles"])
 
+# Binary tile delta frame: u16 faction ID length, faction ID (UTF-8),
+# i32 z, x, y (all big-endian), then the whole PNG/WebP tile
+_DELTA_HEADER = struct.Struct(">H")
+_DELTA_COORDS = struct.Struct(">iii")
+
+# Clients connected to each snapshot's live painting socket
+_painters: dict[str, set[WebSocket]] = defaultdict(set)
+
 
 class TileBatchItem(BaseModel):
     """Single tile in a batch upload."""
@@ -31,6 +57,13 @@ class TileBatchUpload(BaseModel):
     tiles: list[TileBatchItem]
 
 
+class PlaceControl(BaseModel):
+    """Factions whose territory covers a place."""
+
+    place_id: str
+    faction_ids: list[str]  # Empty if no faction painted the place's position
+
+
 @router.get("/{snapshot_id}/territory/tiles")
 async def get_tile(
     snapshot_id: str,
@@ -44,7 +77,8 @@ async def get_tile(
     """
     Get a specific territory tile.
 
-    Returns PNG/WebP image data.
+    Returns PNG/WebP image data. Writes still queued for the database are
+    served from the queue.
     """
     # Check if snapshot exists
     snapshot = session.get(Snapshot, snapshot_id)
@@ -56,7 +90,10 @@ async def get_tile(
     if not faction:
         raise HTTPException(status_code=404, detail="Faction not found")
 
-    # Get tile
+    # Get tile, from the write queue first
+    queued = get_tile_write_queue(session).get(snapshot_id, faction_id, z, x, y)
+    if queued is not None:
+        return Response(content=queued, media_type="image/png")
     tiles_service = TilesService(session)
     tile = tiles_service.get_tile(snapshot_id, faction_id, z, x, y)
 
@@ -77,7 +114,9 @@ async def upload_tiles_batch(
     """
     Upload a batch of territory tiles.
 
-    Idempotent: replaces existing tiles at same coordinates.
+    Idempotent: replaces existing tiles at same coordinates. The tiles go
+    through the write-behind queue: they are journaled and readable at
+    once, and written to the database with the other queued tiles.
     """
     # Check if snapshot exists
     snapshot = session.get(Snapshot, snapshot_id)
@@ -99,20 +138,16 @@ async def upload_tiles_batch(
                 status_code=400,
                 detail=f"Invalid base64 data for tile z={tile_item.z} x={tile_item.x} y={tile_item.y}: {e}",
             ) from e
-        tiles_data.append(TileData(tile_item.z, tile_item.x, tile_item.y, tile_data))
+        tiles_data.append(
+            ((snapshot_id, batch.faction_id, tile_item.z, tile_item.x, tile_item.y), tile_data)
+        )
 
-    # Upload tiles
-    tiles_service = TilesService(session)
-    uploaded_count = tiles_service.upload_tiles_batch(
-        snapshot_id,
-        batch.faction_id,
-        tiles_data,
-    )
-    session.commit()
+    # Queue tiles
+    get_tile_write_queue(session).put_many(tiles_data)
 
     return {
         "status": "ok",
-        "uploaded": uploaded_count,
+        "uploaded": len(tiles_data),
         "snapshot_id": snapshot_id,
         "faction_id": batch.faction_id,
     }
@@ -133,7 +168,165 @@ async def delete_tiles(
 
     # Delete all tiles
     tiles_service = TilesService(session)
+    get_tile_write_queue(session).discard(snapshot_id, faction_id)
     deleted_count = tiles_service.delete_tiles(snapshot_id, faction_id)
+    versions.bump_version(session, versions.TERRITORY)
     session.commit()
 
     return {"status": "ok", "deleted": deleted_count}
+
+
+@router.websocket("/{snapshot_id}/territory/ws")
+async def paint_territory(
+    websocket: WebSocket,
+    snapshot_id: str,
+    session: Annotated[Session, Depends(get_session)],
+) -> None:
+    """
+    Live territory painting for a snapshot.
+
+    Clients send binary tile deltas (see parse_tile_delta); each is relayed
+    unchanged to the other clients of the snapshot at once and persisted
+    through the write-behind tile queue, so repeated strokes on a tile
+    collapse into one database write. A delta of an unknown faction is
+    answered with a JSON error message and dropped; a malformed frame
+    closes the connection.
+    """
+    if session.get(Snapshot, snapshot_id) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Snapshot not found")
+        return
+    faction_ids = set(session.scalars(select(Faction.id)))
+    queue = get_tile_write_queue(session)
+    # Don't hold a pooled connection for the lifetime of the socket
+    session.close()
+
+    await websocket.accept()
+    peers = _painters[snapshot_id]
+    peers.add(websocket)
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            frame = message.get("bytes")
+            try:
+                if frame is None:
+                    raise ValueError("Tile deltas must be binary frames")
+                faction_id, z, x, y, data = parse_tile_delta(frame)
+            except ValueError as e:
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA, reason=str(e))
+                break
+
+            if faction_id not in faction_ids:
+                # It may have been created since the socket was opened
+                faction_ids = set(session.scalars(select(Faction.id)))
+                session.close()
+                if faction_id not in faction_ids:
+                    await websocket.send_json(
+                        {"error": "Faction not found", "faction_id": faction_id}
+                    )
+                    continue
+
+            queue.put(snapshot_id, faction_id, z, x, y, data)
+            for peer in list(peers):
+                if peer is websocket:
+                    continue
+                try:
+                    await peer.send_bytes(frame)
+                except (RuntimeError, WebSocketDisconnect):
+                    peers.discard(peer)  # Gone; its own handler cleans up the rest
+    except WebSocketDisconnect:
+        pass
+    finally:
+        peers.discard(websocket)
+        if not peers:
+            _painters.pop(snapshot_id, None)
+
+
+def parse_tile_delta(frame: bytes) -> tuple[str, int, int, int, bytes]:
+    """
+    Split a binary tile delta frame.
+
+    The frame is the faction ID's length in bytes (u16), the faction ID
+    (UTF-8), the tile's z, x and y (i32 each, all big-endian) and then the
+    whole PNG/WebP tile, which replaces the stored one.
+
+    Returns:
+        (faction ID, z, x, y, tile data)
+
+    Raises:
+        ValueError: If the frame is malformed
+    """
+    if len(frame) < _DELTA_HEADER.size:
+        raise ValueError("Truncated tile delta")
+    (length,) = _DELTA_HEADER.unpack_from(frame)
+    coords_start = _DELTA_HEADER.size + length
+    data_start = coords_start + _DELTA_COORDS.size
+    if len(frame) <= data_start:
+        raise ValueError("Truncated tile delta")
+    faction_id = frame[_DELTA_HEADER.size : coords_start].decode()
+    z, x, y = _DELTA_COORDS.unpack_from(frame, coords_start)
+    return faction_id, z, x, y, frame[data_start:]
+
+
+@router.get("/{snapshot_id}/territory/places", response_model=list[PlaceControl])
+async def get_places_control(
+    snapshot_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> list[dict[str, object]]:
+    """
+    Get the controlling factions of every positioned place in a snapshot.
+
+    A faction controls a place if its territory mask is painted at the
+    place's position. Places without a position are left out.
+    """
+    snapshot = session.get(Snapshot, snapshot_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    # Masks are read from the database, so write the queued tiles first
+    get_tile_write_queue(session).flush()
+    spatial = PlaceSpatialIndex(session)
+    if spatial.ensure_built():
+        session.commit()
+    allowed_scopes = VisibilityService().get_allowed_scopes(view_mode)
+    rows = session.execute(
+        select(PlacePosition.place_id, PlacePosition.x, PlacePosition.y)
+        .join(Place, Place.id == PlacePosition.place_id)
+        .where(Place.scope.in_(allowed_scopes))
+        .order_by(Place.name, Place.id)
+    ).all()
+
+    control = TerritoryService(session).get_controlling_factions(
+        snapshot_id, {place_id: (x, y) for place_id, x, y in rows}
+    )
+    return [{"place_id": place_id, "faction_ids": control[place_id]} for place_id, _, _ in rows]
+
+
+@router.get("/{snapshot_id}/territory/places/{place_id}", response_model=PlaceControl)
+async def get_place_control(
+    snapshot_id: str,
+    place_id: str,
+    session: Annotated[Session, Depends(get_session)],
+    world: Annotated[World, Depends(require_initialized_project)],
+    view_mode: Annotated[ViewMode, Depends(get_view_mode)] = "gm",
+) -> dict[str, object]:
+    """Get the factions whose territory covers a place's position in a snapshot."""
+    snapshot = session.get(Snapshot, snapshot_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    place = session.get(Place, place_id)
+    if not place or not VisibilityService().filter_scope(place.scope, view_mode):
+        raise HTTPException(status_code=404, detail="Place not found")
+    position = json.loads(place.position) if place.position else {}
+    if "x" not in position or "y" not in position:
+        raise HTTPException(status_code=422, detail="Place has no position")
+
+    get_tile_write_queue(session).flush()
+    control = TerritoryService(session).get_controlling_factions(
+        snapshot_id, {place.id: (position["x"], position["y"])}
+    )
+    return {"place_id": place.id, "faction_ids": control[place.id]}
@@ -2,13 +2,18 @@
 
 from typing import Annotated
 
-from fastapi import Depends, Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.db import get_session
 from app.models import World
 from app.services.project_service import ProjectService
 from app.services.visibility import ViewMode
+from app.services.wire_format import (
+    COMPACT_JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    WireFormat,
+)
 
 
 def get_view_mode(x_view_mode: Annotated[str, Header(alias="X-View-Mode")] = "gm") -> ViewMode:
@@ -26,6 +31,32 @@ def get_view_mode(x_view_mode: Annotated[str, Header(alias="X-View-Mode")] = "gm
     return "gm"
 
 
+def get_wire_format(
+    format_: Annotated[WireFormat | None, Query(alias="format")] = None,
+    accept: Annotated[str, Header()] = "",
+) -> WireFormat:
+    """
+    Get the requested response encoding.
+
+    The `format` query flag wins; otherwise the Accept header selects
+    MessagePack or compact JSON, and anything else gets regular JSON.
+
+    Args:
+        format_: Explicit format (json, compact or msgpack)
+        accept: Accept header value
+
+    Returns:
+        WireFormat value
+    """
+    if format_ is not None:
+        return format_
+    if MSGPACK_MEDIA_TYPE in accept:
+        return "msgpack"
+    if COMPACT_JSON_MEDIA_TYPE in accept:
+        return "compact"
+    return "json"
+
+
 def require_initialized_project(session: Annotated[Session, Depends(get_session)]) -> World:
     """
     Dependency that ensures project is initialized.
@@ -7,6 +7,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import (
+    batch,
+    bootstrap,
+    entities,
+    events,
     export_import,
     factions,
     graph,
@@ -18,16 +22,19 @@ from app.api import (
     snapshots,
     tiles,
 )
-from app.db import init_db
+from app.db import engine, init_db
+from app.services.tile_write_queue import flush_all_tile_queues, get_engine_tile_write_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager."""
-    # Initialize database on startup
+    # Initialize database on startup, writing tiles journaled before a crash
     init_db()
+    get_engine_tile_write_queue(engine).flush()
     yield
-    # Cleanup on shutdown (if needed)
+    # Write territory tiles still queued by live painting
+    flush_all_tile_queues()
 
 
 app = FastAPI(
@@ -60,6 +67,10 @@ app.include_router(people.router, prefix="/api")
 app.include_router(places.router, prefix="/api")
 app.include_router(pages.router, prefix="/api")
 app.include_router(graph.router, prefix="/api")
+app.include_router(entities.router, prefix="/api")
+app.include_router(bootstrap.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
 app.include_router(snapshots.router, prefix="/api")
 app.include_router(tiles.router, prefix="/api")
 app.include_router(map_assets.router, prefix="/api")
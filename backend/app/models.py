@@ -3,7 +3,20 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, Float, ForeignKey, Integer, LargeBinary, Text
+from sqlalchemy import (
+    CheckConstraint,
+    Connection,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Table,
+    Text,
+    column,
+    event,
+    table,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -62,7 +75,7 @@ class Faction(Base):
     notes_gm: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -92,7 +105,7 @@ class Person(Base):
     notes_gm: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -111,6 +124,28 @@ class Person(Base):
     )
 
 
+class PersonAlias(Base):
+    """Alias of a person, indexed for lookups (mirrors Person.aliases)."""
+
+    __tablename__ = "person_aliases"
+
+    person_id: Mapped[str] = mapped_column(
+        ForeignKey("people.id", ondelete="CASCADE"), primary_key=True
+    )
+    alias: Mapped[str] = mapped_column(Text, primary_key=True, index=True)
+
+
+class PersonTag(Base):
+    """Tag of a person, indexed for filtering (mirrors Person.tags)."""
+
+    __tablename__ = "person_tags"
+
+    person_id: Mapped[str] = mapped_column(
+        ForeignKey("people.id", ondelete="CASCADE"), primary_key=True
+    )
+    tag: Mapped[str] = mapped_column(Text, primary_key=True, index=True)
+
+
 class PlayerCharacter(Base):
     """Player Character extension of Person."""
 
@@ -167,7 +202,7 @@ class Place(Base):
     notes_gm: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -184,10 +219,65 @@ class Place(Base):
     children: Mapped[list["Place"]] = relationship(back_populates="parent")
 
 
+class PlaceClosure(Base):
+    """Ancestor/descendant pairs of the place hierarchy (closure table)."""
+
+    __tablename__ = "place_closure"
+
+    ancestor_id: Mapped[str] = mapped_column(
+        ForeignKey("places.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[str] = mapped_column(
+        ForeignKey("places.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 for the place itself
+
+
+class PlacePosition(Base):
+    """Numeric map position of a place, keyed for the place_rtree spatial index."""
+
+    __tablename__ = "place_positions"
+
+    # Integer key shared with place_rtree (R*Tree rows need integer IDs)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    place_id: Mapped[str] = mapped_column(
+        ForeignKey("places.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    x: Mapped[float] = mapped_column(Float, nullable=False)
+    y: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+# SQLite R*Tree over place_positions (a virtual table, so not an ORM model).
+# Bounds are stored as 32-bit floats rounded outward; exact filtering uses
+# place_positions.x/y.
+place_rtree = table(
+    "place_rtree",
+    column("id", Integer),
+    column("min_x", Float),
+    column("max_x", Float),
+    column("min_y", Float),
+    column("max_y", Float),
+)
+
+
+@event.listens_for(PlacePosition.__table__, "after_create")
+def _create_place_rtree(target: Table, connection: Connection, **kw: object) -> None:
+    connection.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS place_rtree USING rtree(id, min_x, max_x, min_y, max_y)"
+    )
+
+
+@event.listens_for(PlacePosition.__table__, "after_drop")
+def _drop_place_rtree(target: Table, connection: Connection, **kw: object) -> None:
+    connection.exec_driver_sql("DROP TABLE IF EXISTS place_rtree")
+
+
 class NotePage(Base):
     """Note page model (Obsidian-like pages)."""
 
     __tablename__ = "note_pages"
+    # Pages bound to an entity, most recently edited first (entity history)
+    __table_args__ = (Index("ix_note_pages_entity", "entity_type", "entity_id", "updated_at"),)
 
     id: Mapped[str] = mapped_column(Text, primary_key=True)
     world_id: Mapped[str] = mapped_column(ForeignKey("worlds.id"), nullable=False, index=True)
@@ -195,10 +285,10 @@ class NotePage(Base):
     body_markdown: Mapped[str] = mapped_column(Text, nullable=False)
     scope: Mapped[str] = mapped_column(Text, nullable=False, default="public")  # public|gm|player
     entity_type: Mapped[str | None] = mapped_column(Text, nullable=True)  # faction|person|place
-    entity_id: Mapped[str | None] = mapped_column(Text, nullable=True)
+    entity_id: Mapped[str | None] = mapped_column(Text, nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+        nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
     )
 
     # Relationships
@@ -236,6 +326,38 @@ class Link(Base):
     to_page: Mapped["NotePage"] = relationship(foreign_keys=[to_page_id], back_populates="links_to")
 
 
+class GraphNodePosition(Base):
+    """Precomputed graph layout position of a page, per view mode."""
+
+    __tablename__ = "graph_node_positions"
+
+    view_mode: Mapped[str] = mapped_column(Text, primary_key=True)  # gm|player
+    page_id: Mapped[str] = mapped_column(
+        ForeignKey("note_pages.id", ondelete="CASCADE"), primary_key=True
+    )
+    x: Mapped[float] = mapped_column(Float, nullable=False)
+    y: Mapped[float] = mapped_column(Float, nullable=False)
+    signature: Mapped[int] = mapped_column(Integer, nullable=False)  # CRC32 of neighbor IDs
+
+
+class GraphChange(Base):
+    """Entry of the graph change log (node or link insert/update/delete)."""
+
+    __tablename__ = "graph_changes"
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, index=True)  # Graph version
+    kind: Mapped[str] = mapped_column(Text, nullable=False)  # node|link
+    op: Mapped[str] = mapped_column(Text, nullable=False)  # insert|update|delete
+    entity_id: Mapped[str] = mapped_column(Text, nullable=False)  # Page or link ID
+    title: Mapped[str | None] = mapped_column(Text, nullable=True)  # Nodes only
+    from_page_id: Mapped[str | None] = mapped_column(Text, nullable=True)  # Links only
+    to_page_id: Mapped[str | None] = mapped_column(Text, nullable=True)  # Links only
+    link_type: Mapped[str | None] = mapped_column(Text, nullable=True)  # Links only
+    scope: Mapped[str] = mapped_column(Text, nullable=False)  # Effective scope (public|gm|player)
+    prev_scope: Mapped[str | None] = mapped_column(Text, nullable=True)  # Before an update
+
+
 class Snapshot(Base):
     """Timeline snapshot."""
 
@@ -296,6 +418,57 @@ class TerritoryTile(Base):
     faction: Mapped["Faction"] = relationship(back_populates="territory_tiles")
 
 
+class EntityVersion(Base):
+    """Value of an entity attribute from a snapshot's date until the next change."""
+
+    __tablename__ = "entity_versions"
+    __table_args__ = (
+        Index(
+            "ix_entity_versions_entity",
+            "entity_type",
+            "entity_id",
+            "field",
+            "valid_from",
+            unique=True,
+        ),
+    )
+
+    # Integer key shared with entity_version_rtree
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(Text, nullable=False)  # faction|person|place
+    entity_id: Mapped[str] = mapped_column(Text, nullable=False)
+    field: Mapped[str] = mapped_column(Text, nullable=False)  # e.g. status, owner_faction_id
+    value: Mapped[str | None] = mapped_column(Text, nullable=True)
+    snapshot_id: Mapped[str] = mapped_column(
+        ForeignKey("snapshots.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    valid_from: Mapped[datetime] = mapped_column(nullable=False)  # Date of the snapshot
+    valid_to: Mapped[datetime | None] = mapped_column(nullable=True)  # Next change; None if last
+
+
+# SQLite R*Tree over the [valid_from, valid_to] intervals of entity_versions,
+# in days since 1970 (open intervals end at a far-future day). Bounds are
+# 32-bit floats rounded outward; exact filtering uses entity_versions.
+entity_version_rtree = table(
+    "entity_version_rtree",
+    column("id", Integer),
+    column("valid_from", Float),
+    column("valid_to", Float),
+)
+
+
+@event.listens_for(EntityVersion.__table__, "after_create")
+def _create_entity_version_rtree(target: Table, connection: Connection, **kw: object) -> None:
+    connection.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS entity_version_rtree USING rtree(id, valid_from, valid_to)"
+    )
+
+
+@event.listens_for(EntityVersion.__table__, "after_drop")
+def _drop_entity_version_rtree(target: Table, connection: Connection, **kw: object) -> None:
+    connection.exec_driver_sql("DROP TABLE IF EXISTS entity_version_rtree")
+
+
 class ActiveSnapshot(Base):
     """Singleton table for active snapshot."""
 
@@ -310,6 +483,8 @@ class Event(Base):
     """Event model (log-style, narrative)."""
 
     __tablename__ = "events"
+    # Keyset pagination over the timeline orders by (at_datetime, id)
+    __table_args__ = (Index("ix_events_at_datetime_id", "at_datetime", "id"),)
 
     id: Mapped[str] = mapped_column(Text, primary_key=True)
     world_id: Mapped[str] = mapped_column(ForeignKey("worlds.id"), nullable=False, index=True)
@@ -318,7 +493,7 @@ class Event(Base):
     body_markdown: Mapped[str | None] = mapped_column(Text, nullable=True)
     scope: Mapped[str] = mapped_column(Text, nullable=False, default="gm")  # public|gm|player
     snapshot_id: Mapped[str | None] = mapped_column(
-        ForeignKey("snapshots.id", ondelete="SET NULL"), nullable=True
+        ForeignKey("snapshots.id", ondelete="SET NULL"), nullable=True, index=True
     )
 
     # Relationships
@@ -332,6 +507,8 @@ class EventRef(Base):
     """References from events to entities."""
 
     __tablename__ = "event_refs"
+    # Covers entity -> events lookups without touching the table
+    __table_args__ = (Index("ix_event_refs_entity", "entity_type", "entity_id", "event_id"),)
 
     id: Mapped[str] = mapped_column(Text, primary_key=True)
     event_id: Mapped[str] = mapped_column(
@@ -1,6 +1,7 @@
 """Data access layer (repositories)."""
 
 from app.repositories.faction_repo import FactionRepository
+from app.repositories.layout_repo import LayoutRepository
 from app.repositories.link_repo import LinkRepository
 from app.repositories.page_repo import PageRepository
 from app.repositories.person_repo import PersonRepository
@@ -17,5 +18,6 @@ __all__ = [
     "PlaceRepository",
     "PageRepository",
     "LinkRepository",
+    "LayoutRepository",
     "TileRepository",
 ]
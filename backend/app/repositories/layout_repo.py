@@ -0,0 +1,41 @@
+"""Graph layout repository."""
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models import GraphNodePosition
+
+
+class LayoutRepository:
+    """Repository for GraphNodePosition entity."""
+
+    def __init__(self, session: Session) -> None:
+        """Initialize repository with database session."""
+        self.session = session
+
+    def list_for_view_mode(self, view_mode: str) -> list[GraphNodePosition]:
+        """List stored positions for a view mode."""
+        return list(
+            self.session.execute(
+                select(GraphNodePosition).where(GraphNodePosition.view_mode == view_mode)
+            )
+            .scalars()
+            .all()
+        )
+
+    def save_all(self, positions: list[GraphNodePosition]) -> None:
+        """Insert new or persist modified positions in one flush."""
+        self.session.add_all(positions)
+        self.session.flush()
+
+    def delete_pages(self, view_mode: str, page_ids: list[str]) -> None:
+        """Delete stored positions of the given pages for a view mode."""
+        if not page_ids:
+            return
+        self.session.execute(
+            delete(GraphNodePosition).where(
+                GraphNodePosition.view_mode == view_mode,
+                GraphNodePosition.page_id.in_(page_ids),
+            )
+        )
+        self.session.flush()
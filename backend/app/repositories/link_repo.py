@@ -2,8 +2,8 @@
 
 from typing import Literal
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import distinct, func, literal, select
+from sqlalchemy.orm import Session, aliased
 
 from app.models import Link, NotePage
 
@@ -23,6 +23,13 @@ class LinkRepository:
         """List all links."""
         return list(self.session.execute(select(Link)).scalars().all())
 
+    def list_rows(self) -> list[tuple[str, str, str, str, str]]:
+        """List (id, from_page_id, to_page_id, link_type, scope) of all links."""
+        query = select(Link.id, Link.from_page_id, Link.to_page_id, Link.link_type, Link.scope)
+        return [
+            (row[0], row[1], row[2], row[3], row[4]) for row in self.session.execute(query).all()
+        ]
+
     def list_by_from_page(self, from_page_id: str) -> list[Link]:
         """List all links from a page."""
         return list(
@@ -57,6 +64,142 @@ class LinkRepository:
 
         return list(self.session.execute(query).scalars().all())
 
+    def count_backlinks(
+        self, allowed_scopes: tuple[str, ...], page_ids: list[str] | None = None
+    ) -> dict[str, int]:
+        """
+        Count the visible pages linking to each page, in one grouped query.
+
+        Args:
+            allowed_scopes: Scopes of linking pages to count
+            page_ids: Target pages (all pages if None)
+
+        Returns:
+            Number of distinct linking pages per target; targets without
+            backlinks are omitted
+        """
+        query = (
+            select(Link.to_page_id, func.count(distinct(Link.from_page_id)))
+            .join(NotePage, Link.from_page_id == NotePage.id)
+            .where(NotePage.scope.in_(allowed_scopes))
+            .group_by(Link.to_page_id)
+        )
+        if page_ids is not None:
+            query = query.where(Link.to_page_id.in_(page_ids))
+        return {row[0]: row[1] for row in self.session.execute(query).all()}
+
+    def list_backlink_rows(
+        self, page_ids: list[str], allowed_scopes: tuple[str, ...]
+    ) -> list[tuple[str, str, str, str]]:
+        """
+        List the visible pages linking to any of the given pages, in one query.
+
+        Args:
+            page_ids: Target pages
+            allowed_scopes: Scopes of linking pages to include
+
+        Returns:
+            (to_page_id, id, title, scope) per distinct target and linking page
+        """
+        if not page_ids:
+            return []
+        query = (
+            select(Link.to_page_id, NotePage.id, NotePage.title, NotePage.scope)
+            .distinct()
+            .join(NotePage, Link.from_page_id == NotePage.id)
+            .where(Link.to_page_id.in_(page_ids), NotePage.scope.in_(allowed_scopes))
+            .order_by(Link.to_page_id, NotePage.title)
+        )
+        return [(row[0], row[1], row[2], row[3]) for row in self.session.execute(query).all()]
+
+    def walk_neighborhood(
+        self,
+        page_id: str,
+        depth: int,
+        direction: Literal["in", "out", "both"],
+        allowed_scopes: tuple[str, ...],
+        limit: int,
+    ) -> list[tuple[str, int]]:
+        """
+        Walk the link graph around a page with a recursive CTE.
+
+        Scope filtering is applied inside the recursion, so hidden pages and
+        links are never traversed (a visible page behind a hidden one is not
+        reached through it).
+
+        Returns:
+            List of (page_id, distance) ordered by distance, at most ``limit`` rows
+        """
+        hood = select(
+            literal(page_id).label("page_id"),
+            literal(0).label("depth"),
+        ).cte("hood", recursive=True)
+
+        steps = []
+        if direction in ("out", "both"):
+            steps.append(
+                select(Link.to_page_id, hood.c.depth + 1)
+                .join(hood, Link.from_page_id == hood.c.page_id)
+                .join(NotePage, NotePage.id == Link.to_page_id)
+                .where(
+                    hood.c.depth < depth,
+                    Link.scope.in_(allowed_scopes),
+                    NotePage.scope.in_(allowed_scopes),
+                )
+            )
+        if direction in ("in", "both"):
+            steps.append(
+                select(Link.from_page_id, hood.c.depth + 1)
+                .join(hood, Link.to_page_id == hood.c.page_id)
+                .join(NotePage, NotePage.id == Link.from_page_id)
+                .where(
+                    hood.c.depth < depth,
+                    Link.scope.in_(allowed_scopes),
+                    NotePage.scope.in_(allowed_scopes),
+                )
+            )
+        hood = hood.union(*steps)
+
+        distance = func.min(hood.c.depth).label("distance")
+        query = (
+            select(hood.c.page_id, distance)
+            .group_by(hood.c.page_id)
+            .order_by(distance, hood.c.page_id)
+            .limit(limit)
+        )
+        return [(row[0], row[1]) for row in self.session.execute(query).all()]
+
+    def list_between(self, page_ids: list[str], allowed_scopes: tuple[str, ...]) -> list[Link]:
+        """List visible links whose both endpoints are in the given page set."""
+        if not page_ids:
+            return []
+        return list(
+            self.session.execute(
+                select(Link).where(
+                    Link.from_page_id.in_(page_ids),
+                    Link.to_page_id.in_(page_ids),
+                    Link.scope.in_(allowed_scopes),
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    def list_visible_edges(self, allowed_scopes: tuple[str, ...]) -> list[tuple[str, str]]:
+        """List (from_page_id, to_page_id) of visible links between visible pages."""
+        source, target = aliased(NotePage), aliased(NotePage)
+        query = (
+            select(Link.from_page_id, Link.to_page_id)
+            .join(source, source.id == Link.from_page_id)
+            .join(target, target.id == Link.to_page_id)
+            .where(
+                Link.scope.in_(allowed_scopes),
+                source.scope.in_(allowed_scopes),
+                target.scope.in_(allowed_scopes),
+            )
+        )
+        return [(row[0], row[1]) for row in self.session.execute(query).all()]
+
     def create(self, link: Link) -> Link:
         """Create a new link."""
         self.session.add(link)
@@ -27,6 +27,37 @@ class PageRepository:
         """List all pages."""
         return list(self.session.execute(select(NotePage)).scalars().all())
 
+    def list_by_ids(self, page_ids: list[str]) -> list[NotePage]:
+        """List pages with the given IDs."""
+        if not page_ids:
+            return []
+        return list(
+            self.session.execute(select(NotePage).where(NotePage.id.in_(page_ids))).scalars().all()
+        )
+
+    def list_visible_ids(self, page_ids: list[str], allowed_scopes: tuple[str, ...]) -> list[str]:
+        """List which of the given page IDs exist and are visible."""
+        if not page_ids:
+            return []
+        query = select(NotePage.id).where(
+            NotePage.id.in_(page_ids), NotePage.scope.in_(allowed_scopes)
+        )
+        return list(self.session.execute(query).scalars().all())
+
+    def list_node_rows(
+        self, allowed_scopes: tuple[str, ...]
+    ) -> list[tuple[str, str, str | None, str | None]]:
+        """List (id, title, entity_type, entity_id) of visible pages, without bodies."""
+        query = select(NotePage.id, NotePage.title, NotePage.entity_type, NotePage.entity_id).where(
+            NotePage.scope.in_(allowed_scopes)
+        )
+        return [(row[0], row[1], row[2], row[3]) for row in self.session.execute(query).all()]
+
+    def list_scopes(self) -> list[tuple[str, str]]:
+        """List (id, scope) of all pages."""
+        query = select(NotePage.id, NotePage.scope)
+        return [(row[0], row[1]) for row in self.session.execute(query).all()]
+
     def create(self, page: NotePage) -> NotePage:
         """Create a new page."""
         self.session.add(page)
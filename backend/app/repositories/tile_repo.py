@@ -1,6 +1,6 @@
 """Territory tile repository."""
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models import TerritoryTile
@@ -55,6 +55,24 @@ class TileRepository:
             .all()
         )
 
+    def list_tiles_at(
+        self, snapshot_id: str, z: int, coords: list[tuple[int, int]]
+    ) -> list[TerritoryTile]:
+        """List the tiles of every faction at the given (x, y) coordinates of a snapshot."""
+        if not coords:
+            return []
+        return list(
+            self.session.execute(
+                select(TerritoryTile).where(
+                    TerritoryTile.snapshot_id == snapshot_id,
+                    TerritoryTile.z == z,
+                    tuple_(TerritoryTile.x, TerritoryTile.y).in_(coords),
+                )
+            )
+            .scalars()
+            .all()
+        )
+
     def create(self, tile: TerritoryTile) -> TerritoryTile:
         """Create a new tile."""
         self.session.add(tile)
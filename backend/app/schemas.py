@@ -100,6 +100,7 @@ class PlaceCreate(BaseModel):
     type: str = Field(..., pattern=r"^(building|district|landmark|other)$")
     position: dict[str, float] | None = None
     owner_faction_id: str | None = None
+    parent_place_id: str | None = None
     scope: str = Field(default="public", pattern=r"^(public|gm|player)$")
     notes_public: str | None = None
     notes_gm: str | None = None
@@ -112,6 +113,7 @@ class PlaceUpdate(BaseModel):
     type: str | None = Field(None, pattern=r"^(building|district|landmark|other)$")
     position: dict[str, float] | None = None
     owner_faction_id: str | None = None
+    parent_place_id: str | None = None
     scope: str | None = Field(None, pattern=r"^(public|gm|player)$")
     notes_public: str | None = None
     notes_gm: str | None = None
@@ -125,6 +127,7 @@ class PlaceResponse(BaseModel):
     type: str
     position: dict[str, float] | None = None
     owner_faction_id: str | None = None
+    parent_place_id: str | None = None
     scope: str
     notes_public: str | None = None
     notes_gm: str | None = None
@@ -137,6 +140,18 @@ class PlaceResponse(BaseModel):
         from_attributes = True
 
 
+class PlaceHierarchyResponse(PlaceResponse):
+    """Schema for an ancestor or descendant of a place."""
+
+    depth: int  # Levels between the two places (1 = parent/child)
+
+
+class PlaceNearestResponse(PlaceResponse):
+    """Schema for a place found by a nearest-neighbor query."""
+
+    distance: float  # Distance from the query point, in map units
+
+
 # NotePage schemas
 class NotePageCreate(BaseModel):
     """Schema for creating a note page."""
@@ -169,6 +184,7 @@ class NotePageResponse(BaseModel):
     entity_id: str | None = None
     created_at: datetime
     updated_at: datetime
+    backlink_count: int | None = None  # Only set by GET /pages?include_backlink_counts=true
 
     class Config:
         """Pydantic config."""
@@ -193,3 +209,24 @@ class NotePageResponse(BaseModel):
             created_at=obj.created_at,
             updated_at=obj.updated_at,
         )
+
+
+# Event schemas
+class EventRefResponse(BaseModel):
+    """Schema for an entity referenced by an event."""
+
+    entity_type: str  # faction|person|place|page
+    entity_id: str
+    role: str | None = None
+
+
+class EventResponse(BaseModel):
+    """Schema for event response."""
+
+    id: str
+    at_datetime: datetime
+    title: str
+    body_markdown: str | None = None
+    scope: str
+    snapshot_id: str | None = None
+    refs: list[EventRefResponse] | None = None  # Only set with include_refs=true
@@ -0,0 +1,58 @@
+"""In-process caches for derived data, keyed by data version."""
+
+import weakref
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+_registry: "weakref.WeakSet[VersionedCache[Any]]" = weakref.WeakSet()
+
+
+class VersionedCache(Generic[T]):
+    """
+    Cache holding one value per key, valid only for the version it was built at.
+
+    Entries are scoped to the session's database engine, so different project
+    databases (e.g. per-test databases) never see each other's entries.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache and register it for clear_all_caches()."""
+        self._entries: weakref.WeakKeyDictionary[Engine, dict[Hashable, tuple[Hashable, T]]] = (
+            weakref.WeakKeyDictionary()
+        )
+        _registry.add(self)
+
+    def get(self, session: Session, key: Hashable, version: Hashable) -> T | None:
+        """Get the cached value for key if it was built at the given version."""
+        entry = self._entries.get(self._engine(session), {}).get(key)
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def put(self, session: Session, key: Hashable, version: Hashable, value: T) -> None:
+        """Store the value for key, replacing any older version."""
+        self._entries.setdefault(self._engine(session), {})[key] = (version, value)
+
+    def discard(self, session: Session, key: Hashable) -> None:
+        """Drop the value for key, whatever its version."""
+        self._entries.get(self._engine(session), {}).pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    @staticmethod
+    def _engine(session: Session) -> Engine:
+        bind = session.get_bind()
+        return bind if isinstance(bind, Engine) else bind.engine
+
+
+def clear_all_caches() -> None:
+    """Drop every cached value, e.g. after the project database was replaced."""
+    for cache in list(_registry):
+        cache.clear()
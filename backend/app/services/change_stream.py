@@ -0,0 +1,245 @@
+"""Entity change notifications collected on flush and published on commit."""
+
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, UOWTransaction
+from sqlalchemy.orm.attributes import instance_state
+
+from app.models import Event, Faction, NotePage, Person, Place, ProjectMeta, Snapshot
+from app.services import versions
+from app.services.graph_changes import ChangeOp
+from app.services.visibility import ViewMode, VisibilityService
+
+# Entity types notified
+_ENTITY_TYPES: dict[type, str] = {
+    Faction: "faction",
+    Person: "person",
+    Place: "place",
+    NotePage: "page",
+    Event: "event",
+    Snapshot: "snapshot",
+}
+
+# Version counter bumped by writes of each entity type
+_COUNTERS: dict[str, str] = {
+    "faction": versions.FACTIONS,
+    "person": versions.PEOPLE,
+    "place": versions.PLACES,
+    "page": versions.GRAPH,
+    "snapshot": versions.SNAPSHOTS,
+}
+
+# Number of recent changes kept for clients resuming with Last-Event-ID
+HISTORY_SIZE = 1000
+# Changes buffered per subscriber before it is told to resync
+QUEUE_SIZE = 1000
+
+_PENDING_KEY = "change_stream_pending"
+_VERSIONS_KEY = "change_stream_versions"
+
+
+@dataclass(frozen=True)
+class EntityChange:
+    """A committed change of one entity."""
+
+    seq: int  # Position in the stream, sent as the SSE event ID
+    entity_type: str
+    id: str
+    op: ChangeOp
+    version: int | None  # Counter value of the entity type after the commit, if bumped
+    scope: str | None = None  # Scoped entities: scope after the change (before it, for deletes)
+    prev_scope: str | None = None  # Scoped entities: scope before an update
+
+    def for_view_mode(self, view_mode: ViewMode) -> dict[str, Any] | None:
+        """
+        Get the notification as seen in a view mode.
+
+        Entities hidden before and after the change are left out (None). An
+        update that hides an entity is seen as its delete, one that reveals
+        it as its insert.
+        """
+        allowed = VisibilityService.get_allowed_scopes(view_mode)
+        visible = self.scope is None or self.scope in allowed
+        was_visible = visible if self.op != "update" else self.prev_scope in allowed
+        if not visible and not was_visible:
+            return None
+        op = self.op
+        if op == "update" and not was_visible:
+            op = "insert"
+        elif op == "update" and not visible:
+            op = "delete"
+        return {
+            "seq": self.seq,
+            "entity_type": self.entity_type,
+            "id": self.id,
+            "op": op,
+            "version": self.version,
+        }
+
+
+class Subscription:
+    """Queue of changes for one stream client."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Initialize an empty subscription delivering on the given loop."""
+        self.loop = loop
+        self.queue: asyncio.Queue[EntityChange | None] = asyncio.Queue(QUEUE_SIZE)
+        self.overflowed = False  # Changes were dropped; the client must resync
+
+    def _put(self, change: EntityChange) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Wake the reader, which then checks `overflowed`
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class ChangeBroadcaster:
+    """
+    Fans committed changes out to subscribers and keeps a short history.
+
+    Commits may happen on any thread; changes are handed to each
+    subscriber's event loop thread-safely.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a broadcaster with no subscribers."""
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: deque[EntityChange] = deque(maxlen=HISTORY_SIZE)
+        self._subscribers: set[Subscription] = set()
+
+    def subscribe(self) -> Subscription:
+        """Subscribe the running event loop to changes published from now on."""
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering changes to a subscription."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, changes: list[EntityChange]) -> None:
+        """Number changes and deliver them to every subscriber."""
+        with self._lock:
+            numbered = [replace(change, seq=self._seq + i) for i, change in enumerate(changes, 1)]
+            self._seq += len(numbered)
+            self._history.extend(numbered)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            for change in numbered:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._put, change)
+                except RuntimeError:  # Loop closed: the client is gone
+                    self.unsubscribe(subscription)
+                    break
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest published change (0 if none)."""
+        return self._seq
+
+    def since(self, seq: int) -> list[EntityChange] | None:
+        """
+        Get the changes after a sequence number.
+
+        Returns:
+            Changes in order, or None if some of them are no longer kept
+        """
+        with self._lock:
+            if seq > self._seq:
+                return None  # From another process lifetime
+            if seq < self._seq and (not self._history or self._history[0].seq > seq + 1):
+                return None
+            return [change for change in self._history if change.seq > seq]
+
+
+broadcaster = ChangeBroadcaster()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context: UOWTransaction) -> None:
+    """Record the flushed changes of tracked entities until the commit."""
+    pending: dict[tuple[str, str], EntityChange] = session.info.setdefault(_PENDING_KEY, {})
+    counters: dict[str, int] = session.info.setdefault(_VERSIONS_KEY, {})
+
+    for obj in session.new:
+        _record(pending, obj, "insert")
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            _record(pending, obj, "update")
+    for obj in session.deleted:
+        _record(pending, obj, "delete")
+    # Counter values after this flush, to send with the changes
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, ProjectMeta) and obj.key.startswith("version:"):
+            counters[obj.key.removeprefix("version:")] = int(obj.value)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    """Publish the transaction's changes once it is committed."""
+    pending: dict[tuple[str, str], EntityChange] = session.info.pop(_PENDING_KEY, {})
+    counters: dict[str, int] = session.info.pop(_VERSIONS_KEY, {})
+    if not pending:
+        return
+    broadcaster.publish(
+        [
+            replace(change, version=counters.get(_COUNTERS.get(change.entity_type, "")))
+            for change in pending.values()
+        ]
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """Forget the changes of a rolled back transaction."""
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_VERSIONS_KEY, None)
+
+
+def _record(pending: dict[tuple[str, str], EntityChange], obj: object, op: ChangeOp) -> None:
+    """Merge an entity's change into the transaction's changes."""
+    entity_type = _ENTITY_TYPES.get(type(obj))
+    if entity_type is None:
+        return
+    state = instance_state(obj)
+    # Read from the loaded state: a deleted row can no longer be loaded
+    identity = state.identity
+    entity_id = str(identity[0] if identity else state.mapper.primary_key_from_instance(obj)[0])
+    scope = state.dict.get("scope")
+    prev_scope = None
+    if scope is not None and op == "update":
+        history = state.attrs.scope.history
+        prev_scope = history.deleted[0] if history.deleted else scope
+
+    key = (entity_type, entity_id)
+    earlier = pending.get(key)
+    if earlier is not None:
+        if earlier.op == "insert" and op == "delete":
+            del pending[key]  # Never visible outside the transaction
+            return
+        if earlier.op == "insert":
+            op = "insert"
+        if earlier.prev_scope is not None:
+            prev_scope = earlier.prev_scope
+    pending[key] = EntityChange(
+        seq=0,
+        entity_type=entity_type,
+        id=entity_id,
+        op=op,
+        version=None,
+        scope=scope,
+        prev_scope=prev_scope,
+    )
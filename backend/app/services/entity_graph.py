@@ -0,0 +1,161 @@
+"""Unified typed graph of pages, factions, people, places and events."""
+
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Event, EventRef, Faction, FactionMembership, Link, NotePage, Person, Place
+from app.services import versions
+from app.services.cache import VersionedCache
+from app.services.visibility import ViewMode, VisibilityService
+
+EntityType = Literal["page", "faction", "person", "place", "event"]
+
+
+@dataclass
+class EntityNode:
+    """Node of the entity graph."""
+
+    id: str
+    type: EntityType
+    title: str
+    visibility: str
+
+
+@dataclass
+class EntityEdge:
+    """Edge of the entity graph."""
+
+    from_id: str
+    to_id: str
+    link_type: str  # wikilink|manual|reference for page links, else relation name
+    visibility: str
+    role: str | None = None  # Membership or event role
+
+
+@dataclass
+class EntityGraph:
+    """All visible entities and their relations for one view mode."""
+
+    nodes: list[EntityNode]
+    edges: list[EntityEdge]
+
+
+# Built per view mode; valid while neither pages/links nor entities change
+_entity_graph_cache: VersionedCache[EntityGraph] = VersionedCache()
+
+
+def get_entity_graph(session: Session, view_mode: ViewMode = "gm") -> EntityGraph:
+    """
+    Get the unified entity graph, cached per view mode and data version.
+
+    Args:
+        session: Database session
+        view_mode: View mode (gm or player)
+
+    Returns:
+        EntityGraph with every visible node and relation
+    """
+    version = (
+        versions.get_version(session, versions.GRAPH),
+        versions.get_version(session, versions.ENTITIES),
+    )
+    graph = _entity_graph_cache.get(session, view_mode, version)
+    if graph is None:
+        graph = build_entity_graph(session, view_mode)
+        _entity_graph_cache.put(session, view_mode, version, graph)
+    return graph
+
+
+def build_entity_graph(session: Session, view_mode: ViewMode = "gm") -> EntityGraph:
+    """
+    Build the unified entity graph with one column query per table.
+
+    Relations included:
+    - page links (wikilink/manual/reference)
+    - page -> bound entity (about)
+    - person -> faction (member_of, with role)
+    - person -> place (works_at, lives_at)
+    - place -> parent place (part_of)
+    - place -> owner faction (owned_by)
+    - event -> referenced entity (involves, with role)
+
+    Args:
+        session: Database session
+        view_mode: View mode (gm or player)
+
+    Returns:
+        EntityGraph restricted to entities visible in the view mode
+    """
+    visibility = VisibilityService()
+    allowed_scopes = visibility.get_allowed_scopes(view_mode)
+
+    nodes: dict[str, EntityNode] = {}
+
+    def add_node(node_id: str, node_type: EntityType, title: str, scope: str) -> None:
+        if scope in allowed_scopes:
+            nodes[node_id] = EntityNode(node_id, node_type, title, scope)
+
+    for faction_id, name in session.execute(select(Faction.id, Faction.name)):
+        add_node(faction_id, "faction", name, "public")
+    people = session.execute(
+        select(Person.id, Person.name, Person.workplace_place_id, Person.home_place_id)
+    ).all()
+    for person_id, name, _, _ in people:
+        add_node(person_id, "person", name, "public")
+    places = session.execute(
+        select(Place.id, Place.name, Place.scope, Place.parent_place_id, Place.owner_faction_id)
+    ).all()
+    for place_id, name, scope, _, _ in places:
+        add_node(place_id, "place", name, scope)
+    pages = session.execute(
+        select(NotePage.id, NotePage.title, NotePage.scope, NotePage.entity_id)
+    ).all()
+    for page_id, title, scope, _ in pages:
+        add_node(page_id, "page", title, scope)
+    events = session.execute(select(Event.id, Event.title, Event.scope)).all()
+    for event_id, title, scope in events:
+        add_node(event_id, "event", title, scope)
+
+    edges: list[EntityEdge] = []
+
+    def add_edge(
+        from_id: str | None,
+        to_id: str | None,
+        link_type: str,
+        scope: str | None = None,
+        role: str | None = None,
+    ) -> None:
+        source, target = nodes.get(from_id or ""), nodes.get(to_id or "")
+        if source is None or target is None:
+            return
+        if scope is None:
+            scope = visibility.most_restrictive(source.visibility, target.visibility)
+        elif scope not in allowed_scopes:
+            return
+        edges.append(EntityEdge(source.id, target.id, link_type, scope, role))
+
+    for from_id, to_id, link_type, scope in session.execute(
+        select(Link.from_page_id, Link.to_page_id, Link.link_type, Link.scope)
+    ):
+        add_edge(from_id, to_id, link_type, scope)
+    for page_id, _, _, entity_id in pages:
+        add_edge(page_id, entity_id, "about")
+    for person_id, faction_id, role in session.execute(
+        select(FactionMembership.person_id, FactionMembership.faction_id, FactionMembership.role)
+    ):
+        add_edge(person_id, faction_id, "member_of", role=role)
+    for person_id, _, workplace_id, home_id in people:
+        add_edge(person_id, workplace_id, "works_at")
+        add_edge(person_id, home_id, "lives_at")
+    for place_id, _, _, parent_id, owner_id in places:
+        add_edge(place_id, parent_id, "part_of")
+        add_edge(place_id, owner_id, "owned_by")
+    for event_id, entity_id, role in session.execute(
+        select(EventRef.event_id, EventRef.entity_id, EventRef.role)
+    ):
+        add_edge(event_id, entity_id, "involves", role=role)
+
+    return EntityGraph(nodes=list(nodes.values()), edges=edges)
@@ -0,0 +1,260 @@
+"""Entity history: events, bound pages, territory and attribute changes, newest first."""
+
+import base64
+import heapq
+import itertools
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import ColumnElement, String, cast, false, func, or_, select, true
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.models import EntityVersion, Event, EventRef, NotePage, Snapshot, TerritoryTile
+
+HistoryEntityType = Literal["faction", "person", "place"]
+HistoryKind = Literal["event", "page", "territory", "version"]
+
+
+@dataclass(frozen=True)
+class HistoryItem:
+    """One entry of an entity's history."""
+
+    kind: HistoryKind
+    id: str  # Event, page, snapshot or version ID
+    at: datetime  # Event time, page edit time or snapshot date
+    title: str  # Versions: the changed attribute
+    scope: str | None = None  # Events and pages
+    snapshot_id: str | None = None  # Events bound to a snapshot, territory
+    role: str | None = None  # Events: the entity's role in the event
+    tile_count: int | None = None  # Territory: tiles the faction painted
+    value: str | None = None  # Versions: the attribute's new value
+
+    @property
+    def key(self) -> tuple[datetime, str, str]:
+        """Sort key: history runs from the greatest key down."""
+        return (self.at, self.kind, self.id)
+
+
+@dataclass
+class HistoryPage:
+    """One page of an entity's history."""
+
+    items: list[HistoryItem]
+    next_cursor: str | None  # Pass as `cursor` to get the next page
+
+
+class EntityHistoryService:
+    """
+    Service assembling an entity's history from its sources.
+
+    Each source (events referencing the entity, pages bound to it, changes
+    of its versioned attributes, and for factions the snapshots they painted
+    territory in) is one indexed query
+    already ordered newest first; they are merged lazily by timestamp, so a
+    page reads at most `limit + 1` rows per source however long the history.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize service with database session."""
+        self.session = session
+
+    def get_history(
+        self,
+        entity_type: HistoryEntityType,
+        entity_id: str,
+        allowed_scopes: tuple[str, ...],
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> HistoryPage:
+        """
+        Get a page of an entity's history, newest first.
+
+        Args:
+            entity_type: faction, person or place
+            entity_id: ID of the entity
+            allowed_scopes: Scopes of events and pages to include
+            limit: Page size
+            cursor: Cursor from the previous page
+
+        Returns:
+            History page
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        after = _decode_cursor(cursor) if cursor is not None else None
+        sources = [
+            self._events(entity_type, entity_id, allowed_scopes, after, limit + 1),
+            self._pages(entity_type, entity_id, allowed_scopes, after, limit + 1),
+            self._versions(entity_type, entity_id, "gm" in allowed_scopes, after, limit + 1),
+        ]
+        if entity_type == "faction":
+            sources.append(self._territory(entity_id, after, limit + 1))
+
+        merged = heapq.merge(*sources, key=lambda item: item.key, reverse=True)
+        items = list(itertools.islice(merged, limit + 1))
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = _encode_cursor(items[-1].key)
+        return HistoryPage(items=items, next_cursor=next_cursor)
+
+    def _events(
+        self,
+        entity_type: str,
+        entity_id: str,
+        allowed_scopes: tuple[str, ...],
+        after: tuple[datetime, str, str] | None,
+        limit: int,
+    ) -> Iterator[HistoryItem]:
+        # One row per event even if it references the entity in several roles
+        query = (
+            select(
+                Event.id,
+                Event.at_datetime,
+                Event.title,
+                Event.scope,
+                Event.snapshot_id,
+                func.min(EventRef.role),
+            )
+            .join(EventRef, EventRef.event_id == Event.id)
+            .where(
+                EventRef.entity_type == entity_type,
+                EventRef.entity_id == entity_id,
+                Event.scope.in_(allowed_scopes),
+            )
+            .group_by(Event.id)
+        )
+        query = (
+            query.where(*_after("event", Event.at_datetime, Event.id, after))
+            .order_by(Event.at_datetime.desc(), Event.id.desc())
+            .limit(limit)
+        )
+        for event_id, at, title, scope, snapshot_id, role in self.session.execute(query):
+            yield HistoryItem(
+                kind="event",
+                id=event_id,
+                at=at,
+                title=title,
+                scope=scope,
+                snapshot_id=snapshot_id,
+                role=role,
+            )
+
+    def _pages(
+        self,
+        entity_type: str,
+        entity_id: str,
+        allowed_scopes: tuple[str, ...],
+        after: tuple[datetime, str, str] | None,
+        limit: int,
+    ) -> Iterator[HistoryItem]:
+        query = select(NotePage.id, NotePage.updated_at, NotePage.title, NotePage.scope).where(
+            NotePage.entity_type == entity_type,
+            NotePage.entity_id == entity_id,
+            NotePage.scope.in_(allowed_scopes),
+        )
+        query = (
+            query.where(*_after("page", NotePage.updated_at, NotePage.id, after))
+            .order_by(NotePage.updated_at.desc(), NotePage.id.desc())
+            .limit(limit)
+        )
+        for page_id, at, title, scope in self.session.execute(query):
+            yield HistoryItem(kind="page", id=page_id, at=at, title=title, scope=scope)
+
+    def _territory(
+        self, faction_id: str, after: tuple[datetime, str, str] | None, limit: int
+    ) -> Iterator[HistoryItem]:
+        query = (
+            select(Snapshot.id, Snapshot.at_date, Snapshot.label, func.count(TerritoryTile.id))
+            .join(TerritoryTile, TerritoryTile.snapshot_id == Snapshot.id)
+            .where(TerritoryTile.faction_id == faction_id)
+            .group_by(Snapshot.id)
+        )
+        query = (
+            query.where(*_after("territory", Snapshot.at_date, Snapshot.id, after))
+            .order_by(Snapshot.at_date.desc(), Snapshot.id.desc())
+            .limit(limit)
+        )
+        for snapshot_id, at, label, tile_count in self.session.execute(query):
+            yield HistoryItem(
+                kind="territory",
+                id=snapshot_id,
+                at=at,
+                title=label,
+                snapshot_id=snapshot_id,
+                tile_count=tile_count,
+            )
+
+    def _versions(
+        self,
+        entity_type: str,
+        entity_id: str,
+        include_gm: bool,
+        after: tuple[datetime, str, str] | None,
+        limit: int,
+    ) -> Iterator[HistoryItem]:
+        query = select(
+            EntityVersion.id,
+            EntityVersion.valid_from,
+            EntityVersion.field,
+            EntityVersion.value,
+            EntityVersion.snapshot_id,
+        ).where(EntityVersion.entity_type == entity_type, EntityVersion.entity_id == entity_id)
+        if not include_gm:
+            query = query.where(EntityVersion.field != "notes_gm")
+        # Version IDs are integers; the cursor compares them as the strings they are served as
+        version_id = cast(EntityVersion.id, String)
+        query = (
+            query.where(*_after("version", EntityVersion.valid_from, version_id, after))
+            .order_by(EntityVersion.valid_from.desc(), version_id.desc())
+            .limit(limit)
+        )
+        for item_id, at, field, value, snapshot_id in self.session.execute(query):
+            yield HistoryItem(
+                kind="version",
+                id=str(item_id),
+                at=at,
+                title=field,
+                snapshot_id=snapshot_id,
+                value=value,
+            )
+
+
+def _after(
+    kind: HistoryKind,
+    at_column: InstrumentedAttribute[datetime],
+    id_column: InstrumentedAttribute[str] | ColumnElement[str],
+    after: tuple[datetime, str, str] | None,
+) -> list[ColumnElement[bool]]:
+    """Conditions starting a source after the cursor's (at, kind, id)."""
+    if after is None:
+        return []
+    after_at, after_kind, after_id = after
+    # Within the cursor's timestamp, a source's rows all share its kind
+    if kind == after_kind:
+        same_at: ColumnElement[bool] = id_column < after_id
+    else:
+        same_at = true() if kind < after_kind else false()
+    # The plain bound lets SQLite seek the index instead of scanning to the cursor
+    return [at_column <= after_at, or_(at_column < after_at, (at_column == after_at) & same_at)]
+
+
+def _encode_cursor(key: tuple[datetime, str, str]) -> str:
+    at, kind, item_id = key
+    raw = json.dumps([at.isoformat(), kind, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        at, kind, item_id = json.loads(raw)
+        if not isinstance(kind, str) or not isinstance(item_id, str):
+            raise TypeError(cursor)
+        return datetime.fromisoformat(at), kind, item_id
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,265 @@
+"""Entity attributes versioned by snapshot date, with an "as of snapshot" read path."""
+
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Select, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models import EntityVersion, Snapshot, entity_version_rtree
+from app.services.visibility import ViewMode
+
+# Attributes that can change from one snapshot to the next, per entity type
+VERSIONED_FIELDS: dict[str, tuple[str, ...]] = {
+    "faction": ("notes_public", "notes_gm"),
+    "person": ("status", "notes_public", "notes_gm"),
+    "place": ("owner_faction_id", "notes_public", "notes_gm"),
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_OPEN_END = 1e9  # R*Tree end of intervals without a next change, in days
+
+
+class EntityVersionService:
+    """
+    Maintains entity_versions and its interval index entity_version_rtree.
+
+    A version holds an attribute's value from its snapshot's date until the
+    next version of the same attribute; outside every version the entity's
+    own column applies. Entities are never copied per snapshot: only the
+    changes are stored. Writes happen in the caller's transaction; the caller
+    commits.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize service with database session."""
+        self.session = session
+
+    def list_versions(self, entity_type: str, entity_id: str) -> list[EntityVersion]:
+        """Get every version of an entity's attributes, by field then date."""
+        return list(
+            self.session.scalars(
+                select(EntityVersion)
+                .where(
+                    EntityVersion.entity_type == entity_type, EntityVersion.entity_id == entity_id
+                )
+                .order_by(EntityVersion.field, EntityVersion.valid_from)
+            )
+        )
+
+    def set_value(
+        self,
+        entity_type: str,
+        entity_id: str,
+        field: str,
+        snapshot: Snapshot,
+        value: str | None,
+    ) -> EntityVersion:
+        """
+        Set an attribute's value from a snapshot's date on.
+
+        The value holds until the attribute's next recorded change; the
+        change before it now ends at the snapshot's date. A version already
+        starting at that date is overwritten.
+
+        Args:
+            entity_type: faction, person or place
+            entity_id: ID of the entity
+            field: Versioned attribute (see VERSIONED_FIELDS)
+            snapshot: Snapshot the change happens in
+            value: New value
+
+        Returns:
+            The version
+
+        Raises:
+            ValueError: If the attribute is not versioned
+        """
+        if field not in VERSIONED_FIELDS.get(entity_type, ()):
+            raise ValueError(f"Field {field} of {entity_type} is not versioned")
+
+        at = snapshot.at_date
+        existing = self.session.scalar(
+            self._attribute(entity_type, entity_id, field).where(EntityVersion.valid_from == at)
+        )
+        if existing is not None:
+            existing.value = value
+            existing.snapshot_id = snapshot.id
+            self.session.flush()
+            return existing
+
+        previous = self._previous(entity_type, entity_id, field, at)
+        following = self.session.scalar(
+            self._attribute(entity_type, entity_id, field)
+            .where(EntityVersion.valid_from > at)
+            .order_by(EntityVersion.valid_from)
+            .limit(1)
+        )
+        version = EntityVersion(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            field=field,
+            value=value,
+            snapshot_id=snapshot.id,
+            valid_from=at,
+            valid_to=following.valid_from if following is not None else None,
+        )
+        self.session.add(version)
+        self.session.flush()
+        self._index(version)
+        if previous is not None:
+            previous.valid_to = at
+            self._index(previous)
+        self.session.flush()
+        return version
+
+    def remove_value(
+        self, entity_type: str, entity_id: str, snapshot_id: str, field: str | None = None
+    ) -> int:
+        """
+        Remove the changes an entity's attributes recorded in a snapshot.
+
+        The previous change of each attribute then lasts until the next one.
+
+        Args:
+            entity_type: faction, person or place
+            entity_id: ID of the entity
+            snapshot_id: Snapshot of the changes
+            field: Attribute to remove; None removes all of them
+
+        Returns:
+            Number of removed versions
+        """
+        query = select(EntityVersion).where(
+            EntityVersion.entity_type == entity_type,
+            EntityVersion.entity_id == entity_id,
+            EntityVersion.snapshot_id == snapshot_id,
+        )
+        if field is not None:
+            query = query.where(EntityVersion.field == field)
+        versions = list(self.session.scalars(query))
+        for version in versions:
+            self._remove(version)
+        return len(versions)
+
+    def remove_snapshot(self, snapshot_id: str) -> None:
+        """Remove the changes recorded in a snapshot, before it is deleted."""
+        for version in self.session.scalars(
+            select(EntityVersion).where(EntityVersion.snapshot_id == snapshot_id)
+        ).all():
+            self._remove(version)
+
+    def remove_entity(self, entity_type: str, entity_id: str) -> None:
+        """Remove every version of an entity, before it is deleted."""
+        ids = select(EntityVersion.id).where(
+            EntityVersion.entity_type == entity_type, EntityVersion.entity_id == entity_id
+        )
+        self.session.execute(delete(entity_version_rtree).where(entity_version_rtree.c.id.in_(ids)))
+        self.session.execute(
+            delete(EntityVersion).where(
+                EntityVersion.entity_type == entity_type, EntityVersion.entity_id == entity_id
+            )
+        )
+        self.session.flush()
+
+    def values_as_of(
+        self, entity_type: str, at: datetime, entity_ids: Sequence[str] | None = None
+    ) -> dict[str, dict[str, str | None]]:
+        """
+        Get the versioned attribute values in force at a date.
+
+        Without `entity_ids`, versions whose interval contains the date are
+        found through the R*Tree (whose bounds are rounded outward, so the
+        exact interval is checked against entity_versions); with them, each
+        entity's versions are read through the (entity, field, date) index.
+
+        Args:
+            entity_type: faction, person or place
+            at: Date (usually a snapshot's at_date)
+            entity_ids: Entities to look up; None looks up all of the type
+
+        Returns:
+            Values per entity ID and field, for attributes with a version in
+            force; other attributes keep the entity's own column values
+        """
+        query = select(EntityVersion.entity_id, EntityVersion.field, EntityVersion.value).where(
+            EntityVersion.entity_type == entity_type,
+            EntityVersion.valid_from <= at,
+            or_(EntityVersion.valid_to.is_(None), EntityVersion.valid_to > at),
+        )
+        if entity_ids is None:
+            day = _day(at)
+            query = query.join(
+                entity_version_rtree, entity_version_rtree.c.id == EntityVersion.id
+            ).where(
+                entity_version_rtree.c.valid_from <= day, entity_version_rtree.c.valid_to >= day
+            )
+        else:
+            query = query.where(EntityVersion.entity_id.in_(entity_ids))
+
+        values: dict[str, dict[str, str | None]] = defaultdict(dict)
+        for entity_id, field, value in self.session.execute(query):
+            values[entity_id][field] = value
+        return values
+
+    def _attribute(self, entity_type: str, entity_id: str, field: str) -> Select[EntityVersion]:
+        return select(EntityVersion).where(
+            EntityVersion.entity_type == entity_type,
+            EntityVersion.entity_id == entity_id,
+            EntityVersion.field == field,
+        )
+
+    def _previous(
+        self, entity_type: str, entity_id: str, field: str, at: datetime
+    ) -> EntityVersion | None:
+        return self.session.scalar(
+            self._attribute(entity_type, entity_id, field)
+            .where(EntityVersion.valid_from < at)
+            .order_by(EntityVersion.valid_from.desc())
+            .limit(1)
+        )
+
+    def _remove(self, version: EntityVersion) -> None:
+        previous = self._previous(
+            version.entity_type, version.entity_id, version.field, version.valid_from
+        )
+        if previous is not None:
+            previous.valid_to = version.valid_to
+            self._index(previous)
+        self.session.execute(
+            delete(entity_version_rtree).where(entity_version_rtree.c.id == version.id)
+        )
+        self.session.delete(version)
+        self.session.flush()
+
+    def _index(self, version: EntityVersion) -> None:
+        """Write a version's interval to the R*Tree."""
+        self.session.execute(
+            delete(entity_version_rtree).where(entity_version_rtree.c.id == version.id)
+        )
+        valid_to = _day(version.valid_to) if version.valid_to is not None else _OPEN_END
+        self.session.execute(
+            insert(entity_version_rtree).values(
+                id=version.id, valid_from=_day(version.valid_from), valid_to=valid_to
+            )
+        )
+
+
+def apply_versions(
+    item: dict[str, Any], values: dict[str, str | None], view_mode: ViewMode
+) -> None:
+    """
+    Overlay versioned values on an entity response dict, in place.
+
+    Only fields present in the dict are replaced (projections stay as
+    requested); notes_gm stays hidden in player mode.
+    """
+    for field, value in values.items():
+        if field in item and not (field == "notes_gm" and view_mode == "player"):
+            item[field] = value
+
+
+def _day(at: datetime) -> float:
+    return (at - _EPOCH) / timedelta(days=1)
@@ -0,0 +1,125 @@
+"""Faction rosters: members with their roles, workplaces and player character info."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager
+
+from app.models import Faction, FactionMembership, Person
+
+
+@dataclass(frozen=True)
+class RosterPlayerCharacter:
+    """Player character info of a member."""
+
+    playbook: str | None
+    crew: str | None
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class RosterMember:
+    """One membership of a faction."""
+
+    membership_id: str
+    person_id: str
+    name: str
+    role: str | None
+    status: str
+    workplace_place_id: str | None
+    workplace_name: str | None  # None if there is no workplace or it is hidden
+    player_character: RosterPlayerCharacter | None  # None for NPCs
+
+
+@dataclass
+class FactionRoster:
+    """A faction's members, by name."""
+
+    faction_id: str
+    name: str
+    members: list[RosterMember] = field(default_factory=list)
+
+    @property
+    def member_count(self) -> int:
+        """Number of members."""
+        return len(self.members)
+
+    @property
+    def pc_count(self) -> int:
+        """Number of members who are player characters."""
+        return sum(member.player_character is not None for member in self.members)
+
+
+class FactionRosterService:
+    """
+    Service assembling faction rosters in a constant number of queries.
+
+    Memberships are read joined with their people; player characters and
+    workplaces are then loaded for all of them at once (selectinload), so a
+    roster of any size, or the rosters of every faction, takes four queries.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize service with database session."""
+        self.session = session
+
+    def get_rosters(
+        self, faction_ids: Sequence[str] | None, allowed_scopes: tuple[str, ...]
+    ) -> list[FactionRoster]:
+        """
+        Get the rosters of factions, ordered by faction name.
+
+        Args:
+            faction_ids: Factions to get; None gets all of them. Unknown IDs
+                are skipped
+            allowed_scopes: Scopes of workplaces whose names are shown
+
+        Returns:
+            Rosters with members ordered by name
+        """
+        factions = select(Faction.id, Faction.name).order_by(Faction.name, Faction.id)
+        memberships = (
+            select(FactionMembership)
+            .join(FactionMembership.person)
+            .options(
+                contains_eager(FactionMembership.person).selectinload(Person.player_character),
+                contains_eager(FactionMembership.person).selectinload(Person.workplace),
+            )
+            .order_by(Person.name, FactionMembership.id)
+        )
+        if faction_ids is not None:
+            factions = factions.where(Faction.id.in_(faction_ids))
+            memberships = memberships.where(FactionMembership.faction_id.in_(faction_ids))
+
+        rosters = {
+            faction_id: FactionRoster(faction_id=faction_id, name=name)
+            for faction_id, name in self.session.execute(factions)
+        }
+        for membership in self.session.scalars(memberships):
+            roster = rosters.get(membership.faction_id)
+            if roster is not None:
+                roster.members.append(_member(membership, allowed_scopes))
+        return list(rosters.values())
+
+
+def _member(membership: FactionMembership, allowed_scopes: tuple[str, ...]) -> RosterMember:
+    person = membership.person
+    workplace = person.workplace
+    pc = person.player_character
+    return RosterMember(
+        membership_id=membership.id,
+        person_id=person.id,
+        name=person.name,
+        role=membership.role,
+        status=person.status,
+        workplace_place_id=person.workplace_place_id,
+        workplace_name=workplace.name
+        if workplace is not None and workplace.scope in allowed_scopes
+        else None,
+        player_character=RosterPlayerCharacter(
+            playbook=pc.playbook, crew=pc.crew, is_active=pc.is_active
+        )
+        if pc is not None
+        else None,
+    )
@@ -0,0 +1,184 @@
+"""Append-only log of graph node and link changes, for incremental graph sync."""
+
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models import GraphChange, Link, NotePage, ProjectMeta
+from app.services import versions
+from app.services.visibility import ViewMode, VisibilityService
+
+ChangeOp = Literal["insert", "update", "delete"]
+
+# Number of most recent graph versions kept in the log
+MAX_LOG_VERSIONS = 1000
+
+# Highest graph version whose changes were compacted away
+_FLOOR_KEY = "graph_changes_floor"
+
+
+@dataclass
+class VisibleChange:
+    """A logged change as seen from one view mode."""
+
+    version: int
+    kind: str  # node|link
+    op: ChangeOp
+    change: GraphChange
+
+
+class GraphChangeLog:
+    """
+    Change log of the note graph, keyed by graph version.
+
+    A write records its changes first and then calls bump() once, before
+    committing. Changes are recorded with the version that bump() will
+    produce, so they become visible together with the write that caused them.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize change log with database session."""
+        self.session = session
+        self.visibility = VisibilityService()
+
+    def record_page(self, op: ChangeOp, page: NotePage, prev_scope: str | None = None) -> None:
+        """
+        Record a node change.
+
+        Args:
+            op: Change operation
+            page: Page as it is after the change (before it, for deletes)
+            prev_scope: Page scope before an update
+        """
+        self._add(
+            GraphChange(
+                kind="node",
+                op=op,
+                entity_id=page.id,
+                title=page.title,
+                scope=page.scope,
+                prev_scope=prev_scope,
+            )
+        )
+
+    def record_link(self, op: ChangeOp, link: Link, prev_scope: str | None = None) -> None:
+        """
+        Record a link change.
+
+        The logged scope is the link's effective scope: a link is only as
+        visible as its least visible endpoint.
+
+        Args:
+            op: Change operation
+            link: Link as it is after the change (before it, for deletes)
+            prev_scope: Effective link scope before an update
+        """
+        self._add(
+            GraphChange(
+                kind="link",
+                op=op,
+                entity_id=link.id,
+                from_page_id=link.from_page_id,
+                to_page_id=link.to_page_id,
+                link_type=link.link_type,
+                scope=self.effective_link_scope(link),
+                prev_scope=prev_scope,
+            )
+        )
+
+    def record_page_scope_change(self, page: NotePage, prev_scope: str) -> None:
+        """
+        Record a page visibility change and its effect on the page's links.
+
+        Args:
+            page: Page with its new scope
+            prev_scope: Page scope before the change
+        """
+        self.record_page("update", page, prev_scope=prev_scope)
+        for link in {link.id: link for link in [*page.links_from, *page.links_to]}.values():
+            ends = [
+                prev_scope if end_id == page.id else self._page_scope(end_id)
+                for end_id in (link.from_page_id, link.to_page_id)
+            ]
+            previous = self.visibility.most_restrictive(link.scope, *ends)
+            self.record_link("update", link, prev_scope=previous)
+
+    def bump(self) -> int:
+        """
+        Bump the graph version and compact the log.
+
+        Returns:
+            The new graph version
+        """
+        version = versions.bump_version(self.session, versions.GRAPH)
+        cutoff = version - MAX_LOG_VERSIONS
+        if cutoff > self.get_floor():
+            self.session.execute(delete(GraphChange).where(GraphChange.version <= cutoff))
+            self._set_floor(cutoff)
+        return version
+
+    def changes_since(self, since: int, view_mode: ViewMode = "gm") -> list[VisibleChange] | None:
+        """
+        Get the changes after a graph version, as seen from a view mode.
+
+        Updates that move an item in or out of the view are reported as an
+        insert or a delete, so a client only ever holds visible items.
+
+        Args:
+            since: Graph version the client is at
+            view_mode: View mode (gm or player)
+
+        Returns:
+            Changes in log order, or None if the client must resync (the log
+            was compacted past ``since`` or ``since`` is ahead of the graph)
+        """
+        if since < self.get_floor() or since > versions.get_version(self.session, versions.GRAPH):
+            return None
+
+        allowed_scopes = self.visibility.get_allowed_scopes(view_mode)
+        rows = self.session.execute(
+            select(GraphChange).where(GraphChange.version > since).order_by(GraphChange.seq)
+        ).scalars()
+
+        changes = []
+        for row in rows:
+            visible_before = row.op != "insert" and (row.prev_scope or row.scope) in allowed_scopes
+            visible_after = row.op != "delete" and row.scope in allowed_scopes
+            if visible_before and visible_after:
+                op: ChangeOp = "update"
+            elif visible_after:
+                op = "insert"
+            elif visible_before:
+                op = "delete"
+            else:
+                continue
+            changes.append(VisibleChange(row.version, row.kind, op, row))
+        return changes
+
+    def get_floor(self) -> int:
+        """Get the highest graph version whose changes were compacted away."""
+        meta = self.session.get(ProjectMeta, _FLOOR_KEY)
+        return int(meta.value) if meta else 0
+
+    def effective_link_scope(self, link: Link) -> str:
+        """Get the most restrictive of a link's scope and its endpoints' scopes."""
+        return self.visibility.most_restrictive(
+            link.scope, self._page_scope(link.from_page_id), self._page_scope(link.to_page_id)
+        )
+
+    def _page_scope(self, page_id: str) -> str:
+        page = self.session.get(NotePage, page_id)
+        return page.scope if page else "gm"
+
+    def _add(self, change: GraphChange) -> None:
+        change.version = versions.get_version(self.session, versions.GRAPH) + 1
+        self.session.add(change)
+
+    def _set_floor(self, version: int) -> None:
+        meta = self.session.get(ProjectMeta, _FLOOR_KEY)
+        if meta is None:
+            meta = ProjectMeta(key=_FLOOR_KEY, value="0")
+            self.session.add(meta)
+        meta.value = str(version)
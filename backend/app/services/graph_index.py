@@ -0,0 +1,261 @@
+"""In-memory adjacency index over the links table, for path queries."""
+
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy.orm import Session
+
+from app.models import Link, NotePage
+from app.repositories import LinkRepository, PageRepository
+from app.services import versions
+from app.services.cache import VersionedCache
+
+_INDEX_KEY = "adjacency"
+
+
+@dataclass
+class IndexedLink:
+    """Link data kept in the index."""
+
+    from_id: str
+    to_id: str
+    link_type: str
+    scope: str
+
+
+@dataclass
+class AdjacencyIndex:
+    """Outgoing and incoming link IDs per page, with page and link scopes."""
+
+    page_scopes: dict[str, str] = field(default_factory=dict)
+    links: dict[str, IndexedLink] = field(default_factory=dict)
+    outgoing: dict[str, set[str]] = field(default_factory=dict)
+    incoming: dict[str, set[str]] = field(default_factory=dict)
+
+    def add_link(self, link_id: str, link: IndexedLink) -> None:
+        """Add a link to the index."""
+        self.links[link_id] = link
+        self.outgoing.setdefault(link.from_id, set()).add(link_id)
+        self.incoming.setdefault(link.to_id, set()).add(link_id)
+
+    def remove_link(self, link_id: str) -> None:
+        """Remove a link from the index."""
+        link = self.links.pop(link_id)
+        self.outgoing[link.from_id].discard(link_id)
+        self.incoming[link.to_id].discard(link_id)
+
+    def neighbors(
+        self, page_id: str, allowed_scopes: tuple[str, ...], forward: bool, directed: bool
+    ) -> Iterable[str]:
+        """Yield visible pages one visible link away (following or against links)."""
+        sides = [(self.outgoing, True), (self.incoming, False)]
+        if directed:
+            sides = [sides[0] if forward else sides[1]]
+        for adjacency, outward in sides:
+            for link_id in adjacency.get(page_id, ()):
+                link = self.links[link_id]
+                if link.scope not in allowed_scopes:
+                    continue
+                other = link.to_id if outward else link.from_id
+                if self.page_scopes.get(other) in allowed_scopes:
+                    yield other
+
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        allowed_scopes: tuple[str, ...],
+        directed: bool = False,
+        banned_nodes: frozenset[str] = frozenset(),
+        banned_edges: frozenset[tuple[str, str]] = frozenset(),
+    ) -> list[str] | None:
+        """
+        Find a shortest path with bidirectional BFS.
+
+        Each step expands the smaller frontier by one full level. Among the
+        meeting points found in that level the one closest to the other side is
+        used, so the returned path is a shortest one.
+
+        Args:
+            source: Start page ID
+            target: End page ID
+            allowed_scopes: Scopes of pages and links that may be traversed
+            directed: Only follow links in their direction
+            banned_nodes: Pages that may not be visited
+            banned_edges: (from, to) steps that may not be taken
+
+        Returns:
+            List of page IDs from source to target, or None if unreachable
+        """
+        if source == target:
+            return [source]
+
+        # page -> (parent, distance) for each search side
+        seen: tuple[dict[str, tuple[str | None, int]], ...] = (
+            {source: (None, 0)},
+            {target: (None, 0)},
+        )
+        frontiers = ([source], [target])
+
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            this, other = seen[side], seen[1 - side]
+            next_frontier: list[str] = []
+            best: tuple[int, str, str] | None = None
+
+            for node in frontiers[side]:
+                for neighbor in self.neighbors(node, allowed_scopes, side == 0, directed):
+                    step = (node, neighbor) if side == 0 else (neighbor, node)
+                    if neighbor in banned_nodes or step in banned_edges:
+                        continue
+                    if neighbor in other:
+                        total = this[node][1] + 1 + other[neighbor][1]
+                        if best is None or total < best[0]:
+                            best = (total, node, neighbor)
+                    if neighbor not in this:
+                        this[neighbor] = (node, this[node][1] + 1)
+                        next_frontier.append(neighbor)
+
+            if best is not None:
+                _, node, neighbor = best
+                near = _walk_back(this, node)
+                far = _walk_back(other, neighbor)
+                return near[::-1] + far if side == 0 else far[::-1] + near
+            frontiers = (
+                (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+            )
+
+        return None
+
+    def k_shortest_paths(
+        self,
+        source: str,
+        target: str,
+        allowed_scopes: tuple[str, ...],
+        k: int,
+        directed: bool = False,
+    ) -> list[list[str]]:
+        """
+        Find up to k loopless shortest paths (Yen's algorithm over BFS).
+
+        Args:
+            source: Start page ID
+            target: End page ID
+            allowed_scopes: Scopes of pages and links that may be traversed
+            k: Maximum number of paths
+            directed: Only follow links in their direction
+
+        Returns:
+            Paths ordered by length, shortest first
+        """
+        first = self.shortest_path(source, target, allowed_scopes, directed)
+        if first is None:
+            return []
+
+        paths = [first]
+        candidates: list[tuple[int, list[str]]] = []
+        while len(paths) < k:
+            previous = paths[-1]
+            for i in range(len(previous) - 1):
+                root = previous[: i + 1]
+                banned_edges = frozenset(
+                    (path[i], path[i + 1]) for path in paths if path[: i + 1] == root
+                )
+                spur = self.shortest_path(
+                    previous[i],
+                    target,
+                    allowed_scopes,
+                    directed,
+                    banned_nodes=frozenset(root[:-1]),
+                    banned_edges=banned_edges,
+                )
+                if spur is None:
+                    continue
+                candidate = root[:-1] + spur
+                if candidate not in paths and all(c != candidate for _, c in candidates):
+                    heapq.heappush(candidates, (len(candidate), candidate))
+            if not candidates:
+                break
+            paths.append(heapq.heappop(candidates)[1])
+
+        return paths
+
+
+def _walk_back(seen: dict[str, tuple[str | None, int]], node: str) -> list[str]:
+    """Follow parent pointers from node back to the search origin."""
+    path = [node]
+    parent = seen[node][0]
+    while parent is not None:
+        path.append(parent)
+        parent = seen[parent][0]
+    return path
+
+
+# One index per database, valid for a single graph version
+_index_cache: VersionedCache[AdjacencyIndex] = VersionedCache()
+
+
+def get_adjacency_index(session: Session) -> AdjacencyIndex:
+    """
+    Get the adjacency index for the current graph version, building it if needed.
+
+    Args:
+        session: Database session
+
+    Returns:
+        AdjacencyIndex of all pages and links (visibility is applied per query)
+    """
+    version = versions.get_version(session, versions.GRAPH)
+    index = _index_cache.get(session, _INDEX_KEY, version)
+    if index is not None:
+        return index
+
+    index = AdjacencyIndex()
+    for page_id, scope in PageRepository(session).list_scopes():
+        index.page_scopes[page_id] = scope
+    for link_id, from_id, to_id, link_type, scope in LinkRepository(session).list_rows():
+        index.add_link(link_id, IndexedLink(from_id, to_id, link_type, scope))
+
+    _index_cache.put(session, _INDEX_KEY, version, index)
+    return index
+
+
+def apply_wikilink_rebuild(
+    session: Session,
+    old_version: int,
+    new_version: int,
+    page: NotePage,
+    removed_ids: list[str],
+    changed_links: list[Link],
+) -> None:
+    """
+    Update a cached index in place after a page's wikilinks were rebuilt.
+
+    The update is only applied to an index built at ``old_version``; any other
+    cached index is stale and is dropped, so it gets rebuilt on next use.
+
+    Args:
+        session: Database session
+        old_version: Graph version before the rebuild
+        new_version: Graph version after the rebuild
+        page: Page whose wikilinks were rebuilt
+        removed_ids: IDs of the page's deleted wikilinks
+        changed_links: The page's new or updated wikilinks
+    """
+    index = _index_cache.get(session, _INDEX_KEY, old_version)
+    if index is None or any(link.to_page_id not in index.page_scopes for link in changed_links):
+        _index_cache.discard(session, _INDEX_KEY)
+        return
+
+    index.page_scopes[page.id] = page.scope
+    for link_id in removed_ids:
+        if link_id in index.links:
+            index.remove_link(link_id)
+    for link in changed_links:
+        if link.id in index.links:
+            index.remove_link(link.id)
+        index.add_link(
+            link.id, IndexedLink(link.from_page_id, link.to_page_id, link.link_type, link.scope)
+        )
+    _index_cache.put(session, _INDEX_KEY, new_version, index)
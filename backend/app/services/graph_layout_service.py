@@ -0,0 +1,139 @@
+"""Precomputed graph layout service."""
+
+import zlib
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models import GraphNodePosition, Link, NotePage
+from app.repositories import LayoutRepository
+from app.services.graph_layout import FloatArray, IntArray, force_directed_layout
+from app.services.visibility import ViewMode
+
+# Simulation steps for a layout from scratch and for a warm-started relayout
+FULL_ITERATIONS = 150
+RELAX_ITERATIONS = 40
+
+
+def neighbor_signature(neighbor_ids: set[str]) -> int:
+    """Stable checksum of a node's neighbor set, used to detect changed nodes."""
+    return zlib.crc32("\n".join(sorted(neighbor_ids)).encode())
+
+
+class GraphLayoutService:
+    """Service computing and storing graph node positions per view mode."""
+
+    def __init__(self, session: Session) -> None:
+        """Initialize service with database session."""
+        self.session = session
+        self.layout_repo = LayoutRepository(session)
+
+    def get_positions(
+        self, pages: list[NotePage], links: list[Link], view_mode: ViewMode = "gm"
+    ) -> dict[str, tuple[float, float]]:
+        """
+        Get positions for the given (already visibility-filtered) graph.
+
+        Stored positions are reused as is when nothing changed. Nodes that are
+        new or whose neighbor set changed, plus their direct neighbors, are
+        relaxed from the previous positions while all other nodes stay fixed.
+        The whole graph is laid out from scratch only when nothing is stored.
+        Changes are flushed; the caller commits.
+
+        Args:
+            pages: Visible pages (graph nodes)
+            links: Visible links between those pages (graph edges)
+            view_mode: View mode the layout is stored for
+
+        Returns:
+            Mapping of page ID to (x, y)
+        """
+        index = {page.id: i for i, page in enumerate(pages)}
+        neighbors: list[set[str]] = [set() for _ in pages]
+        edge_pairs = []
+        for link in links:
+            a, b = index.get(link.from_page_id), index.get(link.to_page_id)
+            if a is None or b is None or a == b:
+                continue
+            neighbors[a].add(link.to_page_id)
+            neighbors[b].add(link.from_page_id)
+            edge_pairs.append((a, b))
+        edges = np.array(edge_pairs, dtype=np.int64).reshape(-1, 2)
+        signatures = [neighbor_signature(n) for n in neighbors]
+
+        stored = {p.page_id: p for p in self.layout_repo.list_for_view_mode(view_mode)}
+        self.layout_repo.delete_pages(view_mode, [pid for pid in stored if pid not in index])
+
+        dirty = [
+            i
+            for i, page in enumerate(pages)
+            if page.id not in stored or stored[page.id].signature != signatures[i]
+        ]
+        if not dirty:
+            return {pid: (stored[pid].x, stored[pid].y) for pid in index}
+
+        if not any(page.id in stored for page in pages):
+            positions = force_directed_layout(len(pages), edges, iterations=FULL_ITERATIONS)
+        else:
+            positions = self._relax(pages, neighbors, edges, stored, dirty, index)
+
+        changed = []
+        for i, page in enumerate(pages):
+            x, y = float(positions[i, 0]), float(positions[i, 1])
+            row = stored.get(page.id)
+            if row is None:
+                changed.append(
+                    GraphNodePosition(
+                        view_mode=view_mode, page_id=page.id, x=x, y=y, signature=signatures[i]
+                    )
+                )
+            elif (row.x, row.y, row.signature) != (x, y, signatures[i]):
+                row.x, row.y, row.signature = x, y, signatures[i]
+                changed.append(row)
+        self.layout_repo.save_all(changed)
+
+        return {
+            page.id: (float(positions[i, 0]), float(positions[i, 1]))
+            for i, page in enumerate(pages)
+        }
+
+    def _relax(
+        self,
+        pages: list[NotePage],
+        neighbors: list[set[str]],
+        edges: IntArray,
+        stored: dict[str, GraphNodePosition],
+        dirty: list[int],
+        index: dict[str, int],
+    ) -> FloatArray:
+        """Warm-start relayout moving only dirty nodes and their neighbors."""
+        positions = np.zeros((len(pages), 2))
+        placed = np.zeros(len(pages), dtype=bool)
+        for i, page in enumerate(pages):
+            if page.id in stored:
+                positions[i] = (stored[page.id].x, stored[page.id].y)
+                placed[i] = True
+
+        # Put new nodes next to their already placed neighbors
+        rng = np.random.default_rng(len(pages))
+        spread = float(np.abs(positions[placed]).max()) + 1.0
+        for node in np.flatnonzero(~placed):
+            anchors = [index[n] for n in neighbors[node] if placed[index[n]]]
+            if anchors:
+                positions[node] = positions[anchors].mean(axis=0) + rng.normal(0.0, 0.5, 2)
+            else:
+                positions[node] = rng.uniform(-spread, spread, 2)
+
+        movable = np.zeros(len(pages), dtype=bool)
+        for i in dirty:
+            movable[i] = True
+            movable[[index[n] for n in neighbors[i]]] = True
+
+        return force_directed_layout(
+            len(pages),
+            edges,
+            initial=positions,
+            movable=movable,
+            iterations=RELAX_ITERATIONS,
+            temperature=1.0,
+        )
@@ -1,12 +1,54 @@
 """Graph building and querying service."""
 
+from dataclasses import dataclass
+from typing import Literal
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models import Link, NotePage
 from app.repositories import LinkRepository, PageRepository
+from app.services import graph_index, versions
+from app.services.cache import VersionedCache
+from app.services.graph_analytics import GraphMetrics, compute_graph_metrics
 from app.services.visibility import ViewMode, VisibilityService
 
+NeighborhoodDirection = Literal["in", "out", "both"]
+
+
+@dataclass
+class Neighborhood:
+    """Subgraph around a page, with each node's distance from the center."""
+
+    pages: list[NotePage]
+    links: list[Link]
+    distances: dict[str, int]
+    truncated: bool
+
+
+@dataclass
+class PageNodeInfo:
+    """Lightweight page data for graph results (no markdown body)."""
+
+    id: str
+    title: str
+    entity_type: str | None
+    entity_id: str | None
+
+
+@dataclass
+class GraphAnalytics:
+    """Graph metrics for one view mode at one graph version."""
+
+    version: int
+    nodes: list[PageNodeInfo]
+    edge_count: int
+    metrics: GraphMetrics
+
+
+# Analytics per view mode, recomputed only after the graph version changes
+_analytics_cache: VersionedCache[GraphAnalytics] = VersionedCache()
+
 
 class GraphService:
     """Service for graph operations."""
@@ -62,3 +104,152 @@ class GraphService:
             List of pages that link to the target page
         """
         return self.link_repo.get_backlinks(page_id, view_mode)
+
+    def get_backlink_counts(
+        self, page_ids: list[str] | None = None, view_mode: ViewMode = "gm"
+    ) -> dict[str, int]:
+        """
+        Count the pages linking to each of many pages, in one grouped query.
+
+        Args:
+            page_ids: Target pages (all pages if None); hidden or unknown
+                pages are left out
+            view_mode: View mode filter for linking pages and targets
+
+        Returns:
+            Number of linking pages per visible target (0 included for
+            requested targets)
+        """
+        allowed_scopes = self.visibility.get_allowed_scopes(view_mode)
+        counts = self.link_repo.count_backlinks(allowed_scopes, page_ids)
+        if page_ids is None:
+            return counts
+        return {
+            page_id: counts.get(page_id, 0)
+            for page_id in self.page_repo.list_visible_ids(page_ids, allowed_scopes)
+        }
+
+    def get_backlink_lists(
+        self, page_ids: list[str], view_mode: ViewMode = "gm"
+    ) -> dict[str, list[tuple[str, str, str]]]:
+        """
+        Get the pages linking to each of many pages, in one query.
+
+        Args:
+            page_ids: Target pages; hidden or unknown pages are left out
+            view_mode: View mode filter for linking pages and targets
+
+        Returns:
+            (id, title, scope) of linking pages per visible target, by title
+        """
+        allowed_scopes = self.visibility.get_allowed_scopes(view_mode)
+        lists: dict[str, list[tuple[str, str, str]]] = {
+            page_id: [] for page_id in self.page_repo.list_visible_ids(page_ids, allowed_scopes)
+        }
+        for to_id, from_id, title, scope in self.link_repo.list_backlink_rows(
+            list(lists), allowed_scopes
+        ):
+            lists[to_id].append((from_id, title, scope))
+        return lists
+
+    def get_neighborhood(
+        self,
+        page_id: str,
+        depth: int = 2,
+        direction: NeighborhoodDirection = "both",
+        limit: int = 200,
+        view_mode: ViewMode = "gm",
+    ) -> Neighborhood | None:
+        """
+        Get the pages within ``depth`` hops of a page and the links between them.
+
+        Args:
+            page_id: ID of the center page
+            depth: Maximum number of hops from the center
+            direction: Follow outgoing links, incoming links, or both
+            limit: Maximum number of nodes (closest nodes are kept)
+            view_mode: View mode (gm or player)
+
+        Returns:
+            Neighborhood, or None if the center page is missing or hidden
+        """
+        page = self.page_repo.get_by_id(page_id)
+        if not page or not self.visibility.filter_scope(page.scope, view_mode):
+            return None
+
+        allowed_scopes = self.visibility.get_allowed_scopes(view_mode)
+        # Fetch one extra row to detect truncation
+        rows = self.link_repo.walk_neighborhood(
+            page_id, depth, direction, allowed_scopes, limit + 1
+        )
+        truncated = len(rows) > limit
+        distances = dict(rows[:limit])
+
+        pages = self.page_repo.list_by_ids(list(distances))
+        pages.sort(key=lambda p: (distances[p.id], p.title))
+        links = self.link_repo.list_between(list(distances), allowed_scopes)
+
+        return Neighborhood(pages=pages, links=links, distances=distances, truncated=truncated)
+
+    def get_analytics(self, view_mode: ViewMode = "gm") -> GraphAnalytics:
+        """
+        Get degree, PageRank and component metrics for the visible graph.
+
+        Results are cached per view mode and graph version, so they are only
+        recomputed after pages or links change.
+
+        Args:
+            view_mode: View mode (gm or player)
+
+        Returns:
+            GraphAnalytics for the current graph version
+        """
+        version = versions.get_version(self.session, versions.GRAPH)
+        cached = _analytics_cache.get(self.session, view_mode, version)
+        if cached is not None:
+            return cached
+
+        allowed_scopes = self.visibility.get_allowed_scopes(view_mode)
+        nodes = [PageNodeInfo(*row) for row in self.page_repo.list_node_rows(allowed_scopes)]
+        index = {node.id: i for i, node in enumerate(nodes)}
+        edges = [
+            (index[from_id], index[to_id])
+            for from_id, to_id in self.link_repo.list_visible_edges(allowed_scopes)
+        ]
+
+        analytics = GraphAnalytics(
+            version=version,
+            nodes=nodes,
+            edge_count=len(edges),
+            metrics=compute_graph_metrics(len(nodes), edges),
+        )
+        _analytics_cache.put(self.session, view_mode, version, analytics)
+        return analytics
+
+    def find_paths(
+        self,
+        from_id: str,
+        to_id: str,
+        k: int = 1,
+        directed: bool = False,
+        view_mode: ViewMode = "gm",
+    ) -> list[list[str]] | None:
+        """
+        Find up to k shortest paths between two pages through visible pages.
+
+        Args:
+            from_id: Start page ID
+            to_id: End page ID
+            k: Maximum number of paths
+            directed: Only follow links in their direction
+            view_mode: View mode (gm or player)
+
+        Returns:
+            Paths as lists of page IDs (empty if unconnected),
+            or None if either page is missing or hidden
+        """
+        index = graph_index.get_adjacency_index(self.session)
+        allowed_scopes = self.visibility.get_allowed_scopes(view_mode)
+        if any(index.page_scopes.get(pid) not in allowed_scopes for pid in (from_id, to_id)):
+            return None
+        return index.k_shortest_paths(from_id, to_id, allowed_scopes, k, directed)
@@ -0,0 +1,157 @@
+"""Keyset-paginated, projected list queries."""
+
+import base64
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Literal
+
+import orjson
+from sqlalchemy import ColumnElement, DateTime, and_, or_, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+SortOrder = Literal["asc", "desc"]
+
+
+@dataclass(frozen=True)
+class ListSpec:
+    """
+    How an entity is listed.
+
+    Only the columns of the requested fields are selected, so large text
+    columns (markdown bodies, notes) are never loaded unless asked for.
+    """
+
+    id_column: InstrumentedAttribute[str]
+    fields: dict[str, InstrumentedAttribute[Any]]  # API field name -> column
+    sort_keys: dict[str, InstrumentedAttribute[Any]]  # API sort key -> indexed column
+    default_sort: str
+    # Per-field conversion of stored values (e.g. JSON text -> list)
+    decoders: dict[str, Callable[[Any], Any]] = field(default_factory=dict)
+    # Response fields without a column (e.g. computed ones), added to full rows
+    defaults: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ListParams:
+    """Pagination, projection and sort parameters of a list request."""
+
+    fields: list[str] | None = None  # None selects every field
+    sort: str | None = None
+    order: SortOrder = "asc"
+    limit: int | None = None  # None returns all rows
+    cursor: str | None = None
+
+
+@dataclass
+class ListPage:
+    """One page of list results."""
+
+    items: list[dict[str, Any]]
+    next_cursor: str | None  # Pass as `cursor` to get the next page
+
+
+def decode_json_list(value: str | None) -> list[Any]:
+    """Decode a JSON array column (NULL -> empty list)."""
+    return orjson.loads(value) if value else []
+
+
+def decode_json_object(value: str | None) -> dict[str, Any] | None:
+    """Decode a JSON object column (NULL -> None)."""
+    return orjson.loads(value) if value else None
+
+
+def list_rows(
+    session: Session,
+    spec: ListSpec,
+    params: ListParams,
+    conditions: Sequence[ColumnElement[bool]] = (),
+) -> ListPage:
+    """
+    Run a keyset-paginated, projected list query.
+
+    Rows are ordered by (sort column, id); the cursor holds the last row's
+    pair, so each page is an index range scan rather than an OFFSET.
+
+    Args:
+        session: Database session
+        spec: List spec of the entity
+        params: Requested fields, sort, page size and cursor
+        conditions: Filters to apply (visibility, query filters)
+
+    Returns:
+        ListPage with one dict per row, holding the requested fields
+
+    Raises:
+        ValueError: If a field or sort key is unknown or the cursor is invalid
+    """
+    names = list(spec.fields) if params.fields is None else ["id", *params.fields]
+    unknown = [name for name in names if name not in spec.fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    names = list(dict.fromkeys(names))
+
+    sort = params.sort or spec.default_sort
+    sort_column = spec.sort_keys.get(sort)
+    if sort_column is None:
+        raise ValueError(f"Unknown sort key: {sort}")
+    paginated = params.limit is not None or params.cursor is not None
+
+    query = select(*(spec.fields[name] for name in names), sort_column).where(*conditions)
+    if paginated or params.sort is not None:
+        if params.order == "desc":
+            query = query.order_by(sort_column.desc(), spec.id_column.desc())
+        else:
+            query = query.order_by(sort_column.asc(), spec.id_column.asc())
+    if params.cursor is not None:
+        value, last_id = _decode_cursor(params.cursor, sort, params.order, sort_column)
+        # The plain bound lets SQLite seek the sort index instead of scanning to the page
+        if params.order == "desc":
+            after = or_(sort_column < value, and_(sort_column == value, spec.id_column < last_id))
+            query = query.where(sort_column <= value, after)
+        else:
+            after = or_(sort_column > value, and_(sort_column == value, spec.id_column > last_id))
+            query = query.where(sort_column >= value, after)
+    if params.limit is not None:
+        query = query.limit(params.limit + 1)
+
+    rows = session.execute(query).all()
+    next_cursor = None
+    if params.limit is not None and len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort, params.order, last[-1], last[names.index("id")])
+
+    # Resolve decoders once per query, not per row
+    decoders = [(name, spec.decoders[name]) for name in names if name in spec.decoders]
+    defaults = spec.defaults if params.fields is None else {}
+    items = []
+    for row in rows:
+        item = dict(zip(names, row, strict=False))
+        item.update(defaults)
+        for name, decode in decoders:
+            item[name] = decode(item[name])
+        items.append(item)
+    return ListPage(items=items, next_cursor=next_cursor)
+
+
+def _encode_cursor(sort: str, order: SortOrder, value: object, last_id: str) -> str:
+    key = value.isoformat() if isinstance(value, datetime) else value
+    raw = json.dumps([sort, order, key, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(
+    cursor: str, sort: str, order: SortOrder, sort_column: InstrumentedAttribute[Any]
+) -> tuple[Any, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_order, value, last_id = json.loads(raw)
+        if isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (cursor_sort, cursor_order) != (sort, order) or not isinstance(last_id, str):
+        raise ValueError("Cursor does not match the requested sort")
+    return value, last_id
@@ -6,6 +6,9 @@ from sqlalchemy.orm import Session
 
 from app.models import Link
 from app.repositories import LinkRepository, PageRepository, WorldRepository
+from app.services import graph_index, versions
+from app.services.graph_changes import GraphChangeLog
+from app.services.person_index import PersonIndex
 from app.services.wikilinks import extract_unique_titles
 
 
@@ -30,9 +33,6 @@ class PagesService:
         if not page:
             return
 
-        # Delete existing wikilinks from this page
-        self.link_repo.delete_wikilinks_from_page(page_id)
-
         # Parse new wikilinks
         referenced_titles = extract_unique_titles(page.body_markdown)
 
@@ -41,20 +41,63 @@ class PagesService:
         if not world:
             return
 
-        # Create Link entries for each referenced page
-        for title in referenced_titles:
-            # Find the target page by title
+        # Find the target page of each referenced title; titles without a page
+        # of that title resolve to the page of the person with that alias
+        target_ids: list[str] = []
+        unresolved: set[str] = set()
+        for title in sorted(referenced_titles):
             target_page = self.page_repo.get_by_title(title)
-            if target_page:
-                # Create link
-                link = Link(
-                    id=str(uuid.uuid4()),
-                    world_id=world.id,
-                    from_page_id=page_id,
-                    to_page_id=target_page.id,
-                    link_type="wikilink",
-                    scope=page.scope,  # Inherit scope from source page
-                )
-                self.link_repo.create(link)
+            if target_page is None:
+                unresolved.add(title)
+            elif target_page.id not in target_ids:
+                target_ids.append(target_page.id)
+        if unresolved:
+            person_index = PersonIndex(self.session)
+            person_index.ensure_built()
+            for target_id in person_index.resolve_alias_pages(unresolved).values():
+                if target_id not in target_ids:
+                    target_ids.append(target_id)
+
+        # Diff against existing wikilinks, so unchanged links keep their IDs
+        # and only real changes reach the graph index and change log
+        change_log = GraphChangeLog(self.session)
+        kept: dict[str, Link] = {}
+        removed_ids = []
+        for link in self.link_repo.list_wikilinks_from_page(page_id):
+            if link.to_page_id in target_ids and link.to_page_id not in kept:
+                kept[link.to_page_id] = link
+            else:
+                change_log.record_link("delete", link)
+                removed_ids.append(link.id)
+                self.link_repo.delete(link)
+
+        changed_links = []
+        for link in kept.values():
+            if link.scope != page.scope:
+                previous = change_log.effective_link_scope(link)
+                link.scope = page.scope  # Inherit scope from source page
+                change_log.record_link("update", link, prev_scope=previous)
+                changed_links.append(link)
+
+        for target_id in target_ids:
+            if target_id in kept:
+                continue
+            link = Link(
+                id=str(uuid.uuid4()),
+                world_id=world.id,
+                from_page_id=page_id,
+                to_page_id=target_id,
+                link_type="wikilink",
+                scope=page.scope,  # Inherit scope from source page
+            )
+            self.link_repo.create(link)
+            change_log.record_link("insert", link)
+            changed_links.append(link)
+
+        old_version = versions.get_version(self.session, versions.GRAPH)
+        new_version = change_log.bump()
+        graph_index.apply_wikilink_rebuild(
+            self.session, old_version, new_version, page, removed_ids, changed_links
+        )
 
         # Note: We don't commit here - let the caller manage transaction
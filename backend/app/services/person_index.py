@@ -0,0 +1,123 @@
+"""Indexed person aliases and tags, for filtering and alias resolution."""
+
+from sqlalchemy import ColumnElement, Select, delete, func, insert, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.models import NotePage, Person, PersonAlias, PersonTag
+
+
+class PersonIndex:
+    """
+    Maintains person_aliases and person_tags alongside the JSON columns
+    Person.aliases and Person.tags.
+
+    Writes update both tables in the caller's transaction; the caller
+    commits.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize index with database session."""
+        self.session = session
+
+    def ensure_built(self) -> bool:
+        """
+        Rebuild the index if it is missing people.
+
+        People written before the index existed (older projects, direct
+        inserts) have no alias or tag rows; they are picked up here.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        stale = any(
+            self.session.scalar(select(func.count()).where(_has_items(column)))
+            != self.session.scalar(select(func.count(func.distinct(table.person_id))))
+            for column, table in ((Person.aliases, PersonAlias), (Person.tags, PersonTag))
+        )
+        if stale:
+            self.rebuild()
+        return stale
+
+    def rebuild(self) -> None:
+        """Rebuild both tables from the JSON columns."""
+        for column, table, name in (
+            (Person.aliases, PersonAlias, "alias"),
+            (Person.tags, PersonTag, "tag"),
+        ):
+            self.session.execute(delete(table))
+            items = func.json_each(column).table_valued("value")
+            self.session.execute(
+                insert(table).from_select(
+                    ["person_id", name],
+                    select(Person.id, items.c.value)
+                    .select_from(Person)
+                    .join(items, items.c.value.is_not(None))
+                    .where(_has_items(column))
+                    .distinct(),
+                )
+            )
+        self.session.flush()
+
+    def set_terms(
+        self, person_id: str, aliases: list[str] | None = None, tags: list[str] | None = None
+    ) -> None:
+        """
+        Replace a person's indexed aliases and/or tags.
+
+        Args:
+            person_id: ID of the person (flushed)
+            aliases: New aliases; None leaves them unchanged
+            tags: New tags; None leaves them unchanged
+        """
+        if aliases is not None:
+            self.session.execute(delete(PersonAlias).where(PersonAlias.person_id == person_id))
+            self.session.add_all(
+                PersonAlias(person_id=person_id, alias=alias) for alias in dict.fromkeys(aliases)
+            )
+        if tags is not None:
+            self.session.execute(delete(PersonTag).where(PersonTag.person_id == person_id))
+            self.session.add_all(
+                PersonTag(person_id=person_id, tag=tag) for tag in dict.fromkeys(tags)
+            )
+        self.session.flush()
+
+    def remove_person(self, person_id: str) -> None:
+        """Remove a person from the index."""
+        self.set_terms(person_id, aliases=[], tags=[])
+
+    def with_tag(self, tag: str) -> Select[str]:
+        """Build a query of the IDs of people with a tag (usable as an IN subquery)."""
+        return select(PersonTag.person_id).where(PersonTag.tag == tag)
+
+    def with_alias(self, alias: str) -> Select[str]:
+        """Build a query of the IDs of people with an alias (usable as an IN subquery)."""
+        return select(PersonAlias.person_id).where(PersonAlias.alias == alias)
+
+    def resolve_alias_pages(self, titles: set[str]) -> dict[str, str]:
+        """
+        Resolve wikilink titles through person aliases.
+
+        Args:
+            titles: Wikilink titles with no page of that title
+
+        Returns:
+            Page ID per resolvable title: the page of the person with that
+            alias (the first by page title if several match)
+        """
+        if not titles:
+            return {}
+        rows = self.session.execute(
+            select(PersonAlias.alias, NotePage.id)
+            .join(
+                NotePage,
+                (NotePage.entity_type == "person") & (NotePage.entity_id == PersonAlias.person_id),
+            )
+            .where(PersonAlias.alias.in_(titles))
+            .order_by(NotePage.title.desc(), NotePage.id.desc())
+        ).all()
+        # Rows come last-first, so the first page per alias is written last
+        return dict(rows)
+
+
+def _has_items(column: InstrumentedAttribute[str | None]) -> ColumnElement[bool]:
+    return func.coalesce(func.json_array_length(column), 0) > 0
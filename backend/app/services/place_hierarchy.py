@@ -0,0 +1,205 @@
+"""Place hierarchy kept as a closure table, for one-query ancestor/descendant reads."""
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Place, PlaceClosure
+
+
+class PlaceHierarchyService:
+    """
+    Maintains the place_closure table alongside Place.parent_place_id.
+
+    The closure holds one row per (ancestor, descendant) pair, including a
+    depth-0 row for each place itself. Writes update it in the caller's
+    transaction; the caller commits.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize service with database session."""
+        self.session = session
+
+    def ensure_built(self, place_id: str | None = None) -> bool:
+        """
+        Rebuild the closure if it is missing places.
+
+        Places written before the closure existed (older projects, direct
+        inserts) have no depth-0 row; they are picked up here. Reads pass the
+        place they start from, which makes the check a primary key lookup.
+
+        Args:
+            place_id: Place that must be in the closure; None checks them all
+
+        Returns:
+            True if the closure was rebuilt
+        """
+        if place_id is not None:
+            stale = self.session.get(PlaceClosure, (place_id, place_id)) is None
+        else:
+            place_count = self.session.scalar(select(func.count()).select_from(Place)) or 0
+            self_count = self.session.scalar(
+                select(func.count()).select_from(PlaceClosure).where(PlaceClosure.depth == 0)
+            )
+            stale = place_count != self_count
+        if stale:
+            self.rebuild()
+        return stale
+
+    def rebuild(self) -> None:
+        """Rebuild the whole closure from parent_place_id."""
+        self.session.execute(delete(PlaceClosure))
+
+        tree = select(
+            Place.id.label("ancestor_id"),
+            Place.id.label("descendant_id"),
+            literal(0).label("depth"),
+        ).cte("tree", recursive=True)
+        child = aliased(Place)
+        # The depth bound stops the recursion on parent cycles in legacy data
+        max_depth = select(func.count()).select_from(Place).scalar_subquery()
+        tree = tree.union_all(
+            select(tree.c.ancestor_id, child.id, tree.c.depth + 1)
+            .join(child, child.parent_place_id == tree.c.descendant_id)
+            .where(tree.c.depth < max_depth)
+        )
+        self.session.execute(
+            insert(PlaceClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(tree.c.ancestor_id, tree.c.descendant_id, func.min(tree.c.depth)).group_by(
+                    tree.c.ancestor_id, tree.c.descendant_id
+                ),
+            )
+        )
+        self.session.flush()
+
+    def add_place(self, place_id: str, parent_id: str | None) -> None:
+        """
+        Add a new leaf place to the closure.
+
+        Args:
+            place_id: ID of the new place (flushed)
+            parent_id: ID of its parent place, if any
+        """
+        self.session.add(PlaceClosure(ancestor_id=place_id, descendant_id=place_id, depth=0))
+        if parent_id is not None:
+            self.session.execute(
+                insert(PlaceClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(
+                        PlaceClosure.ancestor_id, literal(place_id), PlaceClosure.depth + 1
+                    ).where(PlaceClosure.descendant_id == parent_id),
+                )
+            )
+        self.session.flush()
+
+    def would_create_cycle(self, place_id: str, new_parent_id: str) -> bool:
+        """Check whether moving a place under new_parent_id would create a cycle."""
+        return (
+            self.session.get(PlaceClosure, (place_id, new_parent_id)) is not None
+            or place_id == new_parent_id
+        )
+
+    def move_place(self, place_id: str, new_parent_id: str | None) -> None:
+        """
+        Move a place, with its whole subtree, under a new parent.
+
+        Args:
+            place_id: ID of the place to move
+            new_parent_id: ID of the new parent, or None to make it a root
+
+        Raises:
+            ValueError: If the new parent is the place itself or one of its
+                descendants
+        """
+        if new_parent_id is not None and self.would_create_cycle(place_id, new_parent_id):
+            raise ValueError("Place cannot be moved under itself or one of its descendants")
+
+        subtree = select(PlaceClosure.descendant_id).where(PlaceClosure.ancestor_id == place_id)
+        # Unlink the subtree from the place's current ancestors
+        self.session.execute(
+            delete(PlaceClosure).where(
+                PlaceClosure.descendant_id.in_(subtree),
+                PlaceClosure.ancestor_id.not_in(subtree),
+            )
+        )
+        if new_parent_id is not None:
+            # Link every new ancestor to every subtree member
+            above = aliased(PlaceClosure)
+            below = aliased(PlaceClosure)
+            self.session.execute(
+                insert(PlaceClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                    .join(below, below.ancestor_id == place_id)
+                    .where(above.descendant_id == new_parent_id),
+                )
+            )
+        self.session.flush()
+
+    def remove_place(self, place_id: str) -> None:
+        """
+        Remove a place from the closure; its children become roots.
+
+        Args:
+            place_id: ID of the place being deleted
+        """
+        self.move_place(place_id, None)
+        self.session.execute(
+            delete(PlaceClosure).where(
+                (PlaceClosure.ancestor_id == place_id) | (PlaceClosure.descendant_id == place_id)
+            )
+        )
+        self.session.flush()
+
+    def get_descendants(
+        self, place_id: str, allowed_scopes: tuple[str, ...], max_depth: int | None = None
+    ) -> list[tuple[Place, int]]:
+        """
+        Get the visible descendants of a place, nearest first.
+
+        Args:
+            place_id: ID of the place
+            allowed_scopes: Scopes visible in the view mode
+            max_depth: Deepest level to return (1 = children only)
+
+        Returns:
+            List of (place, depth) tuples
+        """
+        query = (
+            select(Place, PlaceClosure.depth)
+            .join(PlaceClosure, PlaceClosure.descendant_id == Place.id)
+            .where(
+                PlaceClosure.ancestor_id == place_id,
+                PlaceClosure.depth > 0,
+                Place.scope.in_(allowed_scopes),
+            )
+            .order_by(PlaceClosure.depth, Place.name)
+        )
+        if max_depth is not None:
+            query = query.where(PlaceClosure.depth <= max_depth)
+        return [(place, depth) for place, depth in self.session.execute(query).all()]
+
+    def get_ancestors(
+        self, place_id: str, allowed_scopes: tuple[str, ...]
+    ) -> list[tuple[Place, int]]:
+        """
+        Get the visible ancestors of a place, parent first.
+
+        Args:
+            place_id: ID of the place
+            allowed_scopes: Scopes visible in the view mode
+
+        Returns:
+            List of (place, depth) tuples
+        """
+        query = (
+            select(Place, PlaceClosure.depth)
+            .join(PlaceClosure, PlaceClosure.ancestor_id == Place.id)
+            .where(
+                PlaceClosure.descendant_id == place_id,
+                PlaceClosure.depth > 0,
+                Place.scope.in_(allowed_scopes),
+            )
+            .order_by(PlaceClosure.depth)
+        )
+        return [(place, depth) for place, depth in self.session.execute(query).all()]
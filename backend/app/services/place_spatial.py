@@ -0,0 +1,180 @@
+"""Spatial index of place positions (SQLite R*Tree), for viewport and nearest queries."""
+
+import math
+
+from sqlalchemy import ColumnElement, Select, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Place, PlacePosition, place_rtree
+
+# Half-size of the first search box of a nearest-neighbor query, in map units
+_INITIAL_RADIUS = 64.0
+
+
+class PlaceSpatialIndex:
+    """
+    Maintains place_positions and place_rtree alongside Place.position.
+
+    Writes update both tables in the caller's transaction; the caller
+    commits.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize index with database session."""
+        self.session = session
+
+    def ensure_built(self) -> bool:
+        """
+        Rebuild the index if it is missing places.
+
+        Places written before the index existed (older projects, direct
+        inserts) have no position row; they are picked up here.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        place_count = self.session.scalar(
+            select(func.count()).select_from(Place).where(*_has_position())
+        )
+        indexed_count = self.session.scalar(select(func.count()).select_from(PlacePosition))
+        stale = place_count != indexed_count
+        if stale:
+            self.rebuild()
+        return stale
+
+    def rebuild(self) -> None:
+        """Rebuild the whole index from Place.position."""
+        self.session.execute(delete(place_rtree))
+        self.session.execute(delete(PlacePosition))
+        self.session.execute(
+            insert(PlacePosition).from_select(
+                ["place_id", "x", "y"],
+                select(
+                    Place.id,
+                    func.json_extract(Place.position, "$.x"),
+                    func.json_extract(Place.position, "$.y"),
+                ).where(*_has_position()),
+            )
+        )
+        self.session.execute(
+            insert(place_rtree).from_select(
+                ["id", "min_x", "max_x", "min_y", "max_y"],
+                select(
+                    PlacePosition.id,
+                    PlacePosition.x,
+                    PlacePosition.x,
+                    PlacePosition.y,
+                    PlacePosition.y,
+                ),
+            )
+        )
+        self.session.flush()
+
+    def set_position(self, place_id: str, position: dict[str, float] | None) -> None:
+        """
+        Index a place's new position.
+
+        Args:
+            place_id: ID of the place
+            position: New {x, y} position; None (or no x/y) removes the place
+                from the index
+        """
+        self.remove_place(place_id)
+        if position is not None and "x" in position and "y" in position:
+            self._insert(place_id, position)
+        self.session.flush()
+
+    def remove_place(self, place_id: str) -> None:
+        """Remove a place from the index."""
+        row = self.session.scalar(select(PlacePosition).where(PlacePosition.place_id == place_id))
+        if row is None:
+            return
+        self.session.execute(delete(place_rtree).where(place_rtree.c.id == row.id))
+        self.session.delete(row)
+        self.session.flush()
+
+    def within_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Select[str]:
+        """
+        Build a query of the IDs of places inside a bounding box (inclusive).
+
+        The R*Tree narrows the candidates; exact bounds are checked against
+        the stored coordinates.
+
+        Returns:
+            Select of place IDs, usable as an IN subquery
+        """
+        return (
+            select(PlacePosition.place_id)
+            .join(place_rtree, place_rtree.c.id == PlacePosition.id)
+            .where(
+                place_rtree.c.max_x >= min_x,
+                place_rtree.c.min_x <= max_x,
+                place_rtree.c.max_y >= min_y,
+                place_rtree.c.min_y <= max_y,
+                PlacePosition.x.between(min_x, max_x),
+                PlacePosition.y.between(min_y, max_y),
+            )
+        )
+
+    def nearest(
+        self, x: float, y: float, k: int, allowed_scopes: tuple[str, ...]
+    ) -> list[tuple[Place, float]]:
+        """
+        Get the k visible places nearest to a point.
+
+        Searches a box around the point and doubles it until it holds k
+        places within its inscribed circle (or every visible place), so only
+        places near the point are read.
+
+        Args:
+            x: X coordinate of the point
+            y: Y coordinate of the point
+            k: Number of places to return
+            allowed_scopes: Scopes visible in the view mode
+
+        Returns:
+            List of (place, distance) tuples, nearest first
+        """
+        total = self.session.scalar(
+            select(func.count())
+            .select_from(PlacePosition)
+            .join(Place, Place.id == PlacePosition.place_id)
+            .where(Place.scope.in_(allowed_scopes))
+        )
+        if not total:
+            return []
+
+        radius = _INITIAL_RADIUS
+        while True:
+            rows = self.session.execute(
+                select(Place, PlacePosition.x, PlacePosition.y)
+                .join(PlacePosition, PlacePosition.place_id == Place.id)
+                .where(
+                    Place.id.in_(self.within_bbox(x - radius, y - radius, x + radius, y + radius)),
+                    Place.scope.in_(allowed_scopes),
+                )
+            ).all()
+            found = sorted(
+                ((place, math.hypot(px - x, py - y)) for place, px, py in rows),
+                key=lambda item: (item[1], item[0].name),
+            )
+            # Places in the box corners may be farther than unseen ones outside it
+            if len(rows) >= total or sum(1 for _, d in found if d <= radius) >= k:
+                return found[:k]
+            radius *= 2
+
+    def _insert(self, place_id: str, position: dict[str, float]) -> None:
+        x, y = float(position["x"]), float(position["y"])
+        row = PlacePosition(place_id=place_id, x=x, y=y)
+        self.session.add(row)
+        self.session.flush()
+        self.session.execute(
+            insert(place_rtree).values(id=row.id, min_x=x, max_x=x, min_y=y, max_y=y)
+        )
+
+
+def _has_position() -> tuple[ColumnElement[bool], ...]:
+    return (
+        func.json_extract(Place.position, "$.x").is_not(None),
+        func.json_extract(Place.position, "$.y").is_not(None),
+    )
@@ -0,0 +1,56 @@
+"""Materialized list projections per view mode, rebuilt once per write."""
+
+from collections.abc import Callable
+from typing import Literal
+
+from sqlalchemy.orm import Session
+
+from app.services import versions
+from app.services.cache import VersionedCache
+from app.services.visibility import ViewMode
+
+ProjectionType = Literal["factions", "people", "places", "pages"]
+
+# Version counter that invalidates each projection
+PROJECTION_VERSIONS: dict[ProjectionType, str] = {
+    "factions": versions.FACTIONS,
+    "people": versions.PEOPLE,
+    "places": versions.PLACES,
+    "pages": versions.GRAPH,  # Bumped by every page write
+}
+
+# Encoded list response per (entity type, view mode)
+_projection_cache: VersionedCache[bytes] = VersionedCache()
+
+
+def get_projection(
+    session: Session,
+    entity_type: ProjectionType,
+    view_mode: ViewMode,
+    build: Callable[[], bytes],
+) -> bytes:
+    """
+    Get the encoded full list of an entity type as seen in a view mode.
+
+    The projection is built on the first read after a write to that entity
+    type and then served as is: a read costs one version lookup instead of
+    the list query, visibility filtering and encoding.
+
+    Args:
+        session: Database session
+        entity_type: Entity type of the list
+        view_mode: View mode (gm or player)
+        build: Builds the encoded list (called on a cache miss)
+
+    Returns:
+        Encoded JSON list body
+    """
+    # Read the version before building, so a concurrent write can only make
+    # the stored body newer than its version, never older
+    version = versions.get_version(session, PROJECTION_VERSIONS[entity_type])
+    key = (entity_type, view_mode)
+    body = _projection_cache.get(session, key, version)
+    if body is None:
+        body = build()
+        _projection_cache.put(session, key, version, body)
+    return body
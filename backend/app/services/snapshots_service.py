@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.models import MapAsset, Snapshot, TerritoryTile
 from app.repositories import SnapshotRepository
+from app.services.entity_versions import EntityVersionService
 
 
 class SnapshotsService:
@@ -155,4 +156,7 @@ class SnapshotsService:
                 # This is the last snapshot, delete the active record
                 self.snapshot_repo.delete_active()
 
+        # Attribute changes recorded in the snapshot go with it; the changes
+        # before them then last until the next ones
+        EntityVersionService(self.session).remove_snapshot(snapshot_id)
         self.snapshot_repo.delete(snapshot)
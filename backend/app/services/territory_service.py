@@ -0,0 +1,121 @@
+"""Territory control lookups: which factions painted the map at a given point."""
+
+import io
+import math
+from collections import defaultdict
+from collections.abc import Mapping
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image, UnidentifiedImageError
+from sqlalchemy.orm import Session
+
+from app.repositories import TileRepository
+from app.services import versions
+from app.services.cache import VersionedCache
+
+# Tile edge in map units at the zoom level the territory editor paints at
+TILE_SIZE = 256
+MASK_ZOOM = 0
+
+Mask = npt.NDArray[np.bool_]
+TileKey = tuple[int, int]
+
+# Decoded masks per (snapshot, tile x, tile y): (faction ID, mask) for every
+# faction that painted the tile, empty if none did
+_mask_cache: VersionedCache[list[tuple[str, Mask]]] = VersionedCache()
+
+
+def decode_mask(data: bytes) -> Mask | None:
+    """
+    Decode a tile image into a painted/unpainted mask.
+
+    A pixel is painted if it is not fully transparent (images without an
+    alpha channel: if it is not black).
+
+    Args:
+        data: PNG/WebP tile image
+
+    Returns:
+        Boolean array of shape (height, width), or None if the data is not
+        a readable image
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if "A" in image.getbands():
+                channel = image.getchannel("A")
+            else:
+                channel = image.convert("L")
+            return np.asarray(channel) > 0
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+
+
+class TerritoryService:
+    """Service answering point-in-territory queries against tile masks."""
+
+    def __init__(self, session: Session) -> None:
+        """Initialize service with database session."""
+        self.session = session
+        self.tile_repo = TileRepository(session)
+
+    def get_controlling_factions(
+        self, snapshot_id: str, points: Mapping[str, tuple[float, float]]
+    ) -> dict[str, list[str]]:
+        """
+        Get the factions whose painted territory covers each point.
+
+        Points are grouped by tile, so each tile is loaded and decoded once
+        per query however many points fall in it, and decoded masks are
+        reused by later queries until the territory changes.
+
+        Args:
+            snapshot_id: Snapshot whose territory to sample
+            points: Map position per point ID (e.g. place ID)
+
+        Returns:
+            Faction IDs (sorted) per point ID; empty if no faction covers it
+        """
+        by_tile: dict[TileKey, list[tuple[str, int, int]]] = defaultdict(list)
+        for point_id, (x, y) in points.items():
+            tile_x, tile_y = math.floor(x / TILE_SIZE), math.floor(y / TILE_SIZE)
+            pixel_x = math.floor(x - tile_x * TILE_SIZE)
+            pixel_y = math.floor(y - tile_y * TILE_SIZE)
+            by_tile[(tile_x, tile_y)].append((point_id, pixel_x, pixel_y))
+
+        masks = self._get_masks(snapshot_id, list(by_tile))
+        result: dict[str, list[str]] = {}
+        for key, tile_points in by_tile.items():
+            for point_id, pixel_x, pixel_y in tile_points:
+                result[point_id] = [
+                    faction_id
+                    for faction_id, mask in masks[key]
+                    if pixel_y < mask.shape[0]
+                    and pixel_x < mask.shape[1]
+                    and mask[pixel_y, pixel_x]
+                ]
+        return result
+
+    def _get_masks(
+        self, snapshot_id: str, keys: list[TileKey]
+    ) -> dict[TileKey, list[tuple[str, Mask]]]:
+        version = versions.get_version(self.session, versions.TERRITORY)
+        masks: dict[TileKey, list[tuple[str, Mask]]] = {}
+        missing = []
+        for key in keys:
+            cached = _mask_cache.get(self.session, (snapshot_id, *key), version)
+            if cached is None:
+                missing.append(key)
+            else:
+                masks[key] = cached
+
+        if missing:
+            decoded: dict[TileKey, list[tuple[str, Mask]]] = defaultdict(list)
+            for tile in self.tile_repo.list_tiles_at(snapshot_id, MASK_ZOOM, missing):
+                mask = decode_mask(tile.tile_data)
+                if mask is not None:
+                    decoded[(tile.x, tile.y)].append((tile.faction_id, mask))
+            for key in missing:
+                masks[key] = sorted(decoded.get(key, []), key=lambda item: item[0])
+                _mask_cache.put(self.session, (snapshot_id, *key), version, masks[key])
+        return masks
@@ -0,0 +1,249 @@
+"""Write-behind queue coalescing territory tile writes, with a crash journal."""
+
+import logging
+import os
+import struct
+import threading
+import weakref
+from collections import defaultdict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from app.services import versions
+from app.services.tiles_service import TileData, TilesService
+
+logger = logging.getLogger(__name__)
+
+TileKey = tuple[str, str, int, int, int]  # (snapshot ID, faction ID, z, x, y)
+
+# A flush is started once this many distinct tiles are pending...
+MAX_PENDING = 256
+# ...or this many seconds after the first write since the last flush
+MAX_DELAY = 0.5
+
+# Journal record: snapshot ID length, faction ID length, z, x, y, data length
+# (all big-endian), then the snapshot ID, faction ID (UTF-8) and tile data
+_RECORD_HEADER = struct.Struct(">HHiiiI")
+
+
+def _encode_record(key: TileKey, data: bytes) -> bytes:
+    snapshot_id, faction_id, z, x, y = key
+    snapshot = snapshot_id.encode()
+    faction = faction_id.encode()
+    header = _RECORD_HEADER.pack(len(snapshot), len(faction), z, x, y, len(data))
+    return header + snapshot + faction + data
+
+
+def _decode_records(journal: bytes) -> dict[TileKey, bytes]:
+    """Read journal records in order, the latest per tile winning. A torn last record is skipped."""
+    tiles: dict[TileKey, bytes] = {}
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(journal):
+        snapshot_len, faction_len, z, x, y, data_len = _RECORD_HEADER.unpack_from(journal, offset)
+        start = offset + _RECORD_HEADER.size
+        end = start + snapshot_len + faction_len + data_len
+        if end > len(journal):
+            break
+        snapshot_id = journal[start : start + snapshot_len].decode()
+        faction_id = journal[start + snapshot_len : start + snapshot_len + faction_len].decode()
+        tiles[(snapshot_id, faction_id, z, x, y)] = journal[end - data_len : end]
+        offset = end
+    return tiles
+
+
+class TileWriteQueue:
+    """
+    Buffer of tile writes for one database, flushed in a single transaction.
+
+    Only the latest payload per (snapshot, faction, z, x, y) is kept, so
+    repeated strokes over the same tile between two flushes cost one row
+    write. Flushes run on a timer thread with their own session, so writers
+    never wait for the database. Until a tile is written, get() serves it
+    from the buffer.
+
+    Queued writes are appended (and fsynced) to a journal next to a
+    file database before they are acknowledged; the journal is rewritten
+    to the still pending writes after each flush and replayed when the
+    queue is created, so a crash loses no acknowledged tile.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_pending: int = MAX_PENDING,
+        max_delay: float = MAX_DELAY,
+        journal_path: Path | None = None,
+    ) -> None:
+        """Initialize a queue writing to the given engine, replaying its journal if any."""
+        # Weak, so the queue does not keep a disposed database alive
+        self._engine = weakref.ref(engine)
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self._pending: dict[TileKey, bytes] = {}
+        self._flushing: dict[TileKey, bytes] = {}  # Batch being written, still readable
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._journal: BinaryIO | None = None
+        if journal_path is not None:
+            if journal_path.exists():
+                self._pending = _decode_records(journal_path.read_bytes())
+            self._journal = journal_path.open("ab")
+            if self._pending:
+                logger.info("Replaying %d journaled territory tiles", len(self._pending))
+                self._rewrite_journal()  # Drop a torn record before appending after it
+                self._schedule(0)
+
+    def put(self, snapshot_id: str, faction_id: str, z: int, x: int, y: int, data: bytes) -> None:
+        """Queue a tile write, replacing any pending write of the same tile."""
+        self.put_many([((snapshot_id, faction_id, z, x, y), data)])
+
+    def put_many(self, tiles: Iterable[tuple[TileKey, bytes]]) -> None:
+        """Queue tile writes in order; they are journaled together."""
+        tiles = list(tiles)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.write(b"".join(_encode_record(key, data) for key, data in tiles))
+                self._sync_journal()
+            self._pending.update(tiles)
+            full = len(self._pending) >= self.max_pending
+            if self._timer is None or full:
+                # The flush always runs on the timer thread, never on the writer's
+                self._schedule(0 if full else self.max_delay)
+
+    def get(self, snapshot_id: str, faction_id: str, z: int, x: int, y: int) -> bytes | None:
+        """Get a queued or being written tile's data, None if the database is up to date."""
+        key = (snapshot_id, faction_id, z, x, y)
+        with self._lock:
+            data = self._pending.get(key)
+            return data if data is not None else self._flushing.get(key)
+
+    def discard(self, snapshot_id: str | None = None, faction_id: str | None = None) -> None:
+        """
+        Drop the pending writes of a snapshot and/or faction whose tiles are deleted.
+
+        Waits for a running flush, so none of the dropped writes lands after
+        the caller's delete.
+        """
+        with self._flush_lock, self._lock:
+            for key in [
+                key
+                for key in self._pending
+                if (snapshot_id is None or key[0] == snapshot_id)
+                and (faction_id is None or key[1] == faction_id)
+            ]:
+                del self._pending[key]
+            self._rewrite_journal()
+
+    def flush(self) -> int:
+        """
+        Write all pending tiles in one transaction.
+
+        If the write fails, the tiles go back to the queue (unless newer
+        writes replaced them meanwhile) for the next flush.
+
+        Returns:
+            Number of tiles written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._pending = self._pending, {}
+                self._flushing = batch
+            if not batch:
+                return 0
+
+            by_layer: dict[tuple[str, str], list[TileData]] = defaultdict(list)
+            for (snapshot_id, faction_id, z, x, y), data in batch.items():
+                by_layer[(snapshot_id, faction_id)].append(TileData(z, x, y, data))
+            engine = self._engine()
+            if engine is None:
+                self._flushing = {}
+                return 0
+            try:
+                with Session(engine) as session:
+                    tiles_service = TilesService(session)
+                    for (snapshot_id, faction_id), tiles in by_layer.items():
+                        tiles_service.upload_tiles_batch(snapshot_id, faction_id, tiles)
+                    versions.bump_version(session, versions.TERRITORY)
+                    session.commit()
+            except Exception:
+                logger.exception("Failed to write %d territory tiles", len(batch))
+                with self._lock:
+                    self._pending = {**batch, **self._pending}
+                    self._flushing = {}
+                return 0
+            with self._lock:
+                self._flushing = {}
+                self._rewrite_journal()
+            return len(batch)
+
+    def _schedule(self, delay: float) -> None:
+        """(Re)arm the flush timer. Called with the lock held."""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _rewrite_journal(self) -> None:
+        """Replace the journal with the pending writes. Called with the lock held."""
+        if self._journal is None:
+            return
+        self._journal.truncate(0)
+        self._journal.write(
+            b"".join(_encode_record(key, data) for key, data in self._pending.items())
+        )
+        self._sync_journal()
+
+    def _sync_journal(self) -> None:
+        assert self._journal is not None
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+
+# One queue per database engine, like the versioned caches
+_queues: "weakref.WeakKeyDictionary[Engine, TileWriteQueue]" = weakref.WeakKeyDictionary()
+_queues_lock = threading.Lock()
+
+
+def get_tile_write_queue(session: Session) -> TileWriteQueue:
+    """Get the tile write queue of the session's database."""
+    bind = session.get_bind()
+    return get_engine_tile_write_queue(bind if isinstance(bind, Engine) else bind.engine)
+
+
+def get_engine_tile_write_queue(engine: Engine) -> TileWriteQueue:
+    """
+    Get the tile write queue of a database.
+
+    Creating it replays the writes journaled before a crash, so call this on
+    startup to get them written right away.
+    """
+    with _queues_lock:
+        queue = _queues.get(engine)
+        if queue is None:
+            queue = _queues[engine] = TileWriteQueue(engine, journal_path=_journal_path(engine))
+        return queue
+
+
+def _journal_path(engine: Engine) -> Path | None:
+    """Journal file beside a file database (like SQLite's own -journal), None in memory."""
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        return None
+    return Path(f"{database}-tiles")
+
+
+def flush_all_tile_queues() -> None:
+    """Write every pending tile, e.g. before the database file is copied or replaced."""
+    with _queues_lock:
+        queues = list(_queues.values())
+    for queue in queues:
+        queue.flush()
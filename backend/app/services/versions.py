@@ -0,0 +1,61 @@
+"""Data version counters used to invalidate derived data and caches."""
+
+from sqlalchemy.orm import Session
+
+from app.models import ProjectMeta
+
+# Bumped on every write that changes pages or links (the note graph)
+GRAPH = "graph"
+# Bumped on every write to factions, people or places
+ENTITIES = "entities"
+# Bumped on writes that change the faction, people or place lists respectively
+FACTIONS = "factions"
+PEOPLE = "people"
+PLACES = "places"
+# Bumped on every write that changes territory tiles
+TERRITORY = "territory"
+# Bumped on snapshot writes, active snapshot switches and base map changes
+SNAPSHOTS = "snapshots"
+
+
+def _key(name: str) -> str:
+    return f"version:{name}"
+
+
+def get_version(session: Session, name: str) -> int:
+    """
+    Get the current value of a version counter.
+
+    Args:
+        session: Database session
+        name: Counter name (e.g. GRAPH)
+
+    Returns:
+        Current version (0 if never bumped)
+    """
+    meta = session.get(ProjectMeta, _key(name))
+    return int(meta.value) if meta else 0
+
+
+def bump_version(session: Session, name: str) -> int:
+    """
+    Increment a version counter in the current transaction.
+
+    The caller commits, so the new version becomes visible together with the
+    write that caused it.
+
+    Args:
+        session: Database session
+        name: Counter name (e.g. GRAPH)
+
+    Returns:
+        The new version
+    """
+    meta = session.get(ProjectMeta, _key(name))
+    if meta is None:
+        meta = ProjectMeta(key=_key(name), value="0")
+        session.add(meta)
+    version = int(meta.value) + 1
+    meta.value = str(version)
+    session.flush()
+    return version
@@ -59,3 +59,23 @@ class VisibilityService:
         if view_mode == "gm":
             return ("public", "gm", "player")
         return ("public", "player")
+
+    @staticmethod
+    def most_restrictive(*scopes: str) -> str:
+        """
+        Get the most restrictive of several scopes (gm > player > public).
+
+        Used for derived data, e.g. an edge is only as visible as its least
+        visible endpoint.
+
+        Args:
+            scopes: Scope values (public|gm|player)
+
+        Returns:
+            The scope visible in the fewest view modes
+        """
+        if "gm" in scopes:
+            return "gm"
+        if "player" in scopes:
+            return "player"
+        return "public"
@@ -0,0 +1,147 @@
+"""Compact columnar encoding of graph responses (JSON arrays or MessagePack)."""
+
+from collections.abc import Iterable, Mapping
+from typing import Any, Literal
+
+import msgpack
+import orjson
+
+WireFormat = Literal["json", "compact", "msgpack"]
+
+COMPACT_JSON_MEDIA_TYPE = "application/vnd.blades.compact+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+COMPACT_FORMAT_VERSION = "compact/1"
+
+# Base enum tables; the code of a value is its index. Values missing here are
+# appended per response, so the tables sent with each payload are authoritative.
+NODE_TYPES = ("page", "faction", "person", "place", "event")
+LINK_TYPES = (
+    "wikilink",
+    "manual",
+    "reference",
+    "about",
+    "member_of",
+    "works_at",
+    "lives_at",
+    "part_of",
+    "owned_by",
+    "involves",
+)
+VISIBILITIES = ("public", "player", "gm")
+
+
+class _EnumTable:
+    """Maps enum values to small ints, extending the base table on demand."""
+
+    def __init__(self, values: tuple[str, ...]) -> None:
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(values)}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def compact_graph(
+    nodes: Iterable[tuple[str, str, str, str]],
+    edges: Iterable[tuple[str, str, str, str, str | None]],
+    positions: Mapping[str, tuple[float, float]] | None = None,
+    version: int | None = None,
+) -> dict[str, Any]:
+    """
+    Build the columnar form of a graph.
+
+    Node IDs are sent once, in ``nodes.id``; edges refer to nodes by their
+    index in that table. Enum fields are sent as codes into ``enums``.
+    Optional columns (``x``/``y``, ``role``) are only present when used.
+
+    Args:
+        nodes: (id, type, title, visibility) per node
+        edges: (from_id, to_id, link_type, visibility, role) per edge; both
+            ends must be among the nodes
+        positions: Layout position per node ID, if requested
+        version: Graph version to include, if any
+
+    Returns:
+        JSON/MessagePack-serializable dict of parallel arrays
+    """
+    types, link_types, visibilities = (
+        _EnumTable(NODE_TYPES),
+        _EnumTable(LINK_TYPES),
+        _EnumTable(VISIBILITIES),
+    )
+
+    ids: list[str] = []
+    node_types: list[int] = []
+    titles: list[str] = []
+    node_visibility: list[int] = []
+    for node_id, node_type, title, visibility in nodes:
+        ids.append(node_id)
+        node_types.append(types.code(node_type))
+        titles.append(title)
+        node_visibility.append(visibilities.code(visibility))
+    index = {node_id: i for i, node_id in enumerate(ids)}
+
+    from_ids: list[int] = []
+    to_ids: list[int] = []
+    edge_link_types: list[int] = []
+    edge_visibility: list[int] = []
+    roles: list[str | None] = []
+    for from_id, to_id, link_type, visibility, role in edges:
+        from_ids.append(index[from_id])
+        to_ids.append(index[to_id])
+        edge_link_types.append(link_types.code(link_type))
+        edge_visibility.append(visibilities.code(visibility))
+        roles.append(role)
+
+    node_columns: dict[str, list[Any]] = {
+        "id": ids,
+        "type": node_types,
+        "title": titles,
+        "visibility": node_visibility,
+    }
+    if positions is not None:
+        node_columns["x"] = [positions[i][0] if i in positions else None for i in ids]
+        node_columns["y"] = [positions[i][1] if i in positions else None for i in ids]
+
+    edge_columns: dict[str, list[Any]] = {
+        "from": from_ids,
+        "to": to_ids,
+        "link_type": edge_link_types,
+        "visibility": edge_visibility,
+    }
+    if any(role is not None for role in roles):
+        edge_columns["role"] = roles
+
+    payload: dict[str, Any] = {"format": COMPACT_FORMAT_VERSION}
+    if version is not None:
+        payload["version"] = version
+    payload["enums"] = {
+        "type": types.values,
+        "link_type": link_types.values,
+        "visibility": visibilities.values,
+    }
+    payload["nodes"] = node_columns
+    payload["edges"] = edge_columns
+    return payload
+
+
+def serialize_compact(payload: dict[str, Any], wire_format: WireFormat) -> tuple[bytes, str]:
+    """
+    Serialize a compact payload.
+
+    Args:
+        payload: Result of compact_graph()
+        wire_format: "msgpack" for MessagePack, otherwise compact JSON
+
+    Returns:
+        Tuple of (body, media type)
+    """
+    if wire_format == "msgpack":
+        packed: bytes = msgpack.packb(payload)
+        return packed, MSGPACK_MEDIA_TYPE
+    return orjson.dumps(payload), COMPACT_JSON_MEDIA_TYPE
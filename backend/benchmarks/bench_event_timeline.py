@@ -0,0 +1,164 @@
+"""
+Benchmark timeline pages and histograms over a large event log.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_event_timeline [--events 100000] [--page 50]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.api.events import _LIST_SPEC, HistogramBucket, _conditions, get_event_histogram
+from app.models import Base, Event, EventRef, Faction, World
+from app.services.listing import ListParams, _encode_cursor, list_rows
+
+
+def _seed(session: Session, events: int, factions: int) -> tuple[World, list[str]]:
+    """Insert `events` events over ten years, each referencing one or two factions."""
+    rng = random.Random(42)
+    world = World(id=str(uuid.uuid4()), name="Bench")
+    faction_ids = [str(uuid.uuid4()) for _ in range(factions)]
+    session.add(world)
+    session.add_all(
+        Faction(id=faction_id, world_id=world.id, name=f"F{i}", color="#000000")
+        for i, faction_id in enumerate(faction_ids)
+    )
+    start = datetime(1840, 1, 1)
+    for i in range(events):
+        event_id = str(uuid.uuid4())
+        session.add(
+            Event(
+                id=event_id,
+                world_id=world.id,
+                at_datetime=start + timedelta(minutes=rng.randint(0, 10 * 365 * 24 * 60)),
+                title=f"Event {i}",
+                body_markdown=f"Something happened ({i}).",
+                scope=rng.choice(["public", "public", "gm"]),
+            )
+        )
+        session.add_all(
+            EventRef(
+                id=str(uuid.uuid4()),
+                event_id=event_id,
+                entity_type="faction",
+                entity_id=faction_id,
+                role="involved",
+            )
+            for faction_id in rng.sample(faction_ids, rng.randint(1, 2))
+        )
+    session.commit()
+    return world, faction_ids
+
+
+def _time(repeat: int, run: Callable[[], object]) -> float:
+    """Fastest of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Seed an in-memory database and time timeline reads."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--factions", type=int, default=20)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        world, faction_ids = _seed(session, args.events, args.factions)
+        conditions = _conditions("player", None, None, None, None)
+
+        # Cursor of a page 60% of the way through the timeline
+        deep = session.execute(
+            select(Event.at_datetime, Event.id)
+            .where(*conditions)
+            .order_by(Event.at_datetime, Event.id)
+            .offset(int(args.events * 0.6))
+            .limit(1)
+        ).one()
+        deep_cursor = _encode_cursor("at_datetime", "asc", *deep)
+        entity_conditions = conditions + [
+            Event.id.in_(select(EventRef.event_id).where(EventRef.entity_id == faction_ids[0]))
+        ]
+
+        def histogram(bucket: HistogramBucket = "day", entity_type: str | None = None) -> object:
+            return asyncio.run(
+                get_event_histogram(
+                    session,
+                    world,
+                    bucket=bucket,
+                    since=None,
+                    until=None,
+                    entity_type=entity_type,
+                    entity_id=None,
+                    snapshot_id=None,
+                    scope=None,
+                    view_mode="player",
+                )
+            )
+
+        cases: list[tuple[str, Callable[[], object]]] = [
+            (
+                "first page",
+                lambda: list_rows(
+                    session, _LIST_SPEC, ListParams(sort="at_datetime", limit=args.page), conditions
+                ),
+            ),
+            (
+                "deep page (cursor)",
+                lambda: list_rows(
+                    session,
+                    _LIST_SPEC,
+                    ListParams(sort="at_datetime", limit=args.page, cursor=deep_cursor),
+                    conditions,
+                ),
+            ),
+            (
+                "deep page (OFFSET)",
+                lambda: session.execute(
+                    select(Event.id, Event.at_datetime, Event.title)
+                    .where(*conditions)
+                    .order_by(Event.at_datetime, Event.id)
+                    .offset(int(args.events * 0.6))
+                    .limit(args.page)
+                ).all(),
+            ),
+            (
+                "entity page",
+                lambda: list_rows(
+                    session,
+                    _LIST_SPEC,
+                    ListParams(sort="at_datetime", limit=args.page),
+                    entity_conditions,
+                ),
+            ),
+            ("histogram (day)", lambda: histogram()),
+            ("histogram (week)", lambda: histogram(bucket="week")),
+            ("per-faction (week)", lambda: histogram(bucket="week", entity_type="faction")),
+        ]
+
+        print(
+            f"{args.events} events, {args.factions} factions, page of {args.page} (best of {args.repeat})"
+        )
+        for label, run in cases:
+            print(f"{label:<22}{_time(args.repeat, run) * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
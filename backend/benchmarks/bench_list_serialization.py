@@ -0,0 +1,111 @@
+"""
+Benchmark list endpoint serialization: validated Pydantic path vs orjson fast path.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_list_serialization [--rows 10000]
+"""
+
+import argparse
+import json
+import time
+import uuid
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.api.listing import list_response
+from app.api.people import _LIST_SPEC
+from app.models import Base, Person, World
+from app.schemas import PersonResponse
+from app.services.listing import ListParams
+from app.services.visibility import VisibilityService
+
+
+def _seed(session: Session, rows: int) -> None:
+    """Insert a world and `rows` people with JSON columns and notes."""
+    world = World(id=str(uuid.uuid4()), name="Bench")
+    session.add(world)
+    session.add_all(
+        Person(
+            id=str(uuid.uuid4()),
+            world_id=world.id,
+            name=f"Person {i}",
+            aliases=json.dumps([f"Alias {i}", f"Nick {i}"]),
+            status="alive",
+            tags=json.dumps(["npc", f"tag{i % 50}"]),
+            notes_public=f"Public notes about person {i}. " * 4,
+            notes_gm=f"Secret notes about person {i}. " * 4,
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def _validated(session: Session) -> bytes:
+    """The previous handler: ORM rows, a dict per row, then response model validation."""
+    visibility = VisibilityService()
+    rows = [
+        visibility.filter_notes_gm(
+            {
+                "id": p.id,
+                "name": p.name,
+                "aliases": json.loads(p.aliases) if p.aliases else [],
+                "status": p.status,
+                "workplace_place_id": p.workplace_place_id,
+                "home_place_id": p.home_place_id,
+                "tags": json.loads(p.tags) if p.tags else [],
+                "notes_public": p.notes_public,
+                "notes_gm": p.notes_gm,
+                "created_at": p.created_at,
+                "updated_at": p.updated_at,
+            },
+            "gm",
+        )
+        for p in session.execute(select(Person)).scalars().all()
+    ]
+    adapter = TypeAdapter(list[PersonResponse])
+    return adapter.dump_json(adapter.validate_python(rows))
+
+
+def _fast_path(session: Session) -> bytes:
+    """The current handler: column rows encoded directly with orjson."""
+    return bytes(list_response(session, _LIST_SPEC, ListParams(), "gm").body)
+
+
+def _best_of(repeat: int, session: Session, encode: Callable[[Session], bytes]) -> float:
+    """Fastest of `repeat` runs, in seconds, with a fresh identity map each time."""
+    best = float("inf")
+    for _ in range(repeat):
+        session.expunge_all()
+        start = time.perf_counter()
+        encode(session)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Seed an in-memory database and compare both paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _seed(session, args.rows)
+        assert json.loads(_validated(session)) == json.loads(_fast_path(session))
+
+        print(f"GET /people, {args.rows} rows (best of {args.repeat})")
+        baseline = _best_of(args.repeat, session, _validated)
+        fast = _best_of(args.repeat, session, _fast_path)
+        for name, elapsed in [("validated", baseline), ("orjson fast path", fast)]:
+            print(f"{name:<18}{elapsed * 1000:>9.1f} ms{args.rows / elapsed:>12.0f} rows/s")
+        print(f"speedup: {baseline / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
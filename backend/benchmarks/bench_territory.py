@@ -0,0 +1,95 @@
+"""
+Benchmark point-in-territory lookups for every place of a city.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_territory [--places 5000] [--tiles 16] [--factions 6]
+"""
+
+import argparse
+import io
+import random
+import time
+import uuid
+from datetime import datetime
+
+from PIL import Image, ImageDraw
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models import Base, Faction, Snapshot, TerritoryTile, World
+from app.services.territory_service import TILE_SIZE, TerritoryService
+
+
+def _tile_png(rng: random.Random) -> bytes:
+    """A tile with a few painted blobs, like a brushed territory edge."""
+    image = Image.new("RGBA", (TILE_SIZE, TILE_SIZE), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for _ in range(rng.randint(1, 4)):
+        x, y, r = rng.randint(0, TILE_SIZE), rng.randint(0, TILE_SIZE), rng.randint(20, 120)
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=(200, 40, 40, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _seed(session: Session, tiles: int, factions: int) -> str:
+    """Insert a snapshot where each faction painted about half the tiles."""
+    rng = random.Random(42)
+    world = World(id=str(uuid.uuid4()), name="Bench")
+    snapshot = Snapshot(
+        id=str(uuid.uuid4()), world_id=world.id, at_date=datetime(1847, 1, 1), label="S"
+    )
+    session.add_all([world, snapshot])
+    for i in range(factions):
+        faction = Faction(id=str(uuid.uuid4()), world_id=world.id, name=f"F{i}", color="#000000")
+        session.add(faction)
+        session.add_all(
+            TerritoryTile(
+                id=str(uuid.uuid4()),
+                snapshot_id=snapshot.id,
+                faction_id=faction.id,
+                z=0,
+                x=x,
+                y=y,
+                tile_data=_tile_png(rng),
+            )
+            for x in range(tiles)
+            for y in range(tiles)
+            if rng.random() < 0.5
+        )
+    session.commit()
+    return snapshot.id
+
+
+def main() -> None:
+    """Seed an in-memory database and time cold and warm sweeps."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=5000)
+    parser.add_argument("--tiles", type=int, default=16, help="Map edge in tiles")
+    parser.add_argument("--factions", type=int, default=6)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        snapshot_id = _seed(session, args.tiles, args.factions)
+        rng = random.Random(7)
+        extent = args.tiles * TILE_SIZE
+        points = {
+            str(i): (rng.uniform(0, extent), rng.uniform(0, extent)) for i in range(args.places)
+        }
+        service = TerritoryService(session)
+
+        print(f"{args.places} places, {args.tiles}x{args.tiles} tiles, {args.factions} factions")
+        for label in ("cold (decode masks)", "warm (cached masks)"):
+            start = time.perf_counter()
+            control = service.get_controlling_factions(snapshot_id, points)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<22}{elapsed * 1000:>9.1f} ms")
+        controlled = sum(1 for faction_ids in control.values() if faction_ids)
+        print(f"places with a controlling faction: {controlled}")
+
+
+if __name__ == "__main__":
+    main()
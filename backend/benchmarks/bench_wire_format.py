@@ -0,0 +1,88 @@
+"""
+Benchmark graph response encodings: payload size and serialization time.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_wire_format [--nodes 10000] [--edges 50000]
+"""
+
+import argparse
+import random
+import time
+import uuid
+from collections.abc import Callable
+
+from app.api.graph import GraphEdge, GraphNode, GraphResponse
+from app.services.wire_format import compact_graph, serialize_compact
+
+VISIBILITIES = ("public", "player", "gm")
+LINK_TYPES = ("wikilink", "manual", "reference")
+
+
+def _best_of(repeat: int, encode: Callable[[], bytes]) -> tuple[float, bytes]:
+    """Run encode `repeat` times; return the fastest time (ms) and the payload."""
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+
+def main() -> None:
+    """Generate a random graph and report each encoding."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--edges", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    nodes = [
+        (str(uuid.UUID(int=rng.getrandbits(128))), "page", f"Page {i}", rng.choice(VISIBILITIES))
+        for i in range(args.nodes)
+    ]
+    edges: list[tuple[str, str, str, str, str | None]] = [
+        (
+            rng.choice(nodes)[0],
+            rng.choice(nodes)[0],
+            rng.choice(LINK_TYPES),
+            rng.choice(VISIBILITIES),
+            None,
+        )
+        for _ in range(args.edges)
+    ]
+
+    def default_json() -> bytes:
+        response = GraphResponse(
+            version=1,
+            nodes=[GraphNode(id=i, type="page", title=t, visibility=v) for i, _, t, v in nodes],
+            edges=[
+                GraphEdge(from_id=f, to_id=t, link_type=lt, visibility=v)
+                for f, t, lt, v, _ in edges
+            ],
+        )
+        return response.model_dump_json().encode()
+
+    def compact_json() -> bytes:
+        return serialize_compact(compact_graph(nodes, edges, version=1), "compact")[0]
+
+    def compact_msgpack() -> bytes:
+        return serialize_compact(compact_graph(nodes, edges, version=1), "msgpack")[0]
+
+    print(f"{args.nodes} nodes, {args.edges} edges (best of {args.repeat})")
+    print(f"{'format':<16}{'bytes':>12}{'ratio':>8}{'ms':>10}")
+    baseline = 0
+    for name, encode in [
+        ("json", default_json),
+        ("compact json", compact_json),
+        ("compact msgpack", compact_msgpack),
+    ]:
+        elapsed, body = _best_of(args.repeat, encode)
+        baseline = baseline or len(body)
+        print(f"{name:<16}{len(body):>12}{len(body) / baseline:>8.2f}{elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -79,6 +79,10 @@ def client(db_session: Session) -> TestClient:
     from fastapi.middleware.cors import CORSMiddleware
 
     from app.api import (
+        batch,
+        bootstrap,
+        entities,
+        events,
         export_import,
         factions,
         graph,
@@ -113,6 +117,10 @@ def client(db_session: Session) -> TestClient:
     test_app.include_router(places.router, prefix="/api")
     test_app.include_router(pages.router, prefix="/api")
     test_app.include_router(graph.router, prefix="/api")
+    test_app.include_router(entities.router, prefix="/api")
+    test_app.include_router(bootstrap.router, prefix="/api")
+    test_app.include_router(batch.router, prefix="/api")
+    test_app.include_router(events.router, prefix="/api")
     test_app.include_router(snapshots.router, prefix="/api")
     test_app.include_router(tiles.router, prefix="/api")
     test_app.include_router(map_assets.router, prefix="/api")
@@ -0,0 +1,91 @@
+"""Tests for the batch API endpoint."""
+
+from fastapi.testclient import TestClient
+
+
+def test_batch_resolves_temp_ids_in_order(client: TestClient, seed_small_town: dict) -> None:
+    """Test creates, updates and deletes referring to entities created earlier."""
+    roric = seed_small_town["person_ids"]["roric"]
+    operations = [
+        {
+            "op": "create",
+            "entity_type": "faction",
+            "temp_id": "sashes",
+            "data": {"name": "Red Sashes", "color": "#aa0000"},
+        },
+        {
+            "op": "create",
+            "entity_type": "place",
+            "temp_id": "school",
+            "data": {"name": "Sword School", "type": "building", "owner_faction_id": "sashes"},
+        },
+        {
+            "op": "create",
+            "entity_type": "person",
+            "temp_id": "mylera",
+            "data": {"name": "Mylera Klev", "workplace_place_id": "school"},
+        },
+        {"op": "update", "entity_type": "person", "id": "mylera", "data": {"status": "missing"}},
+        {
+            "op": "create",
+            "entity_type": "page",
+            "data": {
+                "title": "Red Sashes",
+                "body_markdown": "Run by [[Mylera Klev]].",
+                "entity_type": "faction",
+                "entity_id": "sashes",
+            },
+        },
+        {"op": "delete", "entity_type": "person", "id": roric},
+    ]
+    response = client.post("/api/batch", json={"operations": operations})
+    assert response.status_code == 200
+    data = response.json()
+    ids = data["ids"]
+    assert set(ids) == {"sashes", "school", "mylera"}
+    results = data["results"]
+    assert [result["index"] for result in results] == list(range(len(operations)))
+    assert results[1]["item"]["owner_faction_id"] == ids["sashes"]
+    assert results[3]["id"] == ids["mylera"]
+    assert results[3]["item"]["status"] == "missing"
+    assert results[4]["item"]["entity_id"] == ids["sashes"]
+    assert results[5] == {
+        "index": 5,
+        "op": "delete",
+        "entity_type": "person",
+        "id": roric,
+        "item": None,
+    }
+
+    person = client.get(f"/api/people/{ids['mylera']}").json()
+    assert person["workplace_place_id"] == ids["school"]
+    assert person["status"] == "missing"
+    assert client.get(f"/api/people/{roric}").status_code == 404
+    assert "Red Sashes" in [faction["name"] for faction in client.get("/api/factions").json()]
+
+
+def test_batch_rolls_back_on_failure(client: TestClient, seed_small_town: dict) -> None:
+    """Test that a failing operation rolls back the operations before it."""
+    factions_before = client.get("/api/factions").json()
+    operations = [
+        {
+            "op": "create",
+            "entity_type": "faction",
+            "data": {"name": "Red Sashes", "color": "#aa0000"},
+        },
+        {"op": "update", "entity_type": "place", "id": "missing", "data": {"name": "Nowhere"}},
+    ]
+    response = client.post("/api/batch", json={"operations": operations})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Operation 1: Place not found"
+    assert client.get("/api/factions").json() == factions_before
+
+    # Invalid operation data is reported with the operation's index
+    operations = [{"op": "create", "entity_type": "faction", "data": {"name": "No color"}}]
+    response = client.post("/api/batch", json={"operations": operations})
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Operation 0: color")
+
+    operations = [{"op": "delete", "entity_type": "faction"}]
+    response = client.post("/api/batch", json={"operations": operations})
+    assert response.status_code == 422
@@ -0,0 +1,66 @@
+"""Tests for the bootstrap API endpoint."""
+
+import io
+
+from fastapi.testclient import TestClient
+
+
+def test_bootstrap_matches_individual_endpoints(client: TestClient, seed_small_town: dict) -> None:
+    """Test that the bootstrap response carries what the separate requests return."""
+    for view_mode in ("gm", "player"):
+        headers = {"X-View-Mode": view_mode}
+        response = client.get("/api/bootstrap", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+
+        snapshots = client.get("/api/snapshots").json()
+        assert data["snapshots"] == snapshots["snapshots"]
+        assert data["active_snapshot_id"] == seed_small_town["snapshot_ids"]["day3"]
+        assert data["map"] is None
+        assert data["world"]["name"]
+        for name in ("factions", "people", "places", "pages"):
+            assert data[name] == client.get(f"/api/{name}", headers=headers).json()
+        assert data["graph"] == client.get("/api/graph", headers=headers).json()
+
+    player = client.get("/api/bootstrap", headers={"X-View-Mode": "player"}).json()
+    assert all(faction["notes_gm"] is None for faction in player["factions"])
+
+
+def test_bootstrap_revalidates_by_data_version(client: TestClient, seed_small_town: dict) -> None:
+    """Test the ETag round trip and invalidation by writes."""
+    response = client.get("/api/bootstrap")
+    etag = response.headers["ETag"]
+    data_version = response.json()["data_version"]
+
+    response = client.get("/api/bootstrap", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Another view mode has its own ETag
+    response = client.get(
+        "/api/bootstrap", headers={"If-None-Match": etag, "X-View-Mode": "player"}
+    )
+    assert response.status_code == 200
+
+    # A base map upload on the active snapshot changes the data version
+    day3 = seed_small_town["snapshot_ids"]["day3"]
+    files = {"file": ("map.png", io.BytesIO(b"MAP"), "image/png")}
+    assert client.post(f"/api/snapshots/{day3}/map", files=files).status_code == 201
+    response = client.get("/api/bootstrap", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["data_version"] != data_version
+    assert data["map"]["snapshot_id"] == day3
+
+    # So does a faction write
+    etag = response.headers["ETag"]
+    client.post("/api/factions", json={"name": "Red Sashes", "color": "#aa0000"})
+    response = client.get("/api/bootstrap", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Red Sashes" in [faction["name"] for faction in response.json()["factions"]]
+
+
+def test_bootstrap_requires_initialized_project(client: TestClient) -> None:
+    """Test that bootstrap returns 409 before project init."""
+    response = client.get("/api/bootstrap")
+    assert response.status_code == 409
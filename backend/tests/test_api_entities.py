@@ -0,0 +1,160 @@
+"""Tests for cross-entity API endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def test_faction_history_merges_sources_newest_first(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test that events, bound pages and territory are merged and paginated."""
+    crows = seed_small_town["faction_ids"]["crows"]
+    snapshots = seed_small_town["snapshot_ids"]
+
+    response = client.get(f"/api/entities/faction/{crows}/history")
+    assert response.status_code == 200
+    history = response.json()
+    assert [(item["kind"], item["id"]) for item in history] == [
+        ("page", seed_small_town["page_ids"]["crows"]),
+        ("territory", snapshots["day2"]),
+        ("event", seed_small_town["event_ids"]["brawl"]),
+        ("territory", snapshots["day1"]),
+    ]
+    assert history[0]["at"] == "1920-01-03T14:00:00"
+    assert history[1]["tile_count"] == 2
+    assert history[2]["role"] == "involved"
+    assert "X-Next-Cursor" not in response.headers
+
+    # Paging one entry at a time yields the same sequence
+    paged = []
+    cursor = None
+    while True:
+        params: dict[str, object] = {"limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/entities/faction/{crows}/history", params=params)
+        paged.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert paged == history
+
+
+def test_entity_history_visibility_and_errors(client: TestClient, seed_small_town: dict) -> None:
+    """Test player mode filtering, hidden places and invalid requests."""
+    vale = seed_small_town["person_ids"]["captain_vale"]
+    events = seed_small_town["event_ids"]
+
+    gm = client.get(f"/api/entities/person/{vale}/history").json()
+    assert [item["id"] for item in gm] == [events["council_meeting"], events["raid"]]
+    player = client.get(
+        f"/api/entities/person/{vale}/history", headers={"X-View-Mode": "player"}
+    ).json()
+    assert [item["id"] for item in player] == [events["raid"]]
+
+    leaky_bucket = seed_small_town["place_ids"]["leaky_bucket"]
+    history = client.get(f"/api/entities/place/{leaky_bucket}/history").json()
+    assert [item["kind"] for item in history] == ["page", "event"]
+
+    hidden = client.post(
+        "/api/places", json={"name": "Vault", "type": "building", "scope": "gm"}
+    ).json()
+    assert client.get(f"/api/entities/place/{hidden['id']}/history").json() == []
+    response = client.get(
+        f"/api/entities/place/{hidden['id']}/history", headers={"X-View-Mode": "player"}
+    )
+    assert response.status_code == 404
+
+    assert client.get("/api/entities/person/missing/history").status_code == 404
+    assert client.get(f"/api/entities/page/{vale}/history").status_code == 422
+    response = client.get(f"/api/entities/person/{vale}/history", params={"cursor": "garbage"})
+    assert response.status_code == 422
+
+
+def test_entity_versions_as_of_snapshot(
+    client: TestClient, seed_small_town: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test recording attribute changes per snapshot and reading them back as of a snapshot."""
+    lyssa = seed_small_town["person_ids"]["lyssa"]
+    day1, day2, day3 = (seed_small_town["snapshot_ids"][day] for day in ("day1", "day2", "day3"))
+    versions_url = f"/api/entities/person/{lyssa}/versions"
+
+    response = client.put(f"{versions_url}/{day2}", json={"status": "dead", "notes_gm": "Poisoned"})
+    assert response.status_code == 200
+    client.put(f"{versions_url}/{day3}", json={"status": "unknown"})
+
+    def status_as_of(snapshot_id: str) -> str:
+        params = {"as_of_snapshot_id": snapshot_id}
+        return client.get(f"/api/people/{lyssa}", params=params).json()["status"]
+
+    # Before the first change the person's own value applies
+    assert [status_as_of(day) for day in (day1, day2, day3)] == ["alive", "dead", "unknown"]
+    assert client.get(f"/api/people/{lyssa}").json()["status"] == "alive"
+
+    versions = client.get(versions_url).json()
+    assert [(v["field"], v["snapshot_id"], v["valid_to"]) for v in versions] == [
+        ("notes_gm", day2, None),
+        ("status", day2, "1920-01-03T08:00:00"),
+        ("status", day3, None),
+    ]
+
+    # Lists read the state as of the snapshot, per entity or through the interval index
+    for lookup_max in (500, 0):
+        monkeypatch.setattr("app.api.entities._AS_OF_ID_LOOKUP_MAX", lookup_max)
+        people = client.get("/api/people", params={"as_of_snapshot_id": day2}).json()
+        by_id = {person["id"]: person for person in people}
+        assert by_id[lyssa]["status"] == "dead"
+        assert by_id[lyssa]["notes_gm"] == "Poisoned"
+        assert by_id[seed_small_town["person_ids"]["roric"]]["status"] == "dead"
+    response = client.get("/api/people", params={"as_of_snapshot_id": day2, "fields": "name"})
+    assert "status" not in response.json()[0]
+
+    # notes_gm versions stay hidden in player mode
+    player = {"X-View-Mode": "player"}
+    response = client.get(
+        f"/api/people/{lyssa}", params={"as_of_snapshot_id": day2}, headers=player
+    )
+    assert response.json()["notes_gm"] is None
+    assert [v["field"] for v in client.get(versions_url, headers=player).json()] == [
+        "status",
+        "status",
+    ]
+
+    # Removing a change extends the previous one; so does deleting its snapshot
+    assert client.delete(f"{versions_url}/{day3}", params={"field": "status"}).status_code == 204
+    assert status_as_of(day3) == "dead"
+    assert client.delete(f"/api/snapshots/{day2}").status_code == 204
+    assert client.get(versions_url).json() == []
+    assert status_as_of(day3) == "alive"
+
+    assert client.put(f"{versions_url}/{day1}", json={"name": "X"}).status_code == 422
+    assert client.put(f"{versions_url}/missing", json={"status": "dead"}).status_code == 404
+    assert client.delete(f"{versions_url}/{day1}").status_code == 404
+    response = client.get(f"/api/people/{lyssa}", params={"as_of_snapshot_id": "missing"})
+    assert response.status_code == 404
+
+
+def test_entity_versions_in_history_and_entity_deletion(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test that attribute changes show in the history and go with their entity."""
+    bucket = seed_small_town["place_ids"]["leaky_bucket"]
+    lampblacks = seed_small_town["faction_ids"]["lampblacks"]
+    day2 = seed_small_town["snapshot_ids"]["day2"]
+
+    client.put(
+        f"/api/entities/place/{bucket}/versions/{day2}", json={"owner_faction_id": lampblacks}
+    )
+    place = client.get(
+        "/api/places", params={"as_of_snapshot_id": day2, "fields": "owner_faction_id"}
+    )
+    assert {p["id"]: p["owner_faction_id"] for p in place.json()}[bucket] == lampblacks
+
+    history = client.get(f"/api/entities/place/{bucket}/history").json()
+    assert [item["kind"] for item in history] == ["page", "version", "event"]
+    assert history[1]["title"] == "owner_faction_id"
+    assert history[1]["value"] == lampblacks
+
+    assert client.delete(f"/api/places/{bucket}").status_code == 204
+    created = client.post("/api/places", json={"name": "New", "type": "building"}).json()
+    assert client.get(f"/api/entities/place/{created['id']}/versions").json() == []
@@ -0,0 +1,205 @@
+"""Tests for the event timeline API and the change stream."""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.api.events import _change_events
+from app.services.change_stream import broadcaster
+
+
+def test_list_events_timeline_order_and_filters(client: TestClient, seed_small_town: dict) -> None:
+    """Test time range, entity, snapshot and scope filters."""
+    events = seed_small_town["event_ids"]
+    snapshots = seed_small_town["snapshot_ids"]
+    lampblacks = seed_small_town["faction_ids"]["lampblacks"]
+
+    response = client.get("/api/events")
+    assert response.status_code == 200
+    assert [e["id"] for e in response.json()] == [
+        events["brawl"],
+        events["roric_death"],
+        events["raid"],
+        events["council_meeting"],
+        events["player_score"],
+    ]
+    assert response.json()[0]["refs"] is None
+
+    response = client.get(
+        "/api/events", params={"since": "1920-01-02T00:00:00", "until": "1920-01-03T00:00:00"}
+    )
+    assert [e["id"] for e in response.json()] == [events["roric_death"], events["raid"]]
+
+    response = client.get(
+        "/api/events", params={"entity_type": "faction", "entity_id": lampblacks, "order": "desc"}
+    )
+    assert [e["id"] for e in response.json()] == [
+        events["raid"],
+        events["roric_death"],
+        events["brawl"],
+    ]
+
+    response = client.get("/api/events", params={"snapshot_id": snapshots["day3"]})
+    assert [e["id"] for e in response.json()] == [events["council_meeting"], events["player_score"]]
+
+    response = client.get("/api/events", params={"scope": "gm"})
+    assert [e["id"] for e in response.json()] == [events["council_meeting"]]
+
+    # Player mode never sees gm events, even when asking for them
+    response = client.get("/api/events", headers={"X-View-Mode": "player"})
+    assert events["council_meeting"] not in [e["id"] for e in response.json()]
+    response = client.get("/api/events", params={"scope": "gm"}, headers={"X-View-Mode": "player"})
+    assert response.json() == []
+
+
+def test_list_events_keyset_pagination_and_refs(client: TestClient, seed_small_town: dict) -> None:
+    """Test paging through the timeline with cursors, with refs included."""
+    events = seed_small_town["event_ids"]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "include_refs": "true", "fields": "title,at_datetime"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/events", params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert [e["id"] for e in seen][:2] == [events["brawl"], events["roric_death"]]
+    brawl_refs = seen[0]["refs"]
+    assert len(brawl_refs) == 4
+    assert {
+        "entity_type": "person",
+        "entity_id": seed_small_town["person_ids"]["lyssa"],
+        "role": "involved",
+    } in brawl_refs
+    assert "body_markdown" not in seen[0]
+
+    response = client.get("/api/events", params={"cursor": "garbage"})
+    assert response.status_code == 422
+
+
+def test_event_histogram_overall_and_per_entity(client: TestClient, seed_small_town: dict) -> None:
+    """Test day and week histograms, overall and per referenced entity."""
+    factions = seed_small_town["faction_ids"]
+
+    response = client.get("/api/events/histogram")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bucket"] == "day"
+    assert data["series"] == [
+        {
+            "entity_type": None,
+            "entity_id": None,
+            "buckets": [
+                {"start": "1920-01-01", "count": 1},
+                {"start": "1920-01-02", "count": 2},
+                {"start": "1920-01-03", "count": 2},
+            ],
+        }
+    ]
+
+    # 1920-01-01 was a Thursday: all events fall in the week of Monday 1919-12-29
+    response = client.get("/api/events/histogram", params={"bucket": "week"})
+    assert response.json()["series"][0]["buckets"] == [{"start": "1919-12-29", "count": 5}]
+
+    response = client.get(
+        "/api/events/histogram",
+        params={"entity_type": "faction"},
+        headers={"X-View-Mode": "player"},
+    )
+    series = {s["entity_id"]: s["buckets"] for s in response.json()["series"]}
+    assert series == {
+        factions["crows"]: [{"start": "1920-01-01", "count": 1}],
+        factions["lampblacks"]: [
+            {"start": "1920-01-01", "count": 1},
+            {"start": "1920-01-02", "count": 2},
+        ],
+    }  # The council's only event is gm-scoped
+
+    response = client.get("/api/events/histogram", params={"bucket": "month"})
+    assert response.status_code == 422
+
+
+def test_change_stream_publishes_committed_changes(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test commits publish changes with versions, filtered per view mode."""
+    start = broadcaster.last_seq
+    faction = client.post("/api/factions", json={"name": "Red Sashes", "color": "#aa0000"}).json()
+    precinct = seed_small_town["place_ids"]["bluecoat_precinct"]
+    client.put(f"/api/places/{precinct}", json={"scope": "gm"})
+    # A rolled back batch publishes nothing
+    operations = [
+        {"op": "update", "entity_type": "faction", "id": faction["id"], "data": {"name": "X"}},
+        {"op": "delete", "entity_type": "place", "id": "missing"},
+    ]
+    assert client.post("/api/batch", json={"operations": operations}).status_code == 404
+
+    changes = broadcaster.since(start)
+    assert changes is not None
+    assert [(c.entity_type, c.id, c.op) for c in changes] == [
+        ("faction", faction["id"], "insert"),
+        ("place", precinct, "update"),
+    ]
+    bootstrap_version = client.get("/api/bootstrap").json()["data_version"]
+    assert changes[0].version == int(bootstrap_version.split(".")[1])  # factions counter
+
+    assert changes[1].for_view_mode("gm")["op"] == "update"
+    assert changes[1].for_view_mode("player")["op"] == "delete"
+    # Once hidden, later changes of the place never reach players
+    client.put(f"/api/places/{precinct}", json={"name": "Precinct 7"})
+    (renamed,) = broadcaster.since(changes[-1].seq)
+    assert renamed.for_view_mode("player") is None
+    assert renamed.for_view_mode("gm") == {
+        "seq": renamed.seq,
+        "entity_type": "place",
+        "id": precinct,
+        "op": "update",
+        "version": renamed.version,
+    }
+
+
+def test_change_stream_sse_messages(client: TestClient, seed_small_town: dict) -> None:
+    """Test the SSE encoding of the backlog and of live changes."""
+    start = broadcaster.last_seq
+    client.post("/api/factions", json={"name": "Red Sashes", "color": "#aa0000"})
+
+    async def read() -> list[str]:
+        subscription = broadcaster.subscribe()
+        stream = _change_events(subscription, "player", broadcaster.since(start))
+        messages = [await anext(stream), await anext(stream)]
+        # Live changes arrive through the subscription's queue
+        await asyncio.to_thread(
+            client.post, "/api/factions", json={"name": "Grinders", "color": "#00aa00"}
+        )
+        messages.append(await anext(stream))
+        await stream.aclose()
+        return messages
+
+    retry, backlog, live = asyncio.run(read())
+    assert retry == "retry: 3000\n\n"
+    for message in (backlog, live):
+        lines = message.strip().split("\n")
+        assert lines[0].startswith("id: ")
+        assert lines[1] == "event: change"
+        data = json.loads(lines[2].removeprefix("data: "))
+        assert data["entity_type"] == "faction"
+        assert data["op"] == "insert"
+        assert data["seq"] == int(lines[0].removeprefix("id: "))
+    assert broadcaster.since(broadcaster.last_seq + 5) is None
+
+    # A resumed stream whose backlog is gone starts with a resync
+    async def read_resync() -> list[str]:
+        stream = _change_events(broadcaster.subscribe(), "gm", None)
+        messages = [await anext(stream), await anext(stream)]
+        await stream.aclose()
+        return messages
+
+    assert asyncio.run(read_resync())[1] == "event: resync\ndata: {}\n\n"
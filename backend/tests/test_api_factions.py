@@ -129,3 +129,62 @@ def test_factions_player_mode_hides_gm_fields(initialized_client: TestClient) ->
     data = response.json()
     assert data["notes_gm"] is None
     assert data["notes_public"] == "Public info"
+
+
+def test_faction_roster(client: TestClient, seed_small_town: dict) -> None:
+    """Test a roster lists members with roles, workplaces and PC info."""
+    crows = seed_small_town["faction_ids"]["crows"]
+    response = client.get(f"/api/factions/{crows}/roster")
+    assert response.status_code == 200
+    roster = response.json()
+    assert roster["name"] == "The_Crows"
+    assert roster["member_count"] == 5
+    assert roster["pc_count"] == 3
+    members = {member["name"]: member for member in roster["members"]}
+    assert [member["name"] for member in roster["members"]] == sorted(members)
+    assert members["Roric"]["role"] == "boss"
+    assert members["Roric"]["status"] == "dead"
+    assert members["Lyssa"]["workplace_name"] == "The_Leaky_Bucket"
+    assert members["Lyssa"]["player_character"] is None
+    assert members["Cutter_Kane"]["player_character"] == {
+        "playbook": "Cutter",
+        "crew": "The_Shadow_Crew",
+        "is_active": True,
+    }
+
+    assert client.get("/api/factions/missing/roster").status_code == 404
+
+
+def test_faction_rosters_batch_in_constant_queries(
+    client: TestClient, db_session, seed_small_town: dict
+) -> None:
+    """Test all rosters come back in a fixed number of queries, hiding gm workplaces."""
+    from sqlalchemy import event
+
+    precinct = seed_small_town["place_ids"]["bluecoat_precinct"]
+    client.put(f"/api/places/{precinct}", json={"scope": "gm"})
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/factions/rosters", headers={"X-View-Mode": "player"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    rosters = {roster["name"]: roster for roster in response.json()}
+    assert len(rosters) == len(seed_small_town["faction_ids"])
+    assert sum(roster["member_count"] for roster in rosters.values()) == 6
+    (vale,) = rosters["Bluecoats"]["members"]
+    assert vale["workplace_place_id"] == precinct
+    assert vale["workplace_name"] is None
+    # World check, factions, memberships with people, player characters, workplaces
+    assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 5
+
+    crows = seed_small_town["faction_ids"]["crows"]
+    response = client.get("/api/factions/rosters", params={"faction_ids": f"{crows},missing"})
+    assert [roster["faction_id"] for roster in response.json()] == [crows]
@@ -25,3 +25,518 @@ def test_backlinks(client: TestClient) -> None:
     """Test backlinks API returns pages linking to a given page."""
     # Will implement after wikilinks parser is working
     pass
+
+
+def _init_project(client: TestClient) -> None:
+    """Helper to initialize project before tests."""
+    client.post("/api/project/init", json={})
+
+
+def _create_page(client: TestClient, title: str, body: str, visibility: str = "public") -> str:
+    """Helper to create a page and return its ID."""
+    response = client.post(
+        "/api/pages", json={"title": title, "body_markdown": body, "visibility": visibility}
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _create_chain(client: TestClient) -> dict[str, str]:
+    """Create pages D <- C <- B <- A (A links to B, B to C, C to D)."""
+    ids = {"D": _create_page(client, "D", "End of the chain")}
+    ids["C"] = _create_page(client, "C", "Goes to [[D]]")
+    ids["B"] = _create_page(client, "B", "Goes to [[C]]")
+    ids["A"] = _create_page(client, "A", "Goes to [[B]]")
+    return ids
+
+
+def test_neighborhood_depth_limits_outgoing_walk(client: TestClient) -> None:
+    """Test neighborhood follows outgoing links up to the requested depth."""
+    _init_project(client)
+    ids = _create_chain(client)
+
+    response = client.get(f"/api/graph/neighborhood/{ids['A']}?depth=2&direction=out")
+    assert response.status_code == 200
+    data = response.json()
+    depths = {node["title"]: node["depth"] for node in data["nodes"]}
+    assert depths == {"A": 0, "B": 1, "C": 2}
+    assert data["center_id"] == ids["A"]
+    assert data["truncated"] is False
+    assert len(data["edges"]) == 2
+
+
+def test_neighborhood_direction_in_and_both(client: TestClient) -> None:
+    """Test neighborhood can walk backlinks or both directions."""
+    _init_project(client)
+    ids = _create_chain(client)
+
+    response = client.get(f"/api/graph/neighborhood/{ids['C']}?depth=1&direction=in")
+    assert {node["title"] for node in response.json()["nodes"]} == {"B", "C"}
+
+    response = client.get(f"/api/graph/neighborhood/{ids['C']}?depth=1&direction=both")
+    assert {node["title"] for node in response.json()["nodes"]} == {"B", "C", "D"}
+
+
+def test_neighborhood_limit_keeps_closest_nodes(client: TestClient) -> None:
+    """Test neighborhood node cap keeps the closest pages and reports truncation."""
+    _init_project(client)
+    ids = _create_chain(client)
+
+    response = client.get(f"/api/graph/neighborhood/{ids['A']}?depth=3&direction=out&limit=2")
+    data = response.json()
+    assert [node["title"] for node in data["nodes"]] == ["A", "B"]
+    assert data["truncated"] is True
+
+
+def test_neighborhood_player_mode_does_not_traverse_gm_pages(client: TestClient) -> None:
+    """Test player mode stops the walk at gm-only pages."""
+    _init_project(client)
+    _create_page(client, "Public End", "Visible")
+    _create_page(client, "Secret", "Leads to [[Public End]]", visibility="gm")
+    start_id = _create_page(client, "Start", "See [[Secret]]")
+
+    response = client.get(
+        f"/api/graph/neighborhood/{start_id}?depth=3", headers={"X-View-Mode": "player"}
+    )
+    assert response.status_code == 200
+    assert [node["title"] for node in response.json()["nodes"]] == ["Start"]
+
+    response = client.get(f"/api/graph/neighborhood/{start_id}?depth=3")
+    assert {node["title"] for node in response.json()["nodes"]} == {
+        "Start",
+        "Secret",
+        "Public End",
+    }
+
+
+def test_neighborhood_hidden_or_missing_center_returns_404(client: TestClient) -> None:
+    """Test neighborhood returns 404 for missing pages and gm pages in player mode."""
+    _init_project(client)
+    secret_id = _create_page(client, "Secret", "GM only", visibility="gm")
+
+    assert client.get("/api/graph/neighborhood/missing").status_code == 404
+    response = client.get(f"/api/graph/neighborhood/{secret_id}", headers={"X-View-Mode": "player"})
+    assert response.status_code == 404
+
+
+def test_graph_include_layout_returns_positions(client: TestClient) -> None:
+    """Test graph can include precomputed x/y positions."""
+    _init_project(client)
+    _create_chain(client)
+
+    response = client.get("/api/graph")
+    assert all(node["x"] is None for node in response.json()["nodes"])
+
+    response = client.get("/api/graph?include_layout=true")
+    assert response.status_code == 200
+    nodes = response.json()["nodes"]
+    assert len(nodes) == 4
+    assert all(isinstance(node["x"], float) and isinstance(node["y"], float) for node in nodes)
+
+    # Unchanged graph reuses stored positions
+    again = client.get("/api/graph?include_layout=true").json()["nodes"]
+    assert again == nodes
+
+
+def test_graph_layout_relaxes_only_affected_region(client: TestClient) -> None:
+    """Test adding a page only moves the new node and its neighbors."""
+    _init_project(client)
+    ids = _create_chain(client)
+    before = {
+        n["id"]: (n["x"], n["y"])
+        for n in client.get("/api/graph?include_layout=true").json()["nodes"]
+    }
+
+    new_id = _create_page(client, "E", "Next to [[A]]")
+    after = {
+        n["id"]: (n["x"], n["y"])
+        for n in client.get("/api/graph?include_layout=true").json()["nodes"]
+    }
+
+    assert new_id in after
+    # Pages not adjacent to the new page keep their positions
+    for title in ("C", "D"):
+        assert after[ids[title]] == before[ids[title]]
+
+
+def test_graph_layout_is_stored_per_view_mode(client: TestClient) -> None:
+    """Test player layout only contains player-visible pages."""
+    _init_project(client)
+    _create_chain(client)
+    _create_page(client, "Secret", "GM only [[A]]", visibility="gm")
+
+    gm_nodes = client.get("/api/graph?include_layout=true").json()["nodes"]
+    player_nodes = client.get(
+        "/api/graph?include_layout=true", headers={"X-View-Mode": "player"}
+    ).json()["nodes"]
+    assert len(gm_nodes) == 5
+    assert len(player_nodes) == 4
+    assert all(node["x"] is not None for node in player_nodes)
+
+
+def test_graph_analytics_degrees_hubs_and_orphans(client: TestClient) -> None:
+    """Test analytics reports degrees, hubs, components and orphans."""
+    _init_project(client)
+    hub_id = _create_page(client, "Hub", "Everyone links here")
+    for name in ("One", "Two", "Three"):
+        _create_page(client, name, "See [[Hub]]")
+    orphan_id = _create_page(client, "Orphan", "Nobody knows me")
+
+    response = client.get("/api/graph/analytics?top=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["node_count"] == 5
+    assert data["edge_count"] == 3
+    assert data["hubs"] == [hub_id]
+    assert data["orphans"] == [orphan_id]
+    assert data["component_sizes"] == [4, 1]
+
+    hub = next(n for n in data["nodes"] if n["id"] == hub_id)
+    assert hub["in_degree"] == 3
+    assert hub["out_degree"] == 0
+    assert abs(sum(n["pagerank"] for n in data["nodes"]) - 1.0) < 1e-6
+
+
+def test_graph_analytics_recomputed_after_link_write(client: TestClient) -> None:
+    """Test analytics are cached per version and refreshed after link writes."""
+    _init_project(client)
+    _create_page(client, "Target", "Alone")
+    source_id = _create_page(client, "Source", "Nothing yet")
+
+    first = client.get("/api/graph/analytics").json()
+    assert first["edge_count"] == 0
+    assert client.get("/api/graph/analytics").json()["version"] == first["version"]
+
+    client.put(f"/api/pages/{source_id}", json={"body_markdown": "Now [[Target]]"})
+    second = client.get("/api/graph/analytics").json()
+    assert second["version"] > first["version"]
+    assert second["edge_count"] == 1
+    assert second["orphans"] == []
+
+
+def test_graph_analytics_player_mode_excludes_gm_pages(client: TestClient) -> None:
+    """Test player analytics ignore gm-only pages and their links."""
+    _init_project(client)
+    _create_page(client, "Public", "Visible")
+    _create_page(client, "Secret", "Points at [[Public]]", visibility="gm")
+
+    data = client.get("/api/graph/analytics", headers={"X-View-Mode": "player"}).json()
+    assert data["node_count"] == 1
+    assert data["edge_count"] == 0
+
+
+def test_path_finds_shortest_connection(client: TestClient) -> None:
+    """Test path endpoint connects pages through links in either direction."""
+    _init_project(client)
+    ids = _create_chain(client)
+
+    response = client.get(f"/api/graph/path?from={ids['D']}&to={ids['A']}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["paths"] == [[ids["D"], ids["C"], ids["B"], ids["A"]]]
+    assert {node["title"] for node in data["nodes"]} == {"A", "B", "C", "D"}
+
+    # Against link direction there is no directed path
+    response = client.get(f"/api/graph/path?from={ids['D']}&to={ids['A']}&directed=true")
+    assert response.json()["paths"] == []
+
+
+def test_path_returns_k_shortest_paths(client: TestClient) -> None:
+    """Test path endpoint can return alternative routes, shortest first."""
+    _init_project(client)
+    end_id = _create_page(client, "Council", "The end")
+    _create_page(client, "Long2", "[[Council]]")
+    _create_page(client, "Long1", "[[Long2]]")
+    _create_page(client, "Short", "[[Council]]")
+    start_id = _create_page(client, "Captain", "[[Short]] and [[Long1]]")
+
+    response = client.get(f"/api/graph/path?from={start_id}&to={end_id}&k=3")
+    paths = response.json()["paths"]
+    assert [len(path) for path in paths] == [3, 4]
+
+
+def test_path_player_mode_avoids_gm_pages(client: TestClient) -> None:
+    """Test paths only go through pages visible in the view mode."""
+    _init_project(client)
+    end_id = _create_page(client, "End", "Visible end")
+    _create_page(client, "Secret", "[[End]]", visibility="gm")
+    start_id = _create_page(client, "Start", "[[Secret]]")
+
+    gm = client.get(f"/api/graph/path?from={start_id}&to={end_id}").json()
+    assert len(gm["paths"][0]) == 3
+
+    player = client.get(
+        f"/api/graph/path?from={start_id}&to={end_id}", headers={"X-View-Mode": "player"}
+    )
+    assert player.status_code == 200
+    assert player.json()["paths"] == []
+
+
+def test_path_index_follows_wikilink_rebuilds(client: TestClient) -> None:
+    """Test the adjacency index reflects edits made after it was built."""
+    _init_project(client)
+    ids = _create_chain(client)
+    assert client.get(f"/api/graph/path?from={ids['A']}&to={ids['D']}").json()["paths"]
+
+    # Cut the chain, then add a shortcut
+    client.put(f"/api/pages/{ids['B']}", json={"body_markdown": "No more links"})
+    assert client.get(f"/api/graph/path?from={ids['A']}&to={ids['D']}").json()["paths"] == []
+
+    client.put(f"/api/pages/{ids['A']}", json={"body_markdown": "Shortcut to [[D]]"})
+    paths = client.get(f"/api/graph/path?from={ids['A']}&to={ids['D']}").json()["paths"]
+    assert paths == [[ids["A"], ids["D"]]]
+
+
+def test_path_missing_page_returns_404(client: TestClient) -> None:
+    """Test path endpoint returns 404 for unknown pages."""
+    _init_project(client)
+    page_id = _create_page(client, "Only", "Alone")
+    assert client.get(f"/api/graph/path?from={page_id}&to=missing").status_code == 404
+
+
+def test_path_index_updated_incrementally(client: TestClient, db_session) -> None:
+    """Test wikilink rebuilds update the cached index instead of dropping it."""
+    from app.services import graph_index
+
+    _init_project(client)
+    ids = _create_chain(client)
+    before = graph_index.get_adjacency_index(db_session)
+
+    client.put(f"/api/pages/{ids['A']}", json={"body_markdown": "Shortcut to [[D]]"})
+    assert graph_index.get_adjacency_index(db_session) is before
+    paths = client.get(f"/api/graph/path?from={ids['A']}&to={ids['D']}").json()["paths"]
+    assert paths == [[ids["A"], ids["D"]]]
+
+
+def test_entity_graph_unions_all_relations(client: TestClient, seed_small_town: dict) -> None:
+    """Test entity graph includes typed nodes and structural relations."""
+    response = client.get("/api/graph/entities")
+    assert response.status_code == 200
+    data = response.json()
+
+    types = {node["type"] for node in data["nodes"]}
+    assert types == {"page", "faction", "person", "place", "event"}
+
+    edges = {(e["from_id"], e["to_id"], e["link_type"]): e for e in data["edges"]}
+    people = seed_small_town["person_ids"]
+    places = seed_small_town["place_ids"]
+    factions = seed_small_town["faction_ids"]
+    membership = edges[(people["lyssa"], factions["crows"], "member_of")]
+    assert membership["role"] == "smuggler"
+    assert (people["lyssa"], places["leaky_bucket"], "works_at") in edges
+    assert (people["lyssa"], places["crows_foot"], "lives_at") in edges
+    assert (places["leaky_bucket"], places["crows_foot"], "part_of") in edges
+    assert (places["crows_foot"], factions["crows"], "owned_by") in edges
+    assert (seed_small_town["page_ids"]["crows"], factions["crows"], "about") in edges
+    assert (seed_small_town["event_ids"]["brawl"], people["lyssa"], "involves") in edges
+
+
+def test_entity_graph_player_mode_hides_gm_nodes(client: TestClient, seed_small_town: dict) -> None:
+    """Test player entity graph drops gm-only events and pages with their edges."""
+    data = client.get("/api/graph/entities", headers={"X-View-Mode": "player"}).json()
+    node_ids = {node["id"] for node in data["nodes"]}
+    assert seed_small_town["event_ids"]["council_meeting"] not in node_ids
+    assert all(e["from_id"] in node_ids and e["to_id"] in node_ids for e in data["edges"])
+    assert all(e["visibility"] != "gm" for e in data["edges"])
+
+
+def test_entity_graph_refreshes_after_entity_write(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test entity graph cache is invalidated by entity writes."""
+    before = client.get("/api/graph/entities").json()
+    client.post("/api/factions", json={"name": "Red Sashes", "color": "#AA0000"})
+    after = client.get("/api/graph/entities").json()
+    assert len(after["nodes"]) == len(before["nodes"]) + 1
+
+
+def test_graph_changes_returns_delta_since_version(client: TestClient) -> None:
+    """Test the change feed returns only node and link changes after a version."""
+    _init_project(client)
+    target_id = _create_page(client, "Target", "Nothing here")
+    version = client.get("/api/graph").json()["version"]
+
+    source_id = _create_page(client, "Source", "Points to [[Target]]")
+    response = client.get(f"/api/graph/changes?since={version}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["resync"] is False
+    assert data["version"] > version
+    changes = [(c["kind"], c["op"], c["id"]) for c in data["changes"]]
+    assert changes[0] == ("node", "insert", source_id)
+    assert [c[:2] for c in changes[1:]] == [("link", "insert")]
+    edge = data["changes"][1]["edge"]
+    assert (edge["from_id"], edge["to_id"]) == (source_id, target_id)
+
+    # Nothing new since the latest version
+    latest = client.get(f"/api/graph/changes?since={data['version']}").json()
+    assert latest == {"version": data["version"], "resync": False, "changes": []}
+
+
+def test_graph_changes_unchanged_links_not_reported(client: TestClient) -> None:
+    """Test body edits only log links that actually changed."""
+    _init_project(client)
+    _create_page(client, "Target", "Nothing here")
+    _create_page(client, "Other", "Nothing here")
+    source_id = _create_page(client, "Source", "Points to [[Target]]")
+    version = client.get("/api/graph").json()["version"]
+
+    client.put(f"/api/pages/{source_id}", json={"body_markdown": "[[Target]] and [[Other]]"})
+    changes = client.get(f"/api/graph/changes?since={version}").json()["changes"]
+    assert [(c["kind"], c["op"]) for c in changes] == [("link", "insert")]
+
+
+def test_graph_changes_delete_and_player_visibility(client: TestClient) -> None:
+    """Test deletes are logged and scope changes map to inserts/deletes for players."""
+    _init_project(client)
+    hub_id = _create_page(client, "Hub", "Nothing here")
+    secret_id = _create_page(client, "Secret", "Links [[Hub]]", visibility="gm")
+    player = {"X-View-Mode": "player"}
+    version = client.get("/api/graph", headers=player).json()["version"]
+
+    # Revealing the page inserts it and its link for players
+    client.put(f"/api/pages/{secret_id}", json={"visibility": "public"})
+    data = client.get(f"/api/graph/changes?since={version}", headers=player).json()
+    assert [(c["kind"], c["op"]) for c in data["changes"]] == [
+        ("node", "insert"),
+        ("link", "insert"),
+    ]
+
+    # Hiding it again deletes both; GM sees updates instead
+    version = data["version"]
+    client.put(f"/api/pages/{secret_id}", json={"visibility": "gm"})
+    player_ops = client.get(f"/api/graph/changes?since={version}", headers=player).json()
+    assert [c["op"] for c in player_ops["changes"]] == ["delete", "delete"]
+    gm_ops = client.get(f"/api/graph/changes?since={version}").json()
+    assert {c["op"] for c in gm_ops["changes"]} == {"update"}
+
+    version = gm_ops["version"]
+    client.delete(f"/api/pages/{hub_id}")
+    changes = client.get(f"/api/graph/changes?since={version}").json()["changes"]
+    assert [(c["kind"], c["op"]) for c in changes] == [("link", "delete"), ("node", "delete")]
+
+
+def test_graph_changes_resync_after_compaction(client: TestClient, monkeypatch) -> None:
+    """Test clients behind the compacted log (or ahead of the graph) must resync."""
+    from app.services import graph_changes
+
+    monkeypatch.setattr(graph_changes, "MAX_LOG_VERSIONS", 2)
+    _init_project(client)
+    for i in range(4):
+        _create_page(client, f"Page {i}", "Nothing here")
+    version = client.get("/api/graph").json()["version"]
+
+    assert client.get("/api/graph/changes?since=0").json()["resync"] is True
+    recent = client.get(f"/api/graph/changes?since={version - 2}").json()
+    assert recent["resync"] is False
+    assert recent["changes"]
+    assert client.get(f"/api/graph/changes?since={version + 1}").json()["resync"] is True
+
+
+def test_graph_compact_format_via_query_flag(client: TestClient) -> None:
+    """Test format=compact returns columnar arrays matching the default graph."""
+    _init_project(client)
+    ids = _create_chain(client)
+    default = client.get("/api/graph").json()
+
+    response = client.get("/api/graph?format=compact")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.blades.compact+json")
+    data = response.json()
+    assert data["version"] == default["version"]
+    node_ids = data["nodes"]["id"]
+    assert set(node_ids) == set(ids.values())
+    edges = {
+        (node_ids[f], node_ids[t])
+        for f, t in zip(data["edges"]["from"], data["edges"]["to"], strict=True)
+    }
+    assert edges == {(e["from_id"], e["to_id"]) for e in default["edges"]}
+    wikilink = data["enums"]["link_type"].index("wikilink")
+    assert set(data["edges"]["link_type"]) == {wikilink}
+
+
+def test_graph_msgpack_format_via_accept_header(client: TestClient) -> None:
+    """Test Accept: application/msgpack returns the compact payload as MessagePack."""
+    import msgpack
+
+    _init_project(client)
+    _create_chain(client)
+
+    response = client.get(
+        "/api/graph?include_layout=true", headers={"Accept": "application/msgpack"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(response.content)
+    assert data["format"] == "compact/1"
+    assert len(data["edges"]["from"]) == 3
+    assert None not in data["nodes"]["x"]
+
+
+def test_entity_graph_compact_format_includes_roles(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test the entity graph compact encoding keeps edge roles."""
+    default = client.get("/api/graph/entities").json()
+    data = client.get("/api/graph/entities?format=compact").json()
+
+    assert len(data["nodes"]["id"]) == len(default["nodes"])
+    assert len(data["edges"]["from"]) == len(default["edges"])
+    assert sorted(filter(None, data["edges"]["role"])) == sorted(
+        e["role"] for e in default["edges"] if e["role"]
+    )
+
+
+def test_backlinks_batch_counts_and_lists(client: TestClient) -> None:
+    """Test the batch endpoint returns counts and lists for many pages."""
+    _init_project(client)
+    target_id = _create_page(client, "Target", "Nothing here")
+    lonely_id = _create_page(client, "Lonely", "Nothing here")
+    alpha_id = _create_page(client, "Alpha", "See [[Target]]")
+    beta_id = _create_page(client, "Beta", "See [[Target]] and [[Alpha]]")
+
+    response = client.post(
+        "/api/graph/backlinks", json={"page_ids": [target_id, lonely_id, alpha_id, "missing"]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["counts"] == {target_id: 2, lonely_id: 0, alpha_id: 1}
+    assert data["pages"] is None
+
+    data = client.post(
+        "/api/graph/backlinks", json={"page_ids": [target_id, lonely_id], "include_pages": True}
+    ).json()
+    assert data["counts"] == {target_id: 2, lonely_id: 0}
+    assert [p["id"] for p in data["pages"][target_id]] == [alpha_id, beta_id]
+    assert data["pages"][lonely_id] == []
+
+
+def test_backlinks_batch_player_mode_hides_gm_pages(client: TestClient) -> None:
+    """Test player mode neither counts GM sources nor reports GM targets."""
+    _init_project(client)
+    target_id = _create_page(client, "Target", "Nothing here")
+    secret_target_id = _create_page(client, "Vault", "Nothing here", visibility="gm")
+    _create_page(client, "Public", "See [[Target]]")
+    _create_page(client, "Secret", "See [[Target]] and [[Vault]]", visibility="gm")
+
+    data = client.post(
+        "/api/graph/backlinks",
+        json={"page_ids": [target_id, secret_target_id], "include_pages": True},
+        headers={"X-View-Mode": "player"},
+    ).json()
+    assert data["counts"] == {target_id: 1}
+    assert [p["title"] for p in data["pages"][target_id]] == ["Public"]
+
+
+def test_list_pages_with_backlink_counts(client: TestClient) -> None:
+    """Test GET /pages can include backlink counts without per-page requests."""
+    _init_project(client)
+    target_id = _create_page(client, "Target", "Nothing here")
+    source_id = _create_page(client, "Source", "See [[Target]]")
+
+    pages = client.get("/api/pages").json()
+    assert all(page["backlink_count"] is None for page in pages)
+
+    pages = client.get("/api/pages?include_backlink_counts=true").json()
+    counts = {page["id"]: page["backlink_count"] for page in pages}
+    assert counts == {target_id: 1, source_id: 0}
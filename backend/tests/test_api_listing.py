@@ -0,0 +1,177 @@
+"""Tests for keyset pagination, projections, sorting and filters of list endpoints."""
+
+from fastapi.testclient import TestClient
+
+
+def _collect(client: TestClient, url: str, headers: dict[str, str] | None = None) -> list[dict]:
+    """Follow X-Next-Cursor links and return all items, asserting page sizes."""
+    items: list[dict] = []
+    separator = "&" if "?" in url else "?"
+    response = client.get(url, headers=headers)
+    while True:
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return items
+        response = client.get(f"{url}{separator}cursor={cursor}", headers=headers)
+
+
+def test_pages_titles_only_paginated(client: TestClient) -> None:
+    """Test a sidebar can load page titles a page at a time, without bodies."""
+    client.post("/api/project/init", json={})
+    titles = [f"Page {i:02d}" for i in range(7)]
+    for title in reversed(titles):
+        client.post("/api/pages", json={"title": title, "body_markdown": "x" * 1000})
+
+    first = client.get("/api/pages?fields=title&limit=3")
+    assert first.status_code == 200
+    assert first.json() == [
+        {"id": first.json()[i]["id"], "title": title} for i, title in enumerate(titles[:3])
+    ]
+    assert "X-Next-Cursor" in first.headers
+
+    items = _collect(client, "/api/pages?fields=title&limit=3")
+    assert [item["title"] for item in items] == titles
+
+    items = _collect(client, "/api/pages?fields=title&sort=title&order=desc&limit=2")
+    assert [item["title"] for item in items] == titles[::-1]
+
+
+def test_pages_full_rows_paginated_by_updated_at(client: TestClient) -> None:
+    """Test full rows paginate by updated_at with stable id tie-breaks."""
+    client.post("/api/project/init", json={})
+    for i in range(5):
+        client.post("/api/pages", json={"title": f"Page {i}", "body_markdown": "Body"})
+
+    items = _collect(client, "/api/pages?sort=updated_at&limit=2")
+    assert len(items) == 5
+    assert len({item["id"] for item in items}) == 5
+    assert all(item["body_markdown"] == "Body" for item in items)
+    assert [item["updated_at"] for item in items] == sorted(item["updated_at"] for item in items)
+
+
+def test_people_filter_and_projection_decode_json(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test people filters by status and decodes JSON columns in projections."""
+    response = client.get("/api/people?status=dead&fields=name,tags")
+    assert response.status_code == 200
+    people = response.json()
+    assert len(people) == 1
+    assert set(people[0]) == {"id", "name", "tags"}
+    assert people[0]["tags"] == ["leader", "deceased"]
+
+    names = [p["name"] for p in _collect(client, "/api/people?fields=name&limit=2")]
+    assert names == sorted(names)
+    assert len(names) == len(client.get("/api/people").json())
+
+
+def test_places_projection_respects_player_view(client: TestClient, seed_small_town: dict) -> None:
+    """Test projected place lists hide GM places and GM notes in player mode."""
+    client.post(
+        "/api/places",
+        json={"name": "Hideout", "type": "building", "scope": "gm", "notes_gm": "Secret"},
+    )
+    player = {"X-View-Mode": "player"}
+    gm_places = client.get("/api/places?fields=scope").json()
+    player_places = _collect(client, "/api/places?fields=scope,notes_gm&limit=2", headers=player)
+
+    assert len(player_places) < len(gm_places)
+    assert all(place["scope"] != "gm" for place in player_places)
+    assert all(place["notes_gm"] is None for place in player_places)
+
+
+def test_factions_sorted_by_name(client: TestClient, seed_small_town: dict) -> None:
+    """Test factions can be listed sorted by name."""
+    names = [f["name"] for f in client.get("/api/factions?sort=name").json()]
+    assert names == sorted(names)
+
+
+def test_list_rejects_invalid_parameters(client: TestClient) -> None:
+    """Test unknown fields, sort keys and cursors are rejected."""
+    client.post("/api/project/init", json={})
+    assert client.get("/api/pages?fields=title,secret").status_code == 422
+    assert client.get("/api/people?sort=status").status_code == 422
+    assert client.get("/api/places?cursor=not-a-cursor").status_code == 422
+
+    client.post("/api/pages", json={"title": "A", "body_markdown": ""})
+    client.post("/api/pages", json={"title": "B", "body_markdown": ""})
+    cursor = client.get("/api/pages?limit=1").headers["X-Next-Cursor"]
+    assert client.get(f"/api/pages?limit=1&sort=updated_at&cursor={cursor}").status_code == 422
+
+
+def test_fast_path_rows_match_response_models(client: TestClient, seed_small_town: dict) -> None:
+    """Test unvalidated list output is exactly what the response models would produce."""
+    from pydantic import TypeAdapter
+
+    from app.schemas import FactionResponse, NotePageResponse, PersonResponse, PlaceResponse
+
+    for url, model in [
+        ("/api/factions", FactionResponse),
+        ("/api/people", PersonResponse),
+        ("/api/places", PlaceResponse),
+        ("/api/pages", NotePageResponse),
+    ]:
+        for headers in ({}, {"X-View-Mode": "player"}):
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            adapter = TypeAdapter(list[model])
+            validated = adapter.dump_python(adapter.validate_json(response.content), mode="json")
+            assert response.json() == validated, url
+
+
+def _list_queries(db_session, client: TestClient, url: str, headers: dict[str, str]) -> list[str]:
+    """Run a GET and return the SQL statements it executed that read a list table."""
+    from sqlalchemy import event
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.get(url, headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    tables = ("FROM people", "FROM places", "FROM factions", "FROM note_pages")
+    return [s for s in statements if any(table in s for table in tables)]
+
+
+def test_player_lists_served_from_projection(
+    client: TestClient, db_session, seed_small_town: dict
+) -> None:
+    """Test repeated player list reads skip the list query."""
+    player = {"X-View-Mode": "player"}
+    for url in ("/api/factions", "/api/people", "/api/places", "/api/pages"):
+        first = client.get(url, headers=player)
+        assert _list_queries(db_session, client, url, player) == []
+        assert client.get(url, headers=player).content == first.content
+
+    # Filtered or paginated requests still query
+    assert _list_queries(db_session, client, "/api/people?status=alive", player)
+    assert _list_queries(db_session, client, "/api/people?limit=2", player)
+
+
+def test_projection_invalidated_per_entity_type(
+    client: TestClient, db_session, seed_small_town: dict
+) -> None:
+    """Test a write rebuilds only the projection of the written entity type."""
+    player = {"X-View-Mode": "player"}
+    places_before = client.get("/api/places", headers=player).json()
+    client.get("/api/people", headers=player)
+
+    client.post("/api/places", json={"name": "New Tavern", "type": "building"})
+
+    places_after = client.get("/api/places", headers=player).json()
+    assert len(places_after) == len(places_before) + 1
+    assert _list_queries(db_session, client, "/api/people", player) == []
+
+    # GM notes never leak into the player projection, and GM gets its own
+    client.post("/api/factions", json={"name": "Ghosts", "color": "#112233", "notes_gm": "Hidden"})
+    player_factions = client.get("/api/factions", headers=player).json()
+    gm_factions = client.get("/api/factions").json()
+    assert all(f["notes_gm"] is None for f in player_factions)
+    assert "Hidden" in [f["notes_gm"] for f in gm_factions]
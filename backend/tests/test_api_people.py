@@ -27,3 +27,49 @@ def test_person_workplace_reference(client: TestClient) -> None:
     """Test person can reference a workplace place."""
     # Will implement after CRUD is working
     pass
+
+
+def test_list_people_by_tag_and_alias(client: TestClient, seed_small_town: dict) -> None:
+    """Test tag and alias filters, including people seeded before the index."""
+    people = seed_small_town["person_ids"]
+
+    response = client.get("/api/people", params={"tag": "smuggler"})
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()] == [people["lyssa"]]
+
+    response = client.get("/api/people", params={"alias": "Silent Blade", "fields": "name"})
+    assert response.json() == [{"id": people["lyssa"], "name": "Lyssa"}]
+
+    # The index follows creates, updates and deletes
+    created = client.post(
+        "/api/people", json={"name": "Ink", "aliases": ["The Shadow"], "tags": ["spy", "spy"]}
+    ).json()
+    client.put(f"/api/people/{people['lyssa']}", json={"aliases": ["Lys"], "tags": None})
+
+    response = client.get("/api/people", params={"tag": "spy"})
+    assert [p["id"] for p in response.json()] == [created["id"]]
+    response = client.get("/api/people", params={"alias": "The Shadow"})
+    assert [p["id"] for p in response.json()] == [created["id"]]
+    response = client.get("/api/people", params={"alias": "Lys", "tag": "smuggler"})
+    assert response.json() == []
+
+    assert client.delete(f"/api/people/{created['id']}").status_code == 204
+    assert client.get("/api/people", params={"tag": "spy"}).json() == []
+
+
+def test_wikilinks_resolve_person_aliases(client: TestClient, seed_small_town: dict) -> None:
+    """Test that a wikilink to a person's alias links to the person's page."""
+    lyssa_page = seed_small_town["page_ids"]["lyssa"]
+
+    response = client.post(
+        "/api/pages",
+        json={"title": "Rumors", "body_markdown": "Ask [[The Shadow]] about [[Nobody Known]]."},
+    )
+    assert response.status_code == 201
+
+    rumors_id = response.json()["id"]
+
+    data = client.post(
+        "/api/graph/backlinks", json={"page_ids": [lyssa_page], "include_pages": True}
+    ).json()
+    assert rumors_id in [p["id"] for p in data["pages"][lyssa_page]]
@@ -141,3 +141,163 @@ def test_delete_place_player_mode_404_for_gm_place(client: TestClient) -> None:
     # Verify place still exists (GM can see it)
     response_gm = client.get(f"/api/places/{place_id}", headers={"X-View-Mode": "gm"})
     assert response_gm.status_code == 200
+
+
+def _create_place(client: TestClient, name: str, parent_id: str | None = None, **extra: str) -> str:
+    response = client.post(
+        "/api/places",
+        json={"name": name, "type": "district", "parent_place_id": parent_id, **extra},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_place_descendants_and_ancestors(client: TestClient) -> None:
+    """Test hierarchy queries across several levels."""
+    _init_project(client)
+    city = _create_place(client, "City")
+    district = _create_place(client, "District", city)
+    street = _create_place(client, "Street", district)
+    tavern = _create_place(client, "Tavern", street)
+
+    response = client.get(f"/api/places/{city}/descendants")
+    assert response.status_code == 200
+    assert [(p["name"], p["depth"]) for p in response.json()] == [
+        ("District", 1),
+        ("Street", 2),
+        ("Tavern", 3),
+    ]
+
+    response = client.get(f"/api/places/{city}/descendants", params={"max_depth": 1})
+    assert [p["id"] for p in response.json()] == [district]
+
+    response = client.get(f"/api/places/{tavern}/ancestors")
+    assert response.status_code == 200
+    assert [(p["id"], p["depth"]) for p in response.json()] == [
+        (street, 1),
+        (district, 2),
+        (city, 3),
+    ]
+    assert response.json()[0]["parent_place_id"] == district
+
+    assert client.get("/api/places/missing/descendants").status_code == 404
+
+
+def test_place_reparenting_moves_subtree_and_rejects_cycles(client: TestClient) -> None:
+    """Test moving a subtree and cycle detection during reparenting."""
+    _init_project(client)
+    city = _create_place(client, "City")
+    docks = _create_place(client, "Docks")
+    district = _create_place(client, "District", city)
+    street = _create_place(client, "Street", district)
+
+    response = client.put(f"/api/places/{district}", json={"parent_place_id": docks})
+    assert response.status_code == 200
+    assert response.json()["parent_place_id"] == docks
+    assert client.get(f"/api/places/{city}/descendants").json() == []
+    ancestors = client.get(f"/api/places/{street}/ancestors").json()
+    assert [p["id"] for p in ancestors] == [district, docks]
+
+    # Under itself or its own descendant
+    for parent_id in (district, street):
+        response = client.put(f"/api/places/{district}", json={"parent_place_id": parent_id})
+        assert response.status_code == 409
+    response = client.put(f"/api/places/{district}", json={"parent_place_id": "missing"})
+    assert response.status_code == 422
+
+    # Deleting a place turns its children into top-level places
+    assert client.delete(f"/api/places/{district}").status_code == 204
+    assert client.get(f"/api/places/{street}").json()["parent_place_id"] is None
+    assert client.get(f"/api/places/{street}/ancestors").json() == []
+    assert client.get(f"/api/places/{docks}/descendants").json() == []
+
+
+def test_place_hierarchy_player_mode_and_existing_data(
+    client: TestClient, seed_small_town: dict
+) -> None:
+    """Test hierarchy reads over seeded places and hidden places in player mode."""
+    places = seed_small_town["place_ids"]
+    crows_foot, leaky_bucket = places["crows_foot"], places["leaky_bucket"]
+
+    # Seeded places predate the closure, which is built on first read
+    response = client.get(f"/api/places/{crows_foot}/descendants")
+    assert [p["id"] for p in response.json()] == [leaky_bucket]
+
+    cellar = _create_place(client, "Cellar", leaky_bucket)
+    secret = _create_place(client, "Secret Room", cellar, scope="gm")
+    _create_place(client, "Tunnel", secret)
+
+    gm = client.get(f"/api/places/{crows_foot}/descendants").json()
+    assert [p["name"] for p in gm] == ["The_Leaky_Bucket", "Cellar", "Secret Room", "Tunnel"]
+
+    player = client.get(
+        f"/api/places/{crows_foot}/descendants", headers={"X-View-Mode": "player"}
+    ).json()
+    assert [p["name"] for p in player] == ["The_Leaky_Bucket", "Cellar", "Tunnel"]
+    assert all(p["notes_gm"] is None for p in player)
+    response = client.get(f"/api/places/{secret}/ancestors", headers={"X-View-Mode": "player"})
+    assert response.status_code == 404
+
+
+def test_list_places_bbox(client: TestClient, seed_small_town: dict) -> None:
+    """Test the bounding-box filter over seeded and API-written positions."""
+    places = seed_small_town["place_ids"]
+
+    # Seeded places predate the spatial index, which is built on first use
+    response = client.get("/api/places", params={"bbox": "90,140,130,170"})
+    assert response.status_code == 200
+    assert {p["id"] for p in response.json()} == {places["crows_foot"], places["leaky_bucket"]}
+
+    created = client.post(
+        "/api/places",
+        json={"name": "Dock Shack", "type": "building", "position": {"x": 125.5, "y": 170.0}},
+    ).json()
+    client.put(f"/api/places/{places['crows_foot']}", json={"position": {"x": 500, "y": 500}})
+    client.put(f"/api/places/{places['leaky_bucket']}", json={"position": None})
+
+    response = client.get("/api/places", params={"bbox": "90,140,130,170", "fields": "name"})
+    assert [p["id"] for p in response.json()] == [created["id"]]
+
+    # Bounds are inclusive, and the filter combines with the others
+    response = client.get("/api/places", params={"bbox": "500,500,500,500", "type": "district"})
+    assert [p["id"] for p in response.json()] == [places["crows_foot"]]
+
+    for bbox in ("1,2,3", "a,b,c,d", "10,0,0,10"):
+        assert client.get("/api/places", params={"bbox": bbox}).status_code == 422
+
+
+def test_nearest_places(client: TestClient, seed_small_town: dict) -> None:
+    """Test nearest-neighbor queries, including ones that widen the search box."""
+    places = seed_small_town["place_ids"]
+
+    response = client.get("/api/places/nearest", params={"x": 110, "y": 150, "k": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["id"] for p in data] == [places["crows_foot"], places["leaky_bucket"]]
+    assert data[0]["distance"] == 10.0
+
+    # Far from every place: the search box grows until it finds them
+    response = client.get("/api/places/nearest", params={"x": 5000, "y": 5000, "k": 1})
+    assert [p["id"] for p in response.json()] == [places["bluecoat_precinct"]]
+
+    response = client.get("/api/places/nearest", params={"x": 0, "y": 0, "k": 100})
+    assert len(response.json()) == 5
+
+    client.post(
+        "/api/places",
+        json={
+            "name": "Hideout",
+            "type": "building",
+            "scope": "gm",
+            "position": {"x": 100, "y": 149},
+        },
+    )
+    gm = client.get("/api/places/nearest", params={"x": 100, "y": 148, "k": 1}).json()
+    assert gm[0]["name"] == "Hideout"
+    player = client.get(
+        "/api/places/nearest",
+        params={"x": 100, "y": 148, "k": 1},
+        headers={"X-View-Mode": "player"},
+    ).json()
+    assert player[0]["id"] == places["crows_foot"]
+    assert player[0]["notes_gm"] is None
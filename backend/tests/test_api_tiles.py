@@ -1,6 +1,16 @@
 """Tests for territory tiles API endpoints."""
 
+import base64
+import io
+import struct
+
+import pytest
 from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketDisconnect
+
+from app.services.tile_write_queue import get_tile_write_queue
 
 
 def test_get_tile_not_found(client: TestClient) -> None:
@@ -25,3 +35,105 @@ def test_tiles_per_snapshot(client: TestClient) -> None:
     """Test tiles are isolated per snapshot."""
     # Will implement after tiles API is working
     pass
+
+
+def _mask_png(painted: tuple[int, int, int, int]) -> str:
+    """Encode a 256x256 tile whose (left, top, right, bottom) box is painted."""
+    image = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+    image.paste((200, 30, 30, 255), painted)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def test_place_territory_control(client: TestClient, seed_small_town: dict) -> None:
+    """Test point-in-territory lookups for single places and all places."""
+    snapshot_id = seed_small_town["snapshot_ids"]["day3"]
+    factions = seed_small_town["faction_ids"]
+    places = seed_small_town["place_ids"]
+    crows, lampblacks = factions["crows"], factions["lampblacks"]
+
+    # Crows paint x < 110 of tile (0, 0); Lampblacks paint y >= 180 of it
+    for faction_id, box in [(crows, (0, 0, 110, 256)), (lampblacks, (0, 180, 256, 256))]:
+        response = client.put(
+            f"/api/snapshots/{snapshot_id}/territory/tiles/batch",
+            json={
+                "faction_id": faction_id,
+                "tiles": [{"z": 0, "x": 0, "y": 0, "data": _mask_png(box)}],
+            },
+        )
+        assert response.status_code == 200
+
+    response = client.get(f"/api/snapshots/{snapshot_id}/territory/places")
+    assert response.status_code == 200
+    control = {item["place_id"]: item["faction_ids"] for item in response.json()}
+    assert control == {
+        places["crows_foot"]: [crows],  # (100, 150)
+        places["leaky_bucket"]: [],  # (120, 160)
+        places["warehouse_district"]: sorted([crows, lampblacks]),  # (50, 200)
+        places["old_bridge"]: [],  # (200, 100)
+        places["bluecoat_precinct"]: [],  # (300, 150), unpainted tile (1, 0)
+    }
+
+    # Repainting invalidates the cached masks
+    client.put(
+        f"/api/snapshots/{snapshot_id}/territory/tiles/batch",
+        json={
+            "faction_id": crows,
+            "tiles": [{"z": 0, "x": 0, "y": 0, "data": _mask_png((0, 0, 1, 1))}],
+        },
+    )
+    response = client.get(f"/api/snapshots/{snapshot_id}/territory/places/{places['crows_foot']}")
+    assert response.status_code == 200
+    assert response.json() == {"place_id": places["crows_foot"], "faction_ids": []}
+
+    # Other snapshots have their own territory
+    other = seed_small_town["snapshot_ids"]["day1"]
+    response = client.get(f"/api/snapshots/{other}/territory/places/{places['warehouse_district']}")
+    assert response.json()["faction_ids"] == []
+
+    assert client.get("/api/snapshots/missing/territory/places").status_code == 404
+    response = client.get(f"/api/snapshots/{snapshot_id}/territory/places/missing")
+    assert response.status_code == 404
+
+
+def _tile_delta(faction_id: str, z: int, x: int, y: int, data: bytes) -> bytes:
+    """Encode a binary tile delta frame."""
+    encoded = faction_id.encode()
+    return struct.pack(">H", len(encoded)) + encoded + struct.pack(">iii", z, x, y) + data
+
+
+def test_live_painting_relays_and_coalesces(
+    client: TestClient, db_session: Session, seed_small_town: dict
+) -> None:
+    """Test that deltas reach other painters and repeated strokes write a tile once."""
+    snapshot_id = seed_small_town["snapshot_ids"]["day3"]
+    crows = seed_small_town["faction_ids"]["crows"]
+    first, second = base64.b64decode(_mask_png((0, 0, 10, 10))), b"second stroke"
+    url = f"/api/snapshots/{snapshot_id}/territory/ws"
+    queue = get_tile_write_queue(db_session)
+    queue.max_delay = 60  # Flushed by the test only
+
+    with client.websocket_connect(url) as painter, client.websocket_connect(url) as watcher:
+        for data in (first, second):
+            painter.send_bytes(_tile_delta(crows, 1, 0, 1, data))
+            assert watcher.receive_bytes() == _tile_delta(crows, 1, 0, 1, data)
+
+        painter.send_bytes(_tile_delta("missing", 1, 0, 1, first))
+        assert painter.receive_json() == {"error": "Faction not found", "faction_id": "missing"}
+
+        # Both strokes on the tile are one pending write, of the latest payload
+        assert queue.flush() == 1
+
+    response = client.get(
+        f"/api/snapshots/{snapshot_id}/territory/tiles",
+        params={"faction_id": crows, "z": 1, "x": 0, "y": 1},
+    )
+    assert response.status_code == 200
+    assert response.content == second
+
+    with client.websocket_connect(url) as painter:
+        painter.send_bytes(b"\x00")
+        with pytest.raises(WebSocketDisconnect) as disconnect:
+            painter.receive_bytes()
+        assert disconnect.value.code == 1003
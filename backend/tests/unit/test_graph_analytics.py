@@ -0,0 +1,28 @@
+"""Unit tests for graph metrics."""
+
+from app.services.graph_analytics import compute_graph_metrics
+
+
+def test_metrics_empty_graph() -> None:
+    """Test metrics of an empty graph are empty."""
+    metrics = compute_graph_metrics(0, [])
+    assert metrics.pagerank == []
+    assert metrics.component_sizes == []
+
+
+def test_pagerank_favors_linked_node() -> None:
+    """Test the most linked-to node gets the highest PageRank."""
+    metrics = compute_graph_metrics(4, [(1, 0), (2, 0), (3, 0), (0, 1)])
+    assert max(range(4), key=lambda i: metrics.pagerank[i]) == 0
+    assert abs(sum(metrics.pagerank) - 1.0) < 1e-9
+    assert metrics.in_degree == [3, 1, 0, 0]
+    assert metrics.out_degree == [1, 1, 1, 1]
+
+
+def test_components_numbered_largest_first() -> None:
+    """Test weakly connected components ignore direction and are sorted by size."""
+    metrics = compute_graph_metrics(6, [(0, 1), (2, 3), (4, 3)])
+    assert metrics.component_sizes == [3, 2, 1]
+    assert metrics.component[2] == metrics.component[3] == metrics.component[4] == 0
+    assert metrics.component[0] == metrics.component[1] == 1
+    assert metrics.component[5] == 2
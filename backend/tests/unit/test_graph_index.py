@@ -0,0 +1,47 @@
+"""Unit tests for the in-memory adjacency index path search."""
+
+from app.services.graph_index import AdjacencyIndex, IndexedLink
+
+ALL_SCOPES = ("public", "gm", "player")
+
+
+def _index(edges: list[tuple[str, str]], gm_pages: tuple[str, ...] = ()) -> AdjacencyIndex:
+    index = AdjacencyIndex()
+    for a, b in edges:
+        for page in (a, b):
+            index.page_scopes[page] = "gm" if page in gm_pages else "public"
+        index.add_link(f"{a}->{b}", IndexedLink(a, b, "wikilink", "public"))
+    return index
+
+
+def test_shortest_path_prefers_fewer_hops() -> None:
+    """Test bidirectional BFS returns a minimal path."""
+    index = _index([("a", "b"), ("b", "c"), ("c", "d"), ("a", "x"), ("x", "d")])
+    assert index.shortest_path("a", "d", ALL_SCOPES) == ["a", "x", "d"]
+
+
+def test_shortest_path_same_node() -> None:
+    """Test path from a page to itself is the page alone."""
+    index = _index([("a", "b")])
+    assert index.shortest_path("a", "a", ALL_SCOPES) == ["a"]
+
+
+def test_shortest_path_respects_scopes() -> None:
+    """Test hidden pages are not traversed."""
+    index = _index([("a", "x"), ("x", "d")], gm_pages=("x",))
+    assert index.shortest_path("a", "d", ALL_SCOPES) == ["a", "x", "d"]
+    assert index.shortest_path("a", "d", ("public", "player")) is None
+
+
+def test_k_shortest_paths_are_loopless_and_ordered() -> None:
+    """Test Yen's algorithm returns distinct paths by increasing length."""
+    index = _index([("a", "b"), ("b", "d"), ("a", "c"), ("c", "e"), ("e", "d")])
+    paths = index.k_shortest_paths("a", "d", ALL_SCOPES, k=5)
+    assert paths == [["a", "b", "d"], ["a", "c", "e", "d"]]
+
+
+def test_remove_link_updates_adjacency() -> None:
+    """Test removing a link disconnects the pages."""
+    index = _index([("a", "b")])
+    index.remove_link("a->b")
+    assert index.shortest_path("a", "b", ALL_SCOPES) is None
@@ -0,0 +1,38 @@
+"""Unit tests for the force-directed graph layout."""
+
+import numpy as np
+
+from app.services.graph_layout import force_directed_layout
+
+
+def test_layout_empty_graph() -> None:
+    """Test layout of an empty graph returns no positions."""
+    assert force_directed_layout(0, np.zeros((0, 2), dtype=np.int64)).shape == (0, 2)
+
+
+def test_layout_is_deterministic() -> None:
+    """Test the same seed gives the same layout."""
+    edges = np.array([[0, 1], [1, 2], [2, 3]], dtype=np.int64)
+    first = force_directed_layout(4, edges, seed=7)
+    second = force_directed_layout(4, edges, seed=7)
+    assert np.array_equal(first, second)
+
+
+def test_layout_keeps_linked_nodes_closer() -> None:
+    """Test linked nodes end up closer than unlinked ones."""
+    # Two triangles joined by nothing
+    edges = np.array([[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 3]], dtype=np.int64)
+    pos = force_directed_layout(6, edges)
+    within = np.linalg.norm(pos[0] - pos[1])
+    across = np.linalg.norm(pos[0] - pos[3])
+    assert within < across
+
+
+def test_layout_fixed_nodes_do_not_move() -> None:
+    """Test only movable nodes are displaced during a warm start."""
+    edges = np.array([[0, 1], [1, 2]], dtype=np.int64)
+    initial = np.array([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0]])
+    movable = np.array([False, False, True])
+    pos = force_directed_layout(3, edges, initial=initial, movable=movable, iterations=20)
+    assert np.array_equal(pos[:2], initial[:2])
+    assert not np.array_equal(pos[2], initial[2])
@@ -0,0 +1,37 @@
+"""Unit tests for territory mask decoding."""
+
+import io
+
+from PIL import Image
+
+from app.services.territory_service import decode_mask
+
+
+def _png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_decode_mask_uses_alpha() -> None:
+    """Test that pixels are painted where they are not fully transparent."""
+    image = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+    image.paste((10, 10, 10, 1), (0, 0, 10, 20))
+    mask = decode_mask(_png(image))
+    assert mask is not None
+    assert mask.shape == (256, 256)
+    assert mask[19, 9] and not mask[20, 9] and not mask[0, 10]
+
+
+def test_decode_mask_without_alpha() -> None:
+    """Test that images without alpha count non-black pixels as painted."""
+    image = Image.new("RGB", (4, 4), (0, 0, 0))
+    image.putpixel((1, 2), (255, 0, 0))
+    mask = decode_mask(_png(image))
+    assert mask is not None
+    assert mask.sum() == 1 and mask[2, 1]
+
+
+def test_decode_mask_ignores_unreadable_tiles() -> None:
+    """Test that tiles which are not images decode to no mask."""
+    assert decode_mask(b"not an image") is None
@@ -0,0 +1,62 @@
+"""Tests for the compact columnar wire format."""
+
+import json
+
+import msgpack
+
+from app.services.wire_format import (
+    COMPACT_JSON_MEDIA_TYPE,
+    LINK_TYPES,
+    MSGPACK_MEDIA_TYPE,
+    compact_graph,
+    serialize_compact,
+)
+
+
+def test_compact_graph_interns_ids_and_encodes_enums() -> None:
+    """Test edges reference node indexes and enums become table codes."""
+    payload = compact_graph(
+        [("a", "page", "A", "public"), ("b", "place", "B", "gm")],
+        [("a", "b", "manual", "gm", None), ("b", "a", "wikilink", "public", None)],
+        version=7,
+    )
+
+    assert payload["version"] == 7
+    enums = payload["enums"]
+    nodes, edges = payload["nodes"], payload["edges"]
+    assert nodes["id"] == ["a", "b"]
+    assert [enums["type"][code] for code in nodes["type"]] == ["page", "place"]
+    assert [enums["visibility"][code] for code in nodes["visibility"]] == ["public", "gm"]
+    assert (edges["from"], edges["to"]) == ([0, 1], [1, 0])
+    assert [enums["link_type"][code] for code in edges["link_type"]] == ["manual", "wikilink"]
+    assert "role" not in edges
+    assert "x" not in nodes
+
+
+def test_compact_graph_extends_enum_tables_and_optional_columns() -> None:
+    """Test unknown enum values are appended and optional columns are included."""
+    payload = compact_graph(
+        [("a", "page", "A", "public"), ("b", "page", "B", "public")],
+        [("a", "b", "new_relation", "public", "boss")],
+        positions={"a": (1.0, 2.0)},
+    )
+
+    assert payload["enums"]["link_type"] == [*LINK_TYPES, "new_relation"]
+    assert payload["edges"]["link_type"] == [len(LINK_TYPES)]
+    assert payload["edges"]["role"] == ["boss"]
+    assert payload["nodes"]["x"] == [1.0, None]
+    assert payload["nodes"]["y"] == [2.0, None]
+    assert "version" not in payload
+
+
+def test_serialize_compact_json_and_msgpack_round_trip() -> None:
+    """Test both encodings decode back to the same payload."""
+    payload = compact_graph([("a", "page", "Ä", "public")], [("a", "a", "wikilink", "gm", None)])
+
+    body, media_type = serialize_compact(payload, "compact")
+    assert media_type == COMPACT_JSON_MEDIA_TYPE
+    assert json.loads(body) == payload
+
+    body, media_type = serialize_compact(payload, "msgpack")
+    assert media_type == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(body) == payload